@@ -35,10 +35,16 @@ OLLAMA_AUTO_MODEL = os.getenv("OLLAMA_AUTO_MODEL", "true").lower() in ("1", "tru
 OLLAMA_MODEL_REFRESH_SECONDS = int(
     os.getenv("OLLAMA_MODEL_REFRESH_SECONDS", str(_cfg("ollama", "model_refresh_seconds", default=5)))
 )
+# Optional small model that picks tools (two-tier cascade); empty = one model does everything
+OLLAMA_ROUTER_MODEL = os.getenv("OLLAMA_ROUTER_MODEL", "")
+# Decide each tool step with a JSON-schema-constrained reply instead of free text (needs Ollama 0.5+)
+OLLAMA_STRUCTURED_ROUTING = os.getenv("OLLAMA_STRUCTURED_ROUTING", "false").lower() in ("1", "true", "yes", "on")
 
 # Anthropic (Claude) settings
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL", "claude-3-haiku-20240307")
+# Optional Messages API base URL override (e.g. a local stub for testing); empty = SDK default
+ANTHROPIC_BASE_URL = os.getenv("ANTHROPIC_BASE_URL", "")
 
 # Groq settings
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
@@ -53,6 +59,9 @@ TIMESCALEDB_DATABASE = os.getenv("TIMESCALEDB_DATABASE", "sensors")
 TIMESCALEDB_USER = os.getenv("TIMESCALEDB_USER", "telegraf")
 TIMESCALEDB_PASSWORD = os.getenv("TIMESCALEDB_PASSWORD", "7OMyGmIG/5Ech8PYfvg1vykYffuaHNol")
 
+# Whisper STT, only used when a /converse client sends audio instead of text
+WHISPER_URL = os.getenv("WHISPER_URL", "")
+
 PROMETHEUS_URL = os.getenv("PROMETHEUS_URL", "http://192.168.0.167:9090")
 SEARXNG_URL = os.getenv("SEARXNG_URL", "http://192.168.0.198:8089")
 
@@ -77,9 +86,59 @@ ANTHROPIC_MAX_ITERATIONS = _cfg("anthropic", "max_iterations", default=5)
 GROQ_MAX_TOKENS = _cfg("groq", "max_tokens", default=1024)
 GROQ_MAX_ITERATIONS = _cfg("groq", "max_iterations", default=5)
 
-# Conversation
-MAX_HISTORY = _cfg("conversation", "max_history", default=12)
+# Answer common commands (lights, timers, time, date, weather) without the LLM
+INTENT_FASTPATH_ENABLED = os.getenv("INTENT_FASTPATH_ENABLED", "true").lower() == "true"
 
-# Keepalive
+# Conversation (per device session, keyed by the X-Device-ID header)
+MAX_HISTORY = _cfg("conversation", "max_history", default=12)
+MAX_HISTORY_TOKENS = _cfg("conversation", "max_history_tokens", default=2000)
+SESSION_TTL = _cfg("conversation", "session_ttl", default=1800)  # Idle seconds before a session is dropped
+
+# Shared HTTP connection pools (providers and tools)
+HTTP_POOL_MAX_CONNECTIONS = _cfg("http", "max_connections", default=50)
+HTTP_POOL_MAX_KEEPALIVE = _cfg("http", "max_keepalive", default=20)
+
+# Worker threads for LLM turns (/ask, /ask/stream, /converse); further turns queue for one
+TURN_WORKERS = _cfg("http", "turn_workers", default=16)
+
+# Hedged requests: with a provider chain, also ask the next provider when the
+# first is slower to its first token than its recent percentile
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "false").lower() == "true"
+HEDGE_PERCENTILE = _cfg("hedge", "percentile", default=95)
+HEDGE_MIN_DELAY = _cfg("hedge", "min_delay", default=1.5)  # Seconds; never hedge sooner
+HEDGE_MAX_DELAY = _cfg("hedge", "max_delay", default=8.0)  # Seconds; also used until enough samples
+
+# Circuit breakers for providers in a chain: skip a provider after repeated
+# failures, probe it again after open_seconds
+BREAKER_FAILURE_THRESHOLD = _cfg("breaker", "failure_threshold", default=3)  # Consecutive failures
+BREAKER_ERROR_RATE = _cfg("breaker", "error_rate", default=0.5)  # Or this share of the last 20 calls
+BREAKER_OPEN_SECONDS = _cfg("breaker", "open_seconds", default=30)
+
+# Admission control in front of Ollama: generations beyond max_concurrency
+# queue, and a request that would wait longer than wait_budget (or its
+# X-Deadline-Ms) goes to the next provider instead, or gets a "busy" reply
+# when Ollama is the only provider
+OLLAMA_MAX_CONCURRENCY = _cfg("admission", "ollama_max_concurrency", default=1)  # 0 = no limit
+ADMISSION_MAX_QUEUE = _cfg("admission", "max_queue", default=4)
+ADMISSION_WAIT_BUDGET = _cfg("admission", "wait_budget", default=3.0)  # Seconds
+
+# Tool execution (calls from one model turn run concurrently, each with a deadline)
+TOOL_MAX_WORKERS = _cfg("tools", "max_workers", default=8)
+TOOL_TIMEOUT = _cfg("tools", "timeout", default=15)  # Seconds, for tools without their own entry
+TOOL_TIMEOUTS = _cfg("tools", "timeouts", default={})  # Per-tool overrides, e.g. {web_search: 20}
+# Speak action-tool confirmations directly instead of a second LLM round (tools/terminal.py)
+TOOL_TERMINAL_RESPONSES = _cfg("tools", "terminal_responses", default=True)
+
+# Tool result cache (read-only tools; per-tool TTLs live in tools/cache.py)
+TOOL_CACHE_ENABLED = _cfg("tool_cache", "enabled", default=True)
+TOOL_CACHE_TTLS = _cfg("tool_cache", "ttls", default={})  # Per-tool overrides, e.g. {get_weather: 300}
+
+# Request-ID result cache (lets a voice retry after a broken stream reuse the answer)
+REQUEST_CACHE_TTL = _cfg("request_cache", "ttl", default=120)
+REQUEST_CACHE_WAIT = _cfg("request_cache", "wait", default=60)
+
+# Keepalive (keeps the Ollama model loaded between requests, preloads after a switch)
+KEEPALIVE_ENABLED = _cfg("keepalive", "enabled", default=True)
 KEEPALIVE_INTERVAL = _cfg("keepalive", "interval", default=180)
-KEEPALIVE_NUM_PREDICT = _cfg("keepalive", "num_predict", default=1)
+KEEPALIVE_NUM_PREDICT = _cfg("keepalive", "num_predict", default=0)  # 0 = load only; >0 = tiny generation (evicts the prompt cache)
+KEEPALIVE_MAX_IDLE = _cfg("keepalive", "max_idle", default=0)  # Stop pinging after this many idle seconds (0 = never)
@@ -0,0 +1,68 @@
+"""Shared, pooled HTTP clients for the brain.
+
+Providers and tools used to open a fresh connection per call (httpx.get,
+httpx.post, httpx.stream), paying TCP (and often TLS) setup every time.
+They now share keep-alive pools:
+
+- http_client(): sync client for provider and tool code. That code runs in
+  worker threads because the cloud SDKs, python-kasa wrappers and psycopg2
+  are blocking; httpx.Client is thread-safe, so every thread shares one pool.
+- async_http_client(): async client for code running on the event loop.
+
+Both are created at app startup (lazily when used outside the app, e.g. from
+a REPL) and closed at shutdown.
+"""
+
+import threading
+import httpx
+from config import HTTP_POOL_MAX_CONNECTIONS, HTTP_POOL_MAX_KEEPALIVE
+
+_lock = threading.Lock()
+_client: httpx.Client | None = None
+_async_client: httpx.AsyncClient | None = None
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=HTTP_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=30.0,
+    )
+
+
+def http_client() -> httpx.Client:
+    """Pooled sync client; call sites pass their own per-request timeouts."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = httpx.Client(limits=_limits(), timeout=10.0)
+    return _client
+
+
+def async_http_client() -> httpx.AsyncClient:
+    """Pooled async client for use on the event loop."""
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                _async_client = httpx.AsyncClient(limits=_limits(), timeout=10.0)
+    return _async_client
+
+
+def start():
+    """Open both pools (called from the app lifespan)."""
+    http_client()
+    async_http_client()
+
+
+async def aclose():
+    """Close both pools, dropping their keep-alive connections."""
+    global _client, _async_client
+    with _lock:
+        client, async_client = _client, _async_client
+        _client = _async_client = None
+    if client is not None:
+        client.close()
+    if async_client is not None:
+        await async_client.aclose()
@@ -0,0 +1,155 @@
+"""Deterministic intent fast path.
+
+Common commands ("turn off the kitchen light", "set a timer for 5 minutes",
+"what time is it") otherwise cost two LLM round-trips: one to pick the tool,
+one to phrase the result. Here a handful of anchored patterns map
+high-confidence utterances straight to TOOL_REGISTRY functions and answer
+from a template. Tool calls go through run_tools, so they get the same
+deadlines, result cache and metrics as the LLM's. Anything that doesn't
+match the whole utterance, or whose tool call fails, returns None and goes
+to the LLM as usual.
+"""
+
+import re
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from tools import TOOL_REGISTRY
+from tools.executor import run_tools
+from tools.kasa import KASA_DEVICES, WIZ_DEVICES
+from tools.terminal import TERMINAL_TOOLS
+from tools.weather import summarize_weather
+from metrics import INTENT_REQUESTS, INTENT_DURATION, INTENT_LATENCY_SAVED
+
+_TZ = "America/Toronto"  # Same zone the providers put in the system prompt
+
+_NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11,
+    "twelve": 12, "fifteen": 15, "twenty": 20, "thirty": 30, "forty": 40,
+    "forty five": 45, "fifty": 50, "sixty": 60, "ninety": 90,
+}
+
+# Light names as people say them: "kitchen light" / "living room lights" -> base name
+_LIGHT_NAMES = sorted(
+    {re.sub(r"\s+lights?$", "", name) for name in list(KASA_DEVICES) + list(WIZ_DEVICES)},
+    key=len, reverse=True,
+)
+_LIGHT = "(?P<name>" + "|".join(re.escape(n) for n in _LIGHT_NAMES) + r")(?:\s+lights?)?"
+_NUMBER = r"(?P<count>\d+|" + "|".join(sorted(_NUMBER_WORDS, key=len, reverse=True)) + ")"
+_UNIT = r"(?P<unit>seconds?|minutes?|hours?)"
+
+# Polite wrappers stripped before matching
+_PREFIX = re.compile(r"^(?:(?:hey\s+)?luna\s+)?(?:please\s+|can you\s+|could you\s+|would you\s+)*")
+_SUFFIX = re.compile(r"\s+(?:please|now|for me)$")
+
+
+def _normalize(text: str) -> str:
+    text = text.lower().replace("’", "'")
+    text = re.sub(r"[^\w\s']", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    text = _PREFIX.sub("", text)
+    return _SUFFIX.sub("", text)
+
+
+def _call(tool: str, **args) -> str:
+    return run_tools(TOOL_REGISTRY, [(tool, args)], "Intent")[0]
+
+
+def _light(match: re.Match) -> str | None:
+    name, action = match.group("name"), match.group("action")
+    result = _call("control_light", name=name, action=action)
+    if not TERMINAL_TOOLS["control_light"].success.search(result):
+        return None  # Let the LLM explain the failure (or find the right light)
+    return result.rstrip(".") + "."
+
+
+def _set_timer(match: re.Match) -> str | None:
+    count = match.group("count")
+    count = int(count) if count.isdigit() else _NUMBER_WORDS[count]
+    unit = match.group("unit").rstrip("s") + "s"
+    name = (match.groupdict().get("name") or "").strip()
+    result = _call("set_timer", duration=f"{count} {unit}", name=name)
+    if not result.startswith("Timer set"):
+        return None  # Let the LLM sort out whatever we misheard
+    return result
+
+
+def _cancel_timer(match: re.Match) -> str | None:
+    name = (match.group("name") or "").strip()
+    result = _call("cancel_timer", name=name)
+    if result.startswith("Error"):
+        return None
+    return result.rstrip(".") + "."
+
+
+def _time(match: re.Match) -> str:
+    now = datetime.now(ZoneInfo(_TZ))
+    return f"It's {now.strftime('%I:%M %p').lstrip('0')}."
+
+
+def _date(match: re.Match) -> str:
+    now = datetime.now(ZoneInfo(_TZ))
+    return f"Today is {now.strftime('%A, %B')} {now.day}."
+
+
+def _weather(match: re.Match) -> str | None:
+    return summarize_weather(_call("get_weather"))
+
+
+# (intent name, full-utterance pattern, handler). First match wins.
+_INTENTS = [
+    ("light", re.compile(rf"^(?:turn|switch) (?P<action>on|off) (?:the )?{_LIGHT}$"), _light),
+    ("light", re.compile(rf"^(?:turn|switch) (?:the )?{_LIGHT} (?P<action>on|off)$"), _light),
+    ("set_timer", re.compile(
+        rf"^(?:set|start) (?:a |an )?(?:(?P<name>[a-z]+) )?timer for {_NUMBER} {_UNIT}$"), _set_timer),
+    ("set_timer", re.compile(
+        rf"^(?:set|start) (?:a |an )?{_NUMBER} {_UNIT} timer(?: for (?:the )?(?P<name>[a-z]+))?$"), _set_timer),
+    ("cancel_timer", re.compile(
+        r"^(?:cancel|stop|delete) (?:the |my )?(?:(?P<name>(?!the\b|my\b)[a-z]+) )?timer$"), _cancel_timer),
+    ("time", re.compile(r"^(?:what time is it|what(?:'?s| is) the time)(?: right)?$"), _time),
+    ("date", re.compile(
+        r"^(?:what(?:'?s| is) (?:the |today's )?date(?: today)?|what day is (?:it|today))$"), _date),
+    ("weather", re.compile(
+        r"^(?:what(?:'?s| is)|how(?:'?s| is)) the weather(?: like)?(?: (?:today|outside|right now))?$"), _weather),
+]
+
+# Running average of LLM-path request time, to estimate what a hit saved
+_avg_llm_seconds = 0.0
+
+
+def record_llm_duration(seconds: float):
+    """Feed an LLM-answered request's duration into the latency-saved estimate."""
+    global _avg_llm_seconds
+    if _avg_llm_seconds == 0.0:
+        _avg_llm_seconds = seconds
+    else:
+        _avg_llm_seconds = 0.9 * _avg_llm_seconds + 0.1 * seconds
+
+
+def route(text: str) -> str | None:
+    """Answer text from the fast path, or return None to use the LLM."""
+    normalized = _normalize(text)
+    for name, pattern, handler in _INTENTS:
+        match = pattern.match(normalized)
+        if not match:
+            continue
+        start = time.time()
+        try:
+            response = handler(match)
+        except Exception as e:
+            print(f"[Intent] {name} handler failed, falling back to LLM: {e}")
+            response = None
+        elapsed = time.time() - start
+        INTENT_DURATION.labels(intent=name).observe(elapsed)
+        if response is None:
+            INTENT_REQUESTS.labels(intent=name, result="fallback").inc()
+            return None
+        INTENT_REQUESTS.labels(intent=name, result="hit").inc()
+        if _avg_llm_seconds:
+            INTENT_LATENCY_SAVED.inc(max(0.0, _avg_llm_seconds - elapsed))
+        print(f"[Intent] {name}: {text!r} -> {response!r}")
+        return response
+    INTENT_REQUESTS.labels(intent="none", result="miss").inc()
+    return None
@@ -4,7 +4,8 @@ from .base import LLMProvider
 from .ollama import OllamaProvider
 from .anthropic import AnthropicProvider
 from .groq import GroqProvider
-from .fallback import FallbackProvider
+from .fallback import FallbackProvider, StandaloneProvider
+from .admission import AdmissionController, AdmittedProvider
 
 
 def _build_single_provider(
@@ -14,8 +15,11 @@ def _build_single_provider(
     ollama_model: str = "",
     ollama_auto_model: bool = True,
     ollama_model_refresh_seconds: int = 5,
+    ollama_router_model: str = "",
+    ollama_structured_routing: bool = False,
     anthropic_api_key: str = "",
     anthropic_model: str = "",
+    anthropic_base_url: str = "",
     groq_api_key: str = "",
     groq_model: str = "",
 ) -> LLMProvider:
@@ -31,6 +35,8 @@ def _build_single_provider(
             tool_registry=tool_registry,
             auto_model=ollama_auto_model,
             model_refresh_seconds=ollama_model_refresh_seconds,
+            router_model=ollama_router_model,
+            structured_routing=ollama_structured_routing,
         )
 
     if name == "anthropic":
@@ -40,6 +46,7 @@ def _build_single_provider(
             api_key=anthropic_api_key,
             model=anthropic_model or "claude-3-haiku-20240307",
             tool_registry=tool_registry,
+            base_url=anthropic_base_url,
         )
 
     if name == "groq":
@@ -62,12 +69,28 @@ def get_provider(
     ollama_model: str = "",
     ollama_auto_model: bool = True,
     ollama_model_refresh_seconds: int = 5,
+    ollama_router_model: str = "",
+    ollama_structured_routing: bool = False,
     # Anthropic settings
     anthropic_api_key: str = "",
     anthropic_model: str = "",
+    anthropic_base_url: str = "",
     # Groq settings
     groq_api_key: str = "",
     groq_model: str = "",
+    # Hedging (fallback chains only)
+    hedge_enabled: bool = False,
+    hedge_percentile: float = 95,
+    hedge_min_delay: float = 1.5,
+    hedge_max_delay: float = 8.0,
+    # Circuit breakers (fallback chains only)
+    breaker_failure_threshold: int = 3,
+    breaker_error_rate: float = 0.5,
+    breaker_open_seconds: float = 30.0,
+    # Admission control in front of Ollama (fallback chains only; 0 = off)
+    ollama_max_concurrency: int = 1,
+    admission_max_queue: int = 4,
+    admission_wait_budget: float = 3.0,
 ) -> LLMProvider:
     """Factory: build one provider or a FallbackProvider chain.
 
@@ -88,8 +111,11 @@ def get_provider(
         ollama_model=ollama_model,
         ollama_auto_model=ollama_auto_model,
         ollama_model_refresh_seconds=ollama_model_refresh_seconds,
+        ollama_router_model=ollama_router_model,
+        ollama_structured_routing=ollama_structured_routing,
         anthropic_api_key=anthropic_api_key,
         anthropic_model=anthropic_model,
+        anthropic_base_url=anthropic_base_url,
         groq_api_key=groq_api_key,
         groq_model=groq_model,
     )
@@ -105,14 +131,40 @@ def get_provider(
     if not providers:
         raise ValueError(f"No usable LLM providers from: {provider_name}")
 
+    admission_options = {
+        "OllamaProvider": dict(
+            max_concurrency=ollama_max_concurrency,
+            max_queue=admission_max_queue,
+            wait_budget=admission_wait_budget,
+        ),
+    } if ollama_max_concurrency > 0 else {}
+
     if len(providers) == 1:
-        return providers[0]
+        provider = providers[0]
+        if isinstance(provider, (AnthropicProvider, GroqProvider)):
+            return StandaloneProvider(provider)
+        options = admission_options.get(type(provider).__name__)
+        if options is None:
+            return provider
+        return AdmittedProvider(provider, AdmissionController(type(provider).__name__, **options))
 
     log.info(
-        f"Using fallback chain: {' → '.join(names)}",
-        extra={"event": "provider_chain", "chain": names}
+        f"Using fallback chain: {' → '.join(names)}" + (" (hedged)" if hedge_enabled else ""),
+        extra={"event": "provider_chain", "chain": names, "hedge": hedge_enabled}
+    )
+    return FallbackProvider(
+        providers,
+        hedge=hedge_enabled,
+        hedge_percentile=hedge_percentile,
+        hedge_min_delay=hedge_min_delay,
+        hedge_max_delay=hedge_max_delay,
+        breaker_options=dict(
+            failure_threshold=breaker_failure_threshold,
+            error_rate=breaker_error_rate,
+            open_seconds=breaker_open_seconds,
+        ),
+        admission_options=admission_options,
     )
-    return FallbackProvider(providers)
 
 
 __all__ = [
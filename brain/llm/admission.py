@@ -0,0 +1,161 @@
+"""Admission control in front of concurrency-limited providers.
+
+A single-GPU Ollama box generates one answer at a time well; concurrent
+requests from several voice nodes just queue up inside Ollama where nobody
+can see them. The fallback chain instead takes a slot here before calling a
+limited provider. Up to `max_concurrency` requests run; the next `max_queue`
+wait in line. A request that would wait longer than its budget (the
+configured `wait_budget`, or less if the client's deadline is closer) is
+refused at once with AdmissionRejected so the chain can route it to the next
+provider. Expected wait is estimated from the queue position and an EWMA of
+how long a slot is held.
+
+A single-provider deployment has nowhere to reroute to; AdmittedProvider
+puts the lone provider behind the same controller and sheds a request that
+would wait too long with BUSY_RESPONSE instead of piling it onto the GPU.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from .base import LLMProvider
+from .context import time_remaining
+from metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_WAIT, ADMISSION_REJECTIONS
+
+log = logging.getLogger("brain")
+
+BUSY_RESPONSE = "Sorry, I'm busy with another request right now. Please try again in a moment."
+
+
+class AdmissionRejected(RuntimeError):
+    """The provider is too busy to start this request within its budget."""
+
+
+class AdmissionController:
+    """Bounded in-flight + queue for one provider; see module docstring."""
+
+    def __init__(self, name: str, max_concurrency: int = 1, max_queue: int = 4, wait_budget: float = 3.0):
+        self.name = name
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_queue = max(0, int(max_queue))
+        self.wait_budget = wait_budget
+        self._in_flight = 0
+        self._waiting = 0
+        self._service_ewma = None  # Seconds a slot is typically held
+        self._cond = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def expected_wait(self) -> float:
+        """Estimated seconds before a request arriving now would get a slot."""
+        with self._cond:
+            return self._expected_wait()
+
+    def _expected_wait(self) -> float:
+        ahead = self._in_flight + self._waiting - self.max_concurrency + 1
+        if ahead <= 0:
+            return 0.0
+        return ahead * (self._service_ewma or 0.0) / self.max_concurrency
+
+    def _reject(self, reason: str, detail: str):
+        ADMISSION_REJECTIONS.labels(provider=self.name, reason=reason).inc()
+        raise AdmissionRejected(f"{self.name} {detail}")
+
+    @contextmanager
+    def slot(self, deadline_remaining: float | None = None, reroutable: bool = True):
+        """Hold one generation slot for the duration of the block.
+
+        Raises AdmissionRejected when the queue is full or the expected (or
+        actual) wait exceeds the budget. With reroutable=False (nowhere else
+        to send the request) it waits for a slot however long it takes.
+        """
+        budget = self.wait_budget
+        reason = "budget"
+        if deadline_remaining is not None and deadline_remaining < budget:
+            budget, reason = max(0.0, deadline_remaining), "deadline"
+        start = time.monotonic()
+        with self._cond:
+            if self._in_flight >= self.max_concurrency and not reroutable:
+                self._waiting += 1
+                ADMISSION_QUEUE_DEPTH.labels(provider=self.name).set(self._waiting)
+                try:
+                    self._cond.wait_for(lambda: self._in_flight < self.max_concurrency)
+                finally:
+                    self._waiting -= 1
+                    ADMISSION_QUEUE_DEPTH.labels(provider=self.name).set(self._waiting)
+            elif self._in_flight >= self.max_concurrency:
+                if self._waiting >= self.max_queue:
+                    self._reject("queue_full", f"queue is full ({self._waiting} waiting)")
+                expected = self._expected_wait()
+                if expected > budget:
+                    self._reject(reason, f"expected wait {expected:.1f}s exceeds {budget:.1f}s {reason}")
+                self._waiting += 1
+                ADMISSION_QUEUE_DEPTH.labels(provider=self.name).set(self._waiting)
+                try:
+                    got_slot = self._cond.wait_for(lambda: self._in_flight < self.max_concurrency,
+                                                   timeout=budget)
+                finally:
+                    self._waiting -= 1
+                    ADMISSION_QUEUE_DEPTH.labels(provider=self.name).set(self._waiting)
+                if not got_slot:
+                    self._reject(reason, f"no slot within {budget:.1f}s {reason}")
+            self._in_flight += 1
+            ADMISSION_IN_FLIGHT.labels(provider=self.name).set(self._in_flight)
+        ADMISSION_WAIT.labels(provider=self.name).observe(time.monotonic() - start)
+
+        held_from = time.monotonic()
+        try:
+            yield
+        finally:
+            held = time.monotonic() - held_from
+            with self._cond:
+                self._in_flight -= 1
+                self._service_ewma = held if self._service_ewma is None else (
+                    0.8 * self._service_ewma + 0.2 * held)
+                ADMISSION_IN_FLIGHT.labels(provider=self.name).set(self._in_flight)
+                self._cond.notify()
+
+
+class AdmittedProvider(LLMProvider):
+    """A lone provider behind an AdmissionController; see module docstring."""
+
+    def __init__(self, provider: LLMProvider, admission: AdmissionController):
+        self.provider = provider
+        self.admission = admission
+
+    @property
+    def providers(self) -> list:
+        return [self.provider]
+
+    @property
+    def provider_names(self) -> list[str]:
+        return [type(self.provider).__name__]
+
+    def in_flight(self) -> int:
+        return self.admission.in_flight
+
+    def close(self):
+        self.provider.close()
+
+    def _shed(self, e: AdmissionRejected):
+        log.info(f"{e}; shedding request", extra={"event": "provider_busy", "provider": self.admission.name})
+
+    def chat(self, user_message: str, system_prompt: str, tools: list, history: list = None) -> str:
+        try:
+            with self.admission.slot(time_remaining()):
+                return self.provider.chat(user_message, system_prompt, tools, history)
+        except AdmissionRejected as e:
+            self._shed(e)
+            return BUSY_RESPONSE
+
+    def chat_stream(self, user_message: str, system_prompt: str, tools: list, history: list = None):
+        try:
+            with self.admission.slot(time_remaining()):
+                yield from self.provider.chat_stream(user_message, system_prompt, tools, history)
+        except AdmissionRejected as e:
+            self._shed(e)
+            yield BUSY_RESPONSE
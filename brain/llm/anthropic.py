@@ -1,48 +1,92 @@
 """Anthropic (Claude) LLM provider."""
 
+import time
 import anthropic
 from .base import LLMProvider, convert_tools_to_anthropic
+from .context import is_cancelled
+from tools.executor import run_tools
+from tools.terminal import terminal_reply
+from metrics import LLM_CALLS_TOTAL, LLM_DURATION, LLM_ERRORS, LLM_CACHE_TOKENS
+
+# Prompt-cache breakpoint; Anthropic caches everything up to and including the marked block
+_CACHE_BREAKPOINT = {"type": "ephemeral"}
 
 
 class AnthropicProvider(LLMProvider):
     """Anthropic Claude LLM provider with tool calling support."""
 
-    def __init__(self, api_key: str, model: str, tool_registry: dict):
-        self.client = anthropic.Anthropic(api_key=api_key)
+    def __init__(self, api_key: str, model: str, tool_registry: dict, base_url: str = ""):
+        self.client = anthropic.Anthropic(api_key=api_key, base_url=base_url or None)
         self.model = model
         self.tool_registry = tool_registry
+        self._prefix = None  # (key, system blocks, tools) built by _stable_prefix()
+
+    def probe(self):
+        """Cheap availability check for the circuit breaker (lists models, no tokens)."""
+        self.client.models.list(limit=1, timeout=5.0)
+
+    def _stable_prefix(self, system_prompt: str, tools: list) -> tuple[list, list]:
+        """System and tool blocks, converted once and marked as cache breakpoints.
+
+        Tools render before the system prompt, so the breakpoint on the last
+        tool caches the tool list and the one on the system block caches
+        both. The time lives in the user turn (build_messages), so this
+        prefix is identical on every request and every tool iteration.
+        """
+        key = (system_prompt, id(tools))
+        prefix = self._prefix
+        if prefix is None or prefix[0] != key:
+            anthropic_tools = [dict(tool) for tool in convert_tools_to_anthropic(tools)]
+            if anthropic_tools:
+                anthropic_tools[-1]["cache_control"] = _CACHE_BREAKPOINT
+            system = [{
+                "type": "text",
+                "text": self.build_system_prompt(system_prompt),
+                "cache_control": _CACHE_BREAKPOINT,
+            }]
+            prefix = self._prefix = (key, system, anthropic_tools)
+        return prefix[1], prefix[2]
+
+    def _record_usage(self, usage):
+        """Count input tokens by cache outcome."""
+        if usage is None:
+            return
+        for kind, value in (
+            ("read", getattr(usage, "cache_read_input_tokens", None)),
+            ("write", getattr(usage, "cache_creation_input_tokens", None)),
+            ("uncached", getattr(usage, "input_tokens", None)),
+        ):
+            if value:
+                LLM_CACHE_TOKENS.labels(provider="anthropic", kind=kind).inc(value)
 
     def chat(self, user_message: str, system_prompt: str, tools: list, history: list = None) -> str:
         """Send a message to Claude and handle tool calls."""
-        full_prompt = system_prompt + self.get_time_context()
-
-        messages = []
-        # Add conversation history
-        if history:
-            messages.extend(history)
-        messages.append({"role": "user", "content": user_message})
-
-        anthropic_tools = convert_tools_to_anthropic(tools)
+        system, anthropic_tools = self._stable_prefix(system_prompt, tools)
+        messages = self.build_messages(user_message, system_prompt, history, include_system=False)
 
         print(f"[Claude] Model: {self.model}")
-        print(f"[Claude] Tools: {anthropic_tools}")
 
         max_iterations = 5
         for _ in range(max_iterations):
+            start_time = time.time()
             try:
                 response = self.client.messages.create(
                     model=self.model,
                     max_tokens=1024,
-                    system=full_prompt,
+                    system=system,
                     tools=anthropic_tools,
                     tool_choice={"type": "auto"},
                     messages=messages
                 )
+                LLM_CALLS_TOTAL.labels(provider="anthropic", model=self.model).inc()
+                LLM_DURATION.labels(provider="anthropic").observe(time.time() - start_time)
+                self._record_usage(response.usage)
                 print(f"[Claude] Stop reason: {response.stop_reason}")
                 print(f"[Claude] Content: {response.content}")
-            except Exception as e:
+            except anthropic.APIError as e:
                 print(f"Anthropic error: {e}")
-                return "Sorry, I couldn't process that request."
+                LLM_ERRORS.labels(provider="anthropic", error_type=type(e).__name__).inc()
+                raise  # propagate to FallbackProvider
 
             # Check if we need to handle tool use
             if response.stop_reason == "tool_use":
@@ -53,26 +97,9 @@ class AnthropicProvider(LLMProvider):
                 })
 
                 # Process tool calls
-                tool_results = []
-                for block in response.content:
-                    if block.type == "tool_use":
-                        func_name = block.name
-                        func_args = block.input
-
-                        print(f"[Claude] Tool call: {func_name}({func_args})")
-
-                        if func_name in self.tool_registry:
-                            result = self.tool_registry[func_name](**func_args)
-                        else:
-                            result = f"Unknown tool: {func_name}"
-
-                        print(f"[Claude] Tool result: {str(result)[:200]}...")
-
-                        tool_results.append({
-                            "type": "tool_result",
-                            "tool_use_id": block.id,
-                            "content": str(result)
-                        })
+                tool_results, reply = self._run_tools(response.content)
+                if reply:
+                    return reply
 
                 # Add tool results to messages
                 messages.append({
@@ -87,3 +114,85 @@ class AnthropicProvider(LLMProvider):
                 return ""
 
         return "Sorry, I ran into too many steps trying to answer that."
+
+    def chat_stream(self, user_message: str, system_prompt: str, tools: list, history: list = None):
+        """Same as chat() but streams text with messages.stream().
+
+        Tool-use turns run their tools and loop; text is forwarded as it
+        arrives, including any short preamble Claude writes before a tool call.
+        API errors propagate so FallbackProvider can move on before any tokens.
+        """
+        system, anthropic_tools = self._stable_prefix(system_prompt, tools)
+        messages = self.build_messages(user_message, system_prompt, history, include_system=False)
+
+        max_iterations = 5
+        spoke = False
+        for _ in range(max_iterations):
+            if is_cancelled():
+                return
+            start_time = time.time()
+            try:
+                with self.client.messages.stream(
+                    model=self.model,
+                    max_tokens=1024,
+                    system=system,
+                    tools=anthropic_tools,
+                    tool_choice={"type": "auto"},
+                    messages=messages
+                ) as stream:
+                    first = True
+                    for text in stream.text_stream:
+                        if is_cancelled():
+                            return  # Leaving the context manager closes the SDK stream
+                        if not text:
+                            continue
+                        if first and spoke:
+                            yield " "  # Keep a preamble and the answer from running together
+                        first = False
+                        spoke = True
+                        yield text
+                    response = stream.get_final_message()
+                LLM_CALLS_TOTAL.labels(provider="anthropic", model=self.model).inc()
+                self._record_usage(response.usage)
+                LLM_DURATION.labels(provider="anthropic").observe(time.time() - start_time)
+            except anthropic.APIError as e:
+                LLM_ERRORS.labels(provider="anthropic", error_type=type(e).__name__).inc()
+                raise  # propagate to FallbackProvider
+
+            print(f"[Claude] Stop reason: {response.stop_reason}")
+            if response.stop_reason != "tool_use":
+                return
+
+            messages.append({
+                "role": "assistant",
+                "content": response.content
+            })
+            if is_cancelled():
+                return
+            tool_results, reply = self._run_tools(response.content)
+            if reply:
+                if spoke:
+                    yield " "  # After a preamble
+                yield reply
+                return
+            messages.append({
+                "role": "user",
+                "content": tool_results
+            })
+
+        yield "Sorry, I ran into too many steps trying to answer that."
+
+    def _run_tools(self, content: list) -> tuple[list[dict], str | None]:
+        """Run the turn's tool_use blocks concurrently and build the tool_result blocks.
+
+        Also returns the terminal reply (tools/terminal.py) when the results
+        already answer the request, else None.
+        """
+        blocks = [block for block in content if block.type == "tool_use"]
+        calls = [(b.name, b.input) for b in blocks]
+        results = run_tools(self.tool_registry, calls, "Claude")
+        tool_results = [
+            {"type": "tool_result", "tool_use_id": block.id, "content": result}
+            for block, result in zip(blocks, results)
+        ]
+        return tool_results, terminal_reply(calls, results, "anthropic")
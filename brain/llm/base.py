@@ -28,8 +28,20 @@ class LLMProvider(ABC):
         """Yields token strings. Default falls back to non-streaming chat()."""
         yield self.chat(user_message, system_prompt, tools, history)
 
+    def close(self):
+        """Release background resources when the provider is replaced. Default: nothing."""
+
+    # Appended to the system prompt once. The time itself goes in the user
+    # turn (see build_messages) so the system prompt stays byte-identical
+    # across requests and the server can reuse its prompt cache.
+    TIME_GUIDANCE = """
+
+The current date and time is given in brackets at the start of each user message.
+
+IMPORTANT: For simple questions like "what time is it?" or "what's the date?", just answer directly using that time. Do NOT use tools for basic time/date questions."""
+
     def get_time_context(self) -> str:
-        """Get current date/time context to append to system prompt."""
+        """Get the current date/time line that prefixes the user's message."""
         try:
             tz = ZoneInfo("America/Toronto")
             now = datetime.now(tz)
@@ -39,10 +51,23 @@ class LLMProvider(ABC):
         time_str = now.strftime("%I:%M %p")
         date_str = now.strftime("%A, %B %d, %Y")
 
-        return f"""
-Current date and time: {date_str}, {time_str}
-
-IMPORTANT: For simple questions like "what time is it?" or "what's the date?", just answer directly using the time above. Do NOT use tools for basic time/date questions."""
+        return f"Current date and time: {date_str}, {time_str}"
+
+    def build_system_prompt(self, system_prompt: str) -> str:
+        """The stable system prompt: identical for every request."""
+        return system_prompt + self.TIME_GUIDANCE
+
+    def build_messages(self, user_message: str, system_prompt: str, history: list = None,
+                       include_system: bool = True) -> list:
+        """Assemble messages stable-prefix first: system prompt, then history,
+        then the volatile part (time + the new user message) last."""
+        messages = []
+        if include_system:
+            messages.append({"role": "system", "content": self.build_system_prompt(system_prompt)})
+        if history:
+            messages.extend(history)
+        messages.append({"role": "user", "content": f"[{self.get_time_context()}]\n{user_message}"})
+        return messages
 
 
 def convert_tools_to_anthropic(tools: list) -> list:
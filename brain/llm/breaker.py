@@ -0,0 +1,166 @@
+"""Per-provider circuit breakers for the fallback chain.
+
+Without one, every request to a dead provider pays its full connect timeout
+before the chain moves on, even right after the last request failed the
+same way. A breaker tracks recent outcomes per provider:
+
+- closed: requests flow. It opens after `failure_threshold` consecutive
+  failures, or when the error rate over the last `window` calls reaches
+  `error_rate` (once there are at least `window // 2` of them).
+- open: the provider is skipped instantly. After `open_seconds` a background
+  probe (the provider's cheap probe(), e.g. Ollama's /api/version) runs.
+- half-open: the probe passed, or the provider has no probe. The next real
+  request is let through as a trial. Success closes the breaker; failure
+  re-opens it.
+
+available() only looks; allow() also reserves the half-open trial, so the
+chain calls it just before it actually sends a request to the provider.
+
+A latency EWMA of successful calls is kept alongside, for /admin/provider.
+"""
+
+import threading
+import time
+from collections import deque
+
+from metrics import PROVIDER_BREAKER_STATE, PROVIDER_BREAKER_TRANSITIONS
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class BreakerOpen(RuntimeError):
+    """The breaker turned the request away when it was about to be sent."""
+
+
+class CircuitBreaker:
+    """Breaker for one provider; see module docstring."""
+
+    def __init__(self, name: str, probe=None, failure_threshold: int = 3, error_rate: float = 0.5,
+                 window: int = 20, open_seconds: float = 30.0):
+        self.name = name
+        self.probe = probe  # Callable raising on failure, or None
+        self.failure_threshold = failure_threshold
+        self.error_rate = error_rate
+        self.open_seconds = open_seconds
+        self._outcomes = deque(maxlen=window)  # True = success
+        self._consecutive_failures = 0
+        self._latency_ewma = None
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+        PROVIDER_BREAKER_STATE.labels(provider=name).set(0)
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def available(self) -> bool:
+        """Could a request go to this provider now? Reserves nothing."""
+        with self._lock:
+            return self._check(reserve=False)
+
+    def allow(self) -> bool:
+        """May a request go to this provider now? In half-open this takes the trial."""
+        with self._lock:
+            return self._check(reserve=True)
+
+    def release(self):
+        """Give back a trial that ended without saying anything about the provider."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _check(self, reserve: bool) -> bool:
+        if self._state == CLOSED:
+            return True
+        if self._state == HALF_OPEN:
+            now = time.monotonic()
+            # One trial request at a time (a trial that never reported back, e.g. a
+            # cancelled request, stops blocking after open_seconds)
+            if self._trial_in_flight and now - self._trial_started < self.open_seconds:
+                return False
+            if reserve:
+                self._trial_in_flight = True
+                self._trial_started = now
+            return True
+        if time.monotonic() - self._opened_at >= self.open_seconds and not self._probing:
+            self._probing = True
+            threading.Thread(target=self._run_probe, daemon=True,
+                             name=f"breaker-probe-{self.name}").start()
+        return False
+
+    def record_success(self, seconds: float):
+        with self._lock:
+            self._outcomes.append(True)
+            self._consecutive_failures = 0
+            self._latency_ewma = seconds if self._latency_ewma is None else (
+                0.8 * self._latency_ewma + 0.2 * seconds)
+            self._trial_in_flight = False
+            if self._state != CLOSED:
+                self._outcomes.clear()  # Start the error rate afresh after recovering
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._outcomes.append(False)
+            self._consecutive_failures += 1
+            self._trial_in_flight = False
+            if self._state == HALF_OPEN or self._should_open():
+                self._open()
+
+    def status(self) -> dict:
+        with self._lock:
+            status = {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "error_rate": round(self._current_error_rate(), 3),
+                "latency_ewma_seconds": round(self._latency_ewma, 3) if self._latency_ewma is not None else None,
+            }
+            if self._state == OPEN:
+                status["retry_in_seconds"] = round(
+                    max(0.0, self.open_seconds - (time.monotonic() - self._opened_at)), 1)
+            return status
+
+    def _current_error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def _should_open(self) -> bool:
+        if self._state != CLOSED:
+            return False
+        if self._consecutive_failures >= self.failure_threshold:
+            return True
+        return (len(self._outcomes) >= max(1, self._outcomes.maxlen // 2)
+                and self._current_error_rate() >= self.error_rate)
+
+    def _open(self):
+        self._opened_at = time.monotonic()
+        self._transition(OPEN)
+
+    def _transition(self, state: str):
+        previous, self._state = self._state, state
+        PROVIDER_BREAKER_STATE.labels(provider=self.name).set(_STATE_VALUES[state])
+        PROVIDER_BREAKER_TRANSITIONS.labels(provider=self.name, state=state).inc()
+        print(f"[Breaker] {self.name}: {previous} -> {state}")
+
+    def _run_probe(self):
+        ok = True
+        if self.probe is not None:
+            try:
+                self.probe()
+            except Exception as e:
+                ok = False
+                print(f"[Breaker] {self.name} probe failed: {e}")
+        with self._lock:
+            self._probing = False
+            if self._state != OPEN:
+                return
+            if ok:
+                self._trial_in_flight = False
+                self._transition(HALF_OPEN)
+            else:
+                self._opened_at = time.monotonic()  # Stay open another open_seconds
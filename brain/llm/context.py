@@ -0,0 +1,90 @@
+"""Per-request context shared between the endpoint and the provider tool loops.
+
+Providers run synchronously inside whatever thread serves the request, so
+the endpoint sets up a scope (via contextvars) and providers report progress
+through emit_event() and poll is_cancelled() without every chat()/chat_stream()
+signature growing extra parameters.
+"""
+
+import threading
+import time
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+_on_event: ContextVar[Optional[Callable[[dict], None]]] = ContextVar("llm_on_event", default=None)
+_cancel: ContextVar[Optional[threading.Event]] = ContextVar("llm_cancel", default=None)
+_deadline: ContextVar[Optional[float]] = ContextVar("llm_deadline", default=None)
+_claim_tools: ContextVar[Optional[Callable[[], bool]]] = ContextVar("llm_claim_tools", default=None)
+
+
+class ToolRightsLost(RuntimeError):
+    """Raised in a hedged attempt that wanted to run tools after another attempt won."""
+
+
+@contextmanager
+def request_scope(on_event: Optional[Callable[[dict], None]] = None,
+                  cancel: Optional[threading.Event] = None,
+                  deadline: Optional[float] = None):
+    """Route provider events (e.g. tool calls) for the current request to on_event.
+
+    Setting `cancel` tells providers to abort their upstream stream and skip
+    any remaining tool iterations. `deadline` (a time.monotonic() value) is
+    when the client stops waiting; see time_remaining().
+    """
+    event_token = _on_event.set(on_event)
+    cancel_token = _cancel.set(cancel)
+    deadline_token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(deadline_token)
+        _cancel.reset(cancel_token)
+        _on_event.reset(event_token)
+
+
+@contextmanager
+def attempt_scope(cancel: threading.Event, claim_tools: Callable[[], bool]):
+    """Run one of several racing provider attempts for the current request.
+
+    The attempt gets its own cancel flag, and must win claim_tools() before
+    running any tool so only one attempt ever causes side effects. Events
+    still go to the request's listener.
+    """
+    cancel_token = _cancel.set(cancel)
+    claim_token = _claim_tools.set(claim_tools)
+    try:
+        yield
+    finally:
+        _claim_tools.reset(claim_token)
+        _cancel.reset(cancel_token)
+
+
+def claim_tools() -> bool:
+    """True if this attempt may run tools (always, outside a hedged race)."""
+    claim = _claim_tools.get()
+    return claim is None or claim()
+
+
+def time_remaining() -> Optional[float]:
+    """Seconds until the current request's client deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def is_cancelled() -> bool:
+    """True once the current request's client has gone away or cancelled."""
+    cancel = _cancel.get()
+    return cancel is not None and cancel.is_set()
+
+
+def emit_event(kind: str, **data):
+    """Report provider progress to the current request's listener, if any."""
+    listener = _on_event.get()
+    if listener is None:
+        return
+    try:
+        listener({"type": kind, **data})
+    except Exception:
+        pass  # A slow or closed listener must never break the tool loop
@@ -1,7 +1,13 @@
 """Fallback provider chain — tries providers in order until one succeeds."""
 
 import logging
+import time
+from contextlib import nullcontext
 from .base import LLMProvider
+from .admission import AdmissionController, AdmissionRejected
+from .breaker import BreakerOpen, CircuitBreaker
+from .context import ToolRightsLost, is_cancelled, time_remaining
+from .hedging import HedgedStream, hedge_delay
 
 log = logging.getLogger("brain")
 
@@ -12,24 +18,140 @@ class FallbackProvider(LLMProvider):
     Providers should raise exceptions on connectivity/availability failures so
     the chain can move on.  Logic-level failures (model confusion, tool loops)
     are returned as text and are not retried.
+
+    With hedge=True, streaming requests race the first two providers: the
+    second is started once the first is slower to its first token than its
+    recent `hedge_percentile` (see hedging.py), and the first to stream wins.
+
+    Each provider has a circuit breaker (see breaker.py); providers whose
+    breaker is open are skipped without a request, unless every one is.
+
+    Providers named in `admission_options` (the local GPU model) go through an
+    AdmissionController (see admission.py): when their queue is too long for
+    the wait budget or the client's deadline, the request moves on instead.
     """
 
-    def __init__(self, providers: list):
+    def __init__(self, providers: list, hedge: bool = False, hedge_percentile: float = 95,
+                 hedge_min_delay: float = 1.5, hedge_max_delay: float = 8.0,
+                 breaker_options: dict = None, admission_options: dict = None):
         if not providers:
             raise ValueError("FallbackProvider requires at least one provider")
         self.providers = providers
+        self.breakers = {
+            id(p): CircuitBreaker(type(p).__name__, probe=getattr(p, "probe", None), **(breaker_options or {}))
+            for p in providers
+        }
+        admission_options = admission_options or {}
+        self.admission = {
+            id(p): AdmissionController(type(p).__name__, **admission_options[type(p).__name__])
+            for p in providers if type(p).__name__ in admission_options
+        }
+        self.hedge = hedge and len(providers) > 1
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_max_delay = hedge_max_delay
 
     @property
     def provider_names(self) -> list[str]:
         return [type(p).__name__ for p in self.providers]
 
+    def close(self):
+        for provider in self.providers:
+            provider.close()
+
+    def in_flight(self) -> int:
+        """Generations currently holding an admission slot, across the chain."""
+        return sum(controller.in_flight for controller in self.admission.values())
+
+    def breaker_status(self) -> dict:
+        return {type(p).__name__: self.breakers[id(p)].status() for p in self.providers}
+
+    def _available(self) -> tuple[list, bool]:
+        """Providers whose breaker would let a request through, in chain order.
+
+        Nothing is reserved here; the second value says whether each attempt
+        must still take its breaker's go-ahead (False when every breaker is
+        open and the whole chain is tried regardless).
+        """
+        available = [p for p in self.providers if self.breakers[id(p)].available()]
+        if not available:
+            log.warning(
+                "All provider circuit breakers are open; trying the whole chain",
+                extra={"event": "all_breakers_open"}
+            )
+            return list(self.providers), False
+        skipped = [type(p).__name__ for p in self.providers if p not in available]
+        if skipped:
+            print(f"[Fallback] Skipping providers with open breakers: {', '.join(skipped)}")
+        return available, True
+
+    def _reserve(self, provider, gated: bool):
+        """Take the breaker's go-ahead right before provider is actually called."""
+        if gated and not self.breakers[id(provider)].allow():
+            raise BreakerOpen(f"{type(provider).__name__} breaker is not taking requests")
+
+    def _admitted(self, provider, last: bool):
+        """Hold an admission slot for provider, if it is concurrency-limited.
+
+        Raises AdmissionRejected (before any request) when it's too busy,
+        unless it's the last provider left to try.
+        """
+        controller = self.admission.get(id(provider))
+        if controller is None:
+            return nullcontext()
+        return controller.slot(time_remaining(), reroutable=not last)
+
+    def _guarded_stream(self, provider, args: tuple, last: bool = False, gated: bool = True):
+        """provider.chat_stream(*args) behind admission control, reporting the outcome to its breaker."""
+        breaker = self.breakers[id(provider)]
+        with self._admitted(provider, last):
+            self._reserve(provider, gated)
+            start = time.monotonic()
+            reported = False
+            try:
+                for token in provider.chat_stream(*args):
+                    if not reported:
+                        breaker.record_success(time.monotonic() - start)
+                        reported = True
+                    yield token
+                if not reported and not is_cancelled():
+                    breaker.record_success(time.monotonic() - start)
+                    reported = True
+            except ToolRightsLost:
+                raise  # Lost a hedge race; says nothing about the provider's health
+            except Exception:
+                breaker.record_failure()
+                reported = True
+                raise
+            finally:
+                if not reported:
+                    breaker.release()  # Cancelled or out-raced before a verdict
+
     def chat(self, user_message: str, system_prompt: str, tools: list, history: list = None) -> str:
+        if self.hedge:
+            return "".join(self.chat_stream(user_message, system_prompt, tools, history))
         last_exc = None
-        for provider in self.providers:
+        providers, gated = self._available()
+        for i, provider in enumerate(providers):
             name = type(provider).__name__
+            breaker = self.breakers[id(provider)]
             try:
-                result = provider.chat(user_message, system_prompt, tools, history)
+                with self._admitted(provider, last=i == len(providers) - 1):
+                    self._reserve(provider, gated)
+                    start = time.monotonic()
+                    try:
+                        result = provider.chat(user_message, system_prompt, tools, history)
+                    except Exception:
+                        breaker.record_failure()
+                        raise
+                    breaker.record_success(time.monotonic() - start)
                 return result
+            except AdmissionRejected as e:
+                log.info(f"{e}; routing to next provider", extra={"event": "provider_busy", "provider": name})
+                last_exc = e
+            except BreakerOpen as e:
+                print(f"[Fallback] {e}; trying next provider")
+                last_exc = e
             except Exception as e:
                 log.warning(
                     f"{name} unavailable, trying next provider: {e}",
@@ -43,13 +165,30 @@ class FallbackProvider(LLMProvider):
         )
         return "Sorry, I couldn't process that request."
 
+    def _stream_attempts(self, args: tuple):
+        """(name, token iterator factory) for each step of the chain."""
+        providers, gated = self._available()
+        if self.hedge and len(providers) > 1:
+            primary, secondary = providers[0], providers[1]
+            name = f"{type(primary).__name__}|{type(secondary).__name__}"
+            delay = hedge_delay(type(primary).__name__, self.hedge_percentile,
+                                self.hedge_min_delay, self.hedge_max_delay)
+            only_pair = len(providers) == 2
+            yield name, lambda: HedgedStream(
+                primary, secondary, args, delay,
+                stream=lambda p, a: self._guarded_stream(p, a, last=only_pair and p is secondary, gated=gated))
+            providers = providers[2:]
+        for i, provider in enumerate(providers):
+            last = i == len(providers) - 1
+            yield type(provider).__name__, lambda provider=provider, last=last: self._guarded_stream(
+                provider, args, last, gated)
+
     def chat_stream(self, user_message: str, system_prompt: str, tools: list, history: list = None):
         last_exc = None
-        for provider in self.providers:
-            name = type(provider).__name__
+        for name, stream in self._stream_attempts((user_message, system_prompt, tools, history)):
             tokens_yielded = False
             try:
-                for token in provider.chat_stream(user_message, system_prompt, tools, history):
+                for token in stream():
                     tokens_yielded = True
                     yield token
                 return  # Provider completed successfully
@@ -61,6 +200,14 @@ class FallbackProvider(LLMProvider):
                         extra={"event": "provider_midstream_failure", "provider": name, "error": str(e)}
                     )
                     return
+                if isinstance(e, AdmissionRejected):
+                    log.info(f"{e}; routing to next provider", extra={"event": "provider_busy", "provider": name})
+                    last_exc = e
+                    continue
+                if isinstance(e, BreakerOpen):
+                    print(f"[Fallback] {e}; trying next provider")
+                    last_exc = e
+                    continue
                 log.warning(
                     f"{name} unavailable for streaming, trying next provider: {e}",
                     extra={"event": "provider_fallback_stream", "provider": name, "error": str(e)}
@@ -72,3 +219,51 @@ class FallbackProvider(LLMProvider):
             extra={"event": "all_providers_failed"}
         )
         yield "Sorry, I couldn't process that request."
+
+
+class StandaloneProvider(LLMProvider):
+    """A lone cloud provider outside any chain.
+
+    Cloud providers raise API and connection errors so a FallbackProvider can
+    move on; with nothing to move on to, the error becomes the same apology
+    the chain gives when every provider failed.
+    """
+
+    def __init__(self, provider: LLMProvider):
+        self.provider = provider
+
+    @property
+    def providers(self) -> list:
+        return [self.provider]
+
+    @property
+    def provider_names(self) -> list[str]:
+        return [type(self.provider).__name__]
+
+    def close(self):
+        self.provider.close()
+
+    def chat(self, user_message: str, system_prompt: str, tools: list, history: list = None) -> str:
+        name = type(self.provider).__name__
+        try:
+            return self.provider.chat(user_message, system_prompt, tools, history)
+        except Exception as e:
+            log.error(f"{name} failed: {e}", extra={"event": "provider_failed", "provider": name, "error": str(e)})
+            return "Sorry, I couldn't process that request."
+
+    def chat_stream(self, user_message: str, system_prompt: str, tools: list, history: list = None):
+        name = type(self.provider).__name__
+        tokens_yielded = False
+        try:
+            for token in self.provider.chat_stream(user_message, system_prompt, tools, history):
+                tokens_yielded = True
+                yield token
+        except Exception as e:
+            if tokens_yielded:
+                log.error(
+                    f"{name} failed mid-stream after yielding tokens",
+                    extra={"event": "provider_midstream_failure", "provider": name, "error": str(e)}
+                )
+                return
+            log.error(f"{name} failed: {e}", extra={"event": "provider_failed", "provider": name, "error": str(e)})
+            yield "Sorry, I couldn't process that request."
@@ -1,8 +1,14 @@
 """Groq LLM provider."""
 
 import json
+import time
+import groq
 from groq import Groq
 from .base import LLMProvider, convert_tools_to_openai
+from .context import is_cancelled
+from tools.executor import run_tools
+from tools.terminal import terminal_reply
+from metrics import LLM_CALLS_TOTAL, LLM_DURATION, LLM_ERRORS
 
 
 class GroqProvider(LLMProvider):
@@ -13,20 +19,20 @@ class GroqProvider(LLMProvider):
         self.model = model
         self.tool_registry = tool_registry
 
+    def probe(self):
+        """Cheap availability check for the circuit breaker (lists models, no tokens)."""
+        self.client.models.list(timeout=5.0)
+
     def chat(self, user_message: str, system_prompt: str, tools: list, history: list = None) -> str:
         """Send a message to Groq and handle tool calls."""
-        full_prompt = system_prompt + self.get_time_context()
-
-        messages = [{"role": "system", "content": full_prompt}]
-        # Add conversation history (OpenAI-style roles, as stored by main.py)
-        if history:
-            messages.extend(history)
-        messages.append({"role": "user", "content": user_message})
+        # History uses OpenAI-style roles, as stored by main.py
+        messages = self.build_messages(user_message, system_prompt, history)
 
         groq_tools = convert_tools_to_openai(tools)
 
         max_iterations = 5
         for _ in range(max_iterations):
+            start_time = time.time()
             try:
                 response = self.client.chat.completions.create(
                     model=self.model,
@@ -35,9 +41,12 @@ class GroqProvider(LLMProvider):
                     tool_choice="auto",
                     max_tokens=1024
                 )
-            except Exception as e:
+                LLM_CALLS_TOTAL.labels(provider="groq", model=self.model).inc()
+                LLM_DURATION.labels(provider="groq").observe(time.time() - start_time)
+            except groq.APIError as e:
                 print(f"Groq error: {e}")
-                return "Sorry, I couldn't process that request."
+                LLM_ERRORS.labels(provider="groq", error_type=type(e).__name__).inc()
+                raise  # propagate to FallbackProvider
 
             message = response.choices[0].message
             tool_calls = message.tool_calls
@@ -62,27 +71,114 @@ class GroqProvider(LLMProvider):
                 ]
             })
 
-            # Process each tool call
-            for tool_call in tool_calls:
-                func_name = tool_call.function.name
-                try:
-                    func_args = json.loads(tool_call.function.arguments)
-                except json.JSONDecodeError:
-                    func_args = {}
+            # Run the tool calls concurrently
+            calls = [(tc.function.name, self._parse_args(tc.function.arguments)) for tc in tool_calls]
+            results = run_tools(self.tool_registry, calls, "Groq")
+            for tool_call, result in zip(tool_calls, results):
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "content": result
+                })
+            reply = terminal_reply(calls, results, "groq")
+            if reply:
+                return reply
+
+        return "Sorry, I ran into too many steps trying to answer that."
 
-                print(f"[Groq] Tool call: {func_name}({func_args})")
+    def chat_stream(self, user_message: str, system_prompt: str, tools: list, history: list = None):
+        """Same as chat() but streams with stream=True.
 
-                if func_name in self.tool_registry:
-                    result = self.tool_registry[func_name](**func_args)
-                else:
-                    result = f"Unknown tool: {func_name}"
+        Tool-call deltas are accumulated per index and run once the call
+        finishes; content deltas are forwarded as they arrive. API errors
+        propagate so FallbackProvider can move on before any tokens.
+        """
+        messages = self.build_messages(user_message, system_prompt, history)
 
-                print(f"[Groq] Tool result: {str(result)[:200]}...")
+        groq_tools = convert_tools_to_openai(tools)
 
+        max_iterations = 5
+        spoke = False
+        for _ in range(max_iterations):
+            if is_cancelled():
+                return
+            start_time = time.time()
+            content_parts = []
+            calls = {}  # index -> {"id", "name", "arguments"}
+            try:
+                stream = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    tools=groq_tools,
+                    tool_choice="auto",
+                    max_tokens=1024,
+                    stream=True
+                )
+                for chunk in stream:
+                    if is_cancelled():
+                        stream.close()  # Drop the HTTP stream so Groq stops generating
+                        return
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+                    for tc in delta.tool_calls or []:
+                        call = calls.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+                        if tc.id:
+                            call["id"] = tc.id
+                        if tc.function and tc.function.name:
+                            call["name"] += tc.function.name
+                        if tc.function and tc.function.arguments:
+                            call["arguments"] += tc.function.arguments
+                    if delta.content:
+                        if not content_parts and spoke:
+                            yield " "  # Keep a preamble and the answer from running together
+                        content_parts.append(delta.content)
+                        spoke = True
+                        yield delta.content
+                LLM_CALLS_TOTAL.labels(provider="groq", model=self.model).inc()
+                LLM_DURATION.labels(provider="groq").observe(time.time() - start_time)
+            except groq.APIError as e:
+                LLM_ERRORS.labels(provider="groq", error_type=type(e).__name__).inc()
+                raise  # propagate to FallbackProvider
+
+            if not calls:
+                return
+
+            tool_calls = [calls[i] for i in sorted(calls)]
+            messages.append({
+                "role": "assistant",
+                "content": "".join(content_parts) or None,
+                "tool_calls": [
+                    {
+                        "id": call["id"],
+                        "type": "function",
+                        "function": {"name": call["name"], "arguments": call["arguments"]}
+                    }
+                    for call in tool_calls
+                ]
+            })
+            if is_cancelled():
+                return
+            args = [(call["name"], self._parse_args(call["arguments"])) for call in tool_calls]
+            results = run_tools(self.tool_registry, args, "Groq")
+            for call, result in zip(tool_calls, results):
                 messages.append({
                     "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "content": str(result)
+                    "tool_call_id": call["id"],
+                    "content": result
                 })
-
-        return "Sorry, I ran into too many steps trying to answer that."
+            reply = terminal_reply(args, results, "groq")
+            if reply:
+                if spoke:
+                    yield " "  # After a preamble
+                yield reply
+                return
+
+        yield "Sorry, I ran into too many steps trying to answer that."
+
+    @staticmethod
+    def _parse_args(arguments: str | None) -> dict:
+        try:
+            return json.loads(arguments or "{}")
+        except json.JSONDecodeError:
+            return {}
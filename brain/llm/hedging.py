@@ -0,0 +1,164 @@
+"""Hedged streaming for FallbackProvider.
+
+Plain fallback only moves on once a provider raises, which for a wedged
+Ollama box means waiting out its read timeout. With hedging, if the primary
+hasn't produced a first token within a deadline learned from its recent
+time-to-first-token (a percentile, clamped to [min_delay, max_delay]), the
+same request also goes to the next provider. Whichever streams first wins
+and the other attempt is cancelled.
+
+Tools are the catch: both attempts could decide to toggle the same light.
+Each attempt must claim tool rights before running any tool (see
+llm.context.attempt_scope); the first claim makes that attempt the winner,
+so side effects only ever come from one of them.
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from collections import deque
+
+from .context import attempt_scope, is_cancelled
+from metrics import LLM_FIRST_TOKEN, LLM_HEDGES, LLM_HEDGE_WINS, LLM_HEDGE_DELAY
+
+_WINDOW = 50  # Recent first-token times kept per provider
+_MIN_SAMPLES = 5  # Below this, hedge at max_delay
+_POLL = 0.25  # Seconds between checks of the client's cancel flag
+
+# Provider class name -> recent first-token seconds. Module-level so the
+# history survives a provider rebuild from /admin/provider.
+_first_token_times: dict[str, deque] = {}
+_times_lock = threading.Lock()
+
+
+def record_first_token(provider_name: str, seconds: float):
+    LLM_FIRST_TOKEN.labels(provider=provider_name).observe(seconds)
+    with _times_lock:
+        _first_token_times.setdefault(provider_name, deque(maxlen=_WINDOW)).append(seconds)
+
+
+def hedge_delay(provider_name: str, percentile: float, min_delay: float, max_delay: float) -> float:
+    """Seconds to wait for provider_name's first token before hedging."""
+    with _times_lock:
+        samples = sorted(_first_token_times.get(provider_name, ()))
+    if len(samples) < _MIN_SAMPLES:
+        delay = max_delay
+    else:
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        delay = min(max_delay, max(min_delay, samples[index]))
+    LLM_HEDGE_DELAY.labels(provider=provider_name).set(delay)
+    return delay
+
+
+class _Attempt:
+    def __init__(self, provider, role: str):
+        self.provider = provider
+        self.name = type(provider).__name__
+        self.role = role  # "primary" or "hedge"
+        self.cancel = threading.Event()
+        self.started = time.monotonic()
+        self.first_token = False
+        self.failed = False
+
+
+class HedgedStream:
+    """Race `primary` against `secondary` for one chat_stream() call.
+
+    Iterating yields the winner's tokens. If both attempts fail before any
+    output, the last exception is raised so the caller can fall back further.
+    """
+
+    def __init__(self, primary, secondary, args: tuple, delay: float, stream=None):
+        self.args = args
+        # stream(provider, args) -> token iterator; lets the chain wrap each attempt
+        self.stream = stream or (lambda provider, args: provider.chat_stream(*args))
+        self.delay = delay
+        self.secondary = secondary
+        self.events = queue.Queue()
+        self.lock = threading.Lock()
+        self.winner = None
+        self.attempts = []
+        self._start(primary, "primary")
+
+    def _start(self, provider, role: str) -> _Attempt:
+        attempt = _Attempt(provider, role)
+        with self.lock:
+            self.attempts.append(attempt)
+        # A fresh copy of the request context per attempt (event listener etc.)
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(self._run, attempt), daemon=True,
+                         name=f"hedge-{attempt.name}").start()
+        return attempt
+
+    def _claim(self, attempt: _Attempt) -> bool:
+        """Make attempt the winner unless another already is; cancels the rest."""
+        with self.lock:
+            if self.winner is None:
+                self.winner = attempt
+                for other in self.attempts:
+                    if other is not attempt:
+                        other.cancel.set()
+            return self.winner is attempt
+
+    def _run(self, attempt: _Attempt):
+        with attempt_scope(attempt.cancel, lambda: self._claim(attempt)):
+            try:
+                for token in self.stream(attempt.provider, self.args):
+                    if attempt.cancel.is_set():
+                        break
+                    self.events.put((attempt, "token", token))
+                self.events.put((attempt, "done", None))
+            except Exception as e:
+                self.events.put((attempt, "error", e))
+
+    def _cancel_all(self):
+        for attempt in self.attempts:
+            attempt.cancel.set()
+
+    def _hedge(self, reason: str):
+        attempt = self._start(self.secondary, "hedge")
+        LLM_HEDGES.labels(provider=attempt.name).inc()
+        print(f"[Hedge] {self.attempts[0].name} {reason}; also asking {attempt.name}")
+
+    def __iter__(self):
+        hedge_at = self.attempts[0].started + self.delay
+        last_error = None
+        try:
+            while True:
+                if is_cancelled():
+                    return  # Attempts run under their own cancel flags; pass the client's on
+                hedged = len(self.attempts) > 1
+                timeout = _POLL if hedged or self.winner else max(0.0, min(_POLL, hedge_at - time.monotonic()))
+                try:
+                    attempt, kind, payload = self.events.get(timeout=timeout)
+                except queue.Empty:
+                    if not hedged and self.winner is None and time.monotonic() >= hedge_at:
+                        self._hedge(f"has no first token after {self.delay:.1f}s")
+                    continue
+
+                if kind == "error":
+                    attempt.failed = True
+                    last_error = payload
+                    if self.winner is attempt:
+                        raise payload  # The winner failed; FallbackProvider decides what next
+                    if self.winner is None and not hedged:
+                        self._hedge(f"failed ({payload})")
+                    elif self.winner is None and all(a.failed for a in self.attempts):
+                        raise last_error
+                    continue
+
+                if self.winner is None and not self._claim(attempt):
+                    continue
+                if self.winner is not attempt:
+                    continue  # Loser's leftovers
+                if not attempt.first_token:
+                    attempt.first_token = True
+                    record_first_token(attempt.name, time.monotonic() - attempt.started)
+                    if len(self.attempts) > 1:
+                        LLM_HEDGE_WINS.labels(provider=attempt.name, role=attempt.role).inc()
+                if kind == "done":
+                    return
+                yield payload
+        finally:
+            self._cancel_all()
@@ -2,10 +2,24 @@
 
 import json
 import re
+import threading
 import time
 import httpx
 from .base import LLMProvider, convert_tools_to_openai
-from metrics import LLM_CALLS_TOTAL, LLM_DURATION, LLM_ERRORS, TOOL_CALLS_TOTAL, TOOL_DURATION
+from .context import is_cancelled
+from http_clients import http_client
+from tools.executor import run_tools
+from tools.terminal import terminal_reply
+from metrics import (
+    LLM_CALLS_TOTAL, LLM_DURATION, LLM_ERRORS,
+    LLM_PROMPT_EVAL_TOKENS, LLM_PROMPT_EVAL_DURATION, MODEL_LOADS, MODEL_LOAD_DURATION,
+    OLLAMA_MODEL_STALENESS, OLLAMA_MODEL_REFRESH_DURATION, OLLAMA_MODEL_REFRESH_ERRORS,
+    OLLAMA_TIER_DURATION, OLLAMA_CASCADE_DECISIONS, OLLAMA_SAFETY_RETRIES,
+)
+
+# The staleness gauge is process-global; only the provider that last bound it may reset it
+_staleness_lock = threading.Lock()
+_staleness_owner = None
 
 
 class OllamaProvider(LLMProvider):
@@ -23,6 +37,15 @@ class OllamaProvider(LLMProvider):
         "i've turned", "i have turned",
     ]
 
+    # load_duration above this means the model was (re)loaded rather than already resident
+    _COLD_LOAD_SECONDS = 0.5
+
+    # How long the first request waits for the refresher's initial /api/ps poll
+    _FIRST_REFRESH_WAIT = 2.0
+
+    # Cap on router output: a tool call is short, and prose from it is discarded
+    _ROUTER_NUM_PREDICT = 256
+
     # Phrases that indicate the model doesn't know but should search
     _SHOULD_SEARCH_PHRASES = [
         "i don't have", "i do not have", "i'm not sure", "i am not sure",
@@ -42,7 +65,8 @@ class OllamaProvider(LLMProvider):
     def __init__(self, url: str, model: str, tool_registry: dict,
                  timeout_connect: float = 10, timeout_read: float = 180,
                  max_iterations: int = 4, auto_model: bool = True,
-                 model_refresh_seconds: int = 5):
+                 model_refresh_seconds: int = 5, router_model: str = "",
+                 structured_routing: bool = False):
         self.url = url
         self.default_model = model
         self.model = model
@@ -50,30 +74,81 @@ class OllamaProvider(LLMProvider):
         self.timeout = httpx.Timeout(connect=timeout_connect, read=timeout_read,
                                      write=10.0, pool=10.0)
         self.max_iterations = max_iterations
+        # Optional small model that picks tools; the main model only writes answers
+        self.router_model = router_model
+        # Decide each tool step with one schema-constrained JSON reply (see _route_structured)
+        self.structured_routing = structured_routing
+        self.routing = bool(router_model) or structured_routing
         self.auto_model = auto_model
         self.model_refresh_seconds = max(1, int(model_refresh_seconds))
+        # /api/ps is tiny; don't let a busy server hold the refresher for the full read timeout
+        self._refresh_timeout = httpx.Timeout(min(float(self.model_refresh_seconds), 5.0))
         self._last_model_refresh = 0.0
+        self._refreshed = threading.Event()
+        self._stop = threading.Event()
+        self._refresher = None
+        if auto_model:
+            self._refresher = threading.Thread(target=self._refresh_loop, daemon=True,
+                                               name="ollama-model-refresh")
+            self._refresher.start()
+
+    def probe(self):
+        """Cheap availability check for the circuit breaker (raises if Ollama is down)."""
+        http_client().get(f"{self.url}/api/version", timeout=self._refresh_timeout).raise_for_status()
+
+    def close(self):
+        """Stop the background model refresher (called when the provider is replaced)."""
+        global _staleness_owner
+        self._stop.set()
+        with _staleness_lock:
+            if _staleness_owner is self:
+                _staleness_owner = None
+                OLLAMA_MODEL_STALENESS.set_function(lambda: 0.0)
 
     def _resolve_active_model(self) -> str:
-        """Use currently loaded Ollama model when available, else fallback to configured model."""
+        """Use currently loaded Ollama model when available, else fallback to configured model.
+
+        Only reads the value the background refresher keeps up to date; the
+        first call after startup waits briefly for the initial /api/ps poll.
+        """
         if not self.auto_model:
             return self.default_model
+        self._refreshed.wait(timeout=self._FIRST_REFRESH_WAIT)
+        return self.model
 
-        now = time.time()
-        if now - self._last_model_refresh < self.model_refresh_seconds:
-            return self.model
+    def _is_router_model(self, name: str) -> bool:
+        if not self.router_model:
+            return False
+        return name.removesuffix(":latest") == self.router_model.removesuffix(":latest")
 
-        self._last_model_refresh = now
+    def _refresh_loop(self):
+        global _staleness_owner
+        started = time.time()
+        with _staleness_lock:
+            if self._stop.is_set():
+                return
+            _staleness_owner = self
+            OLLAMA_MODEL_STALENESS.set_function(lambda: time.time() - (self._last_model_refresh or started))
+        while not self._stop.is_set():
+            self._refresh_active_model()
+            self._refreshed.set()
+            self._stop.wait(self.model_refresh_seconds)
+
+    def _refresh_active_model(self):
+        """Poll /api/ps and swap self.model to the loaded model (or the configured one)."""
+        start = time.time()
         try:
-            response = httpx.get(f"{self.url}/api/ps", timeout=self.timeout)
+            response = http_client().get(f"{self.url}/api/ps", timeout=self._refresh_timeout)
             response.raise_for_status()
             data = response.json()
             models = data.get("models") or []
 
             loaded_model = None
-            if models:
-                first = models[0] or {}
-                loaded_model = first.get("name") or first.get("model")
+            for entry in models:
+                name = (entry or {}).get("name") or (entry or {}).get("model")
+                if name and not self._is_router_model(str(name)):
+                    loaded_model = name  # The router stays loaded beside the answer model
+                    break
 
             if loaded_model:
                 loaded_model = str(loaded_model)
@@ -84,13 +159,14 @@ class OllamaProvider(LLMProvider):
                 if self.model != self.default_model:
                     print(f"[Ollama] No loaded model reported; falling back to configured model: {self.default_model}")
                 self.model = self.default_model
+            self._last_model_refresh = time.time()
         except Exception as e:
             # Keep requests flowing if /api/ps is unavailable.
+            OLLAMA_MODEL_REFRESH_ERRORS.inc()
             if self.model != self.default_model:
                 print(f"[Ollama] Active-model check failed ({e}); falling back to configured model: {self.default_model}")
                 self.model = self.default_model
-
-        return self.model
+        OLLAMA_MODEL_REFRESH_DURATION.set(time.time() - start)
 
     def _claims_action_without_tool(self, content: str) -> bool:
         """Check if response claims to have performed an action that requires a tool call."""
@@ -107,108 +183,89 @@ class OllamaProvider(LLMProvider):
         lower = content.lower()
         return any(phrase in lower for phrase in self._PROMISES_ACTION)
 
+    def _safety_nudge(self, content: str) -> str | None:
+        """Return a corrective user turn if the model should have used a tool, else None."""
+        if self._claims_action_without_tool(content):
+            print(f"[Ollama] Model claimed action without tool call, forcing retry: {content[:100]}")
+            return ("You said you performed an action, but you did NOT call any tool. "
+                    "The action was NOT actually performed. You MUST call the appropriate "
+                    "tool function (set_timer, cancel_timer, list_timers, control_light, etc.) to "
+                    "actually do it. Try again now.")
+        if self._should_search(content):
+            print(f"[Ollama] Model punted without searching, forcing web_search: {content[:100]}")
+            return ("You said you don't have that information, but you didn't try searching. "
+                    "Use the web_search tool to look it up before responding.")
+        if self._promises_action(content):
+            print(f"[Ollama] Model promised action without tool call, forcing retry: {content[:100]}")
+            return ("You said you would look something up, but you didn't call any tool. "
+                    "Please use the appropriate tool (web_search, get_weather, query_influxdb, etc.) now.")
+        return None
+
     def chat(self, user_message: str, system_prompt: str, tools: list, history: list = None) -> str:
         """Send a message to Ollama and handle tool calls."""
-        full_prompt = system_prompt + self.get_time_context()
-
-        messages = [
-            {"role": "system", "content": full_prompt},
-        ]
-
-        # Add conversation history for context
-        if history:
-            messages.extend(history)
-
-        messages.append({"role": "user", "content": user_message})
+        messages = self.build_messages(user_message, system_prompt, history)
 
         ollama_tools = convert_tools_to_openai(tools)
 
         tool_was_called = False
-        for iteration in range(self.max_iterations):
-            # On last iteration, drop tools to force a final answer
-            use_tools = ollama_tools if iteration < self.max_iterations - 1 else []
-            response = self._call_ollama(messages, use_tools)
-
-            if not response:
-                return "Sorry, I couldn't process that request."
-
-            message = response.get("message", {})
-            tool_calls = message.get("tool_calls")
-            content = message.get("content", "")
-
-            # Fallback: parse tool calls from content if model returns JSON as text
-            if not tool_calls and content:
-                parsed = self._parse_tool_from_content(content)
-                if parsed:
-                    tool_calls = [{"function": parsed}]
-
-            if not tool_calls:
-                # Safety nets: force retry if model didn't use tools but should have
-                # Allow retries up to iteration 2 (not just 0) to catch persistent hallucination
-                if not tool_was_called and iteration < self.max_iterations - 1:
-                    if self._claims_action_without_tool(content):
-                        print(f"[Ollama] Model claimed action without tool call, forcing retry: {content[:100]}")
-                        messages.append(message)
-                        messages.append({
-                            "role": "user",
-                            "content": "You said you performed an action, but you did NOT call any tool. "
-                                       "The action was NOT actually performed. You MUST call the appropriate "
-                                       "tool function (set_timer, cancel_timer, list_timers, control_light, etc.) to "
-                                       "actually do it. Try again now."
-                        })
-                        continue
-                    if self._should_search(content):
-                        print(f"[Ollama] Model punted without searching, forcing web_search: {content[:100]}")
-                        messages.append(message)
-                        messages.append({
-                            "role": "user",
-                            "content": "You said you don't have that information, but you didn't try searching. "
-                                       "Use the web_search tool to look it up before responding."
-                        })
-                        continue
-                    if self._promises_action(content):
-                        print(f"[Ollama] Model promised action without tool call, forcing retry: {content[:100]}")
-                        messages.append(message)
-                        messages.append({
-                            "role": "user",
-                            "content": "You said you would look something up, but you didn't call any tool. "
-                                       "Please use the appropriate tool (web_search, get_weather, query_influxdb, etc.) now."
-                        })
-                        continue
-                return content
-
-            messages.append(message)
-            tool_was_called = True
-
-            for tool_call in tool_calls:
-                func_name = tool_call.get("function", {}).get("name")
-                func_args = tool_call.get("function", {}).get("arguments", {})
-
-                print(f"[Ollama] Tool call: {func_name}({func_args})")
-                TOOL_CALLS_TOTAL.labels(tool_name=func_name).inc()
-
-                tool_start = time.time()
-                if func_name in self.tool_registry:
-                    try:
-                        result = self.tool_registry[func_name](**func_args)
-                    except TypeError:
-                        # Strip unexpected args the model hallucinated
-                        import inspect
-                        valid_params = set(inspect.signature(self.tool_registry[func_name]).parameters)
-                        filtered_args = {k: v for k, v in func_args.items() if k in valid_params}
-                        result = self.tool_registry[func_name](**filtered_args)
+        retries = 0  # Safety-net nudges this request
+        try:
+            for iteration in range(self.max_iterations):
+                # On last iteration, drop tools to force a final answer
+                use_tools = ollama_tools if iteration < self.max_iterations - 1 else []
+                routed = self._route(messages, use_tools) if use_tools and self.routing else None
+                if routed:
+                    message, tool_calls = routed
                 else:
-                    result = f"Unknown tool: {func_name}"
-                TOOL_DURATION.labels(tool_name=func_name).observe(time.time() - tool_start)
-
-                print(f"[Ollama] Tool result: {result[:200]}...")
-
-                messages.append({
-                    "role": "tool",
-                    "content": str(result)
-                })
-
-        return "Sorry, I ran into too many steps trying to answer that."
+                    response = self._call_ollama(messages, use_tools)
+
+                    if not response:
+                        return "Sorry, I couldn't process that request."
+
+                    message = response.get("message", {})
+                    tool_calls = message.get("tool_calls")
+                    content = message.get("content", "")
+
+                    # Fallback: parse tool calls from content if model returns JSON as text
+                    if not tool_calls and content:
+                        parsed = self._parse_tool_from_content(content)
+                        if parsed:
+                            tool_calls = [{"function": parsed}]
+
+                if not tool_calls:
+                    # Safety nets: force retry if model didn't use tools but should have
+                    # Allow retries up to iteration 2 (not just 0) to catch persistent hallucination
+                    if not tool_was_called and iteration < self.max_iterations - 1:
+                        nudge = self._safety_nudge(content)
+                        if nudge:
+                            retries += 1
+                            messages.append(message)
+                            messages.append({"role": "user", "content": nudge})
+                            continue
+                    return content
+
+                messages.append(message)
+                tool_was_called = True
+
+                calls = self._tool_call_args(tool_calls)
+                results = run_tools(self.tool_registry, calls, "Ollama")
+                for result in results:
+                    messages.append({
+                        "role": "tool",
+                        "content": result
+                    })
+                reply = terminal_reply(calls, results, "ollama")
+                if reply:
+                    return reply
+
+            return "Sorry, I ran into too many steps trying to answer that."
+        finally:
+            OLLAMA_SAFETY_RETRIES.observe(retries)
+
+    @staticmethod
+    def _tool_call_args(tool_calls: list) -> list[tuple[str, dict]]:
+        return [(call.get("function", {}).get("name"), call.get("function", {}).get("arguments", {}))
+                for call in tool_calls]
 
     def _parse_tool_from_content(self, content: str) -> dict | None:
         """Parse tool call JSON from message content (fallback for models that don't use tool_calls)."""
@@ -236,120 +293,321 @@ class OllamaProvider(LLMProvider):
         return None
 
     def chat_stream(self, user_message: str, system_prompt: str, tools: list, history: list = None):
-        """Same as chat() but yields token strings for the final response."""
-        full_prompt = system_prompt + self.get_time_context()
-        messages = [{"role": "system", "content": full_prompt}]
-        if history:
-            messages.extend(history)
-        messages.append({"role": "user", "content": user_message})
+        """Same as chat() but yields token strings for the final response.
+
+        Every iteration is streamed. Tool calls are detected as chunks arrive
+        (native tool_calls, or content that starts like JSON); plain answers are
+        forwarded as they are generated, once the safety nets have passed on the
+        buffered opening of the answer.
+        """
+        messages = self.build_messages(user_message, system_prompt, history)
 
         ollama_tools = convert_tools_to_openai(tools)
         tool_was_called = False
-
-        for iteration in range(self.max_iterations):
-            use_tools = ollama_tools if iteration < self.max_iterations - 1 else []
-
-            # Stream the final call when we can predict it's the last one
-            can_stream = tool_was_called or iteration == self.max_iterations - 1
-
-            if can_stream:
-                # Stream this call — yield tokens as they arrive
-                for token in self._call_ollama_stream(messages, use_tools):
-                    yield token
-                return
-
-            # Non-streaming for early iterations where tools may be called
-            response = self._call_ollama(messages, use_tools)
-            if not response:
-                yield "Sorry, I couldn't process that request."
-                return
-
-            message = response.get("message", {})
-            tool_calls = message.get("tool_calls")
-            content = message.get("content", "")
-
-            if not tool_calls and content:
+        retries = 0  # Safety-net nudges this request
+        try:
+            for iteration in range(self.max_iterations):
+                if is_cancelled():
+                    return
+                last_iteration = iteration == self.max_iterations - 1
+                use_tools = ollama_tools if not last_iteration else []
+                check_safety = not tool_was_called and not last_iteration
+
+                routed = self._route(messages, use_tools) if use_tools and self.routing else None
+                if routed:
+                    outcome = ("tools", *routed)
+                else:
+                    outcome = yield from self._stream_iteration(messages, use_tools, check_safety)
+                    if outcome is None:
+                        return  # Answer already streamed
+
+                kind, message, extra = outcome
+                messages.append(message)
+                if kind == "retry":
+                    retries += 1
+                    messages.append({"role": "user", "content": extra})
+                    continue
+
+                tool_was_called = True
+                if is_cancelled():
+                    return
+                calls = self._tool_call_args(extra)
+                results = run_tools(self.tool_registry, calls, "Ollama")
+                for result in results:
+                    messages.append({"role": "tool", "content": result})
+                reply = terminal_reply(calls, results, "ollama")
+                if reply:
+                    yield reply
+                    return
+
+            yield "Sorry, I ran into too many steps trying to answer that."
+        finally:
+            OLLAMA_SAFETY_RETRIES.observe(retries)
+
+    def _route(self, messages: list, tools: list) -> tuple[dict, list] | None:
+        """Let the router model decide this step's tool calls.
+
+        Returns (assistant_message, tool_calls) when it cleanly called known
+        tools, or None to escalate the step to the answer model: it started
+        writing prose (the answer model composes replies), produced a call it
+        got wrong, or failed. Prose is cut off at its first token.
+        """
+        if self.structured_routing:
+            return self._route_structured(messages, tools)
+        start = time.time()
+        decision = "error"
+        tool_calls, parts = [], []
+        try:
+            chunks = self._call_ollama_chunks(messages, tools, model=self.router_model,
+                                              options={"num_predict": self._ROUTER_NUM_PREDICT})
+            for chunk in chunks:
+                if is_cancelled():
+                    chunks.close()
+                    decision = None
+                    return None
+                message = chunk.get("message", {})
+                if message.get("tool_calls"):
+                    tool_calls.extend(message["tool_calls"])
+                if message.get("content"):
+                    parts.append(message["content"])
+                stripped = "".join(parts).lstrip()
+                if not tool_calls and stripped and stripped[0] not in "{[`":
+                    chunks.close()
+                    break
+
+            content = "".join(parts)
+            if not tool_calls and content.lstrip()[:1] in ("{", "[", "`"):
                 parsed = self._parse_tool_from_content(content)
                 if parsed:
                     tool_calls = [{"function": parsed}]
-
-            if not tool_calls:
-                # Safety nets: force retry if model didn't use tools but should have
-                if not tool_was_called and iteration < self.max_iterations - 1:
-                    if self._claims_action_without_tool(content):
-                        print(f"[Ollama] Model claimed action without tool call, forcing retry: {content[:100]}")
-                        messages.append(message)
-                        messages.append({
-                            "role": "user",
-                            "content": "You said you performed an action, but you did NOT call any tool. "
-                                       "The action was NOT actually performed. You MUST call the appropriate "
-                                       "tool function (set_timer, cancel_timer, list_timers, control_light, etc.) to "
-                                       "actually do it. Try again now."
-                        })
-                        continue
-                    if self._should_search(content):
-                        print(f"[Ollama] Model punted without searching, forcing web_search: {content[:100]}")
-                        messages.append(message)
-                        messages.append({
-                            "role": "user",
-                            "content": "You said you don't have that information, but you didn't try searching. "
-                                       "Use the web_search tool to look it up before responding."
-                        })
-                        continue
-                    if self._promises_action(content):
-                        print(f"[Ollama] Model promised action without tool call, forcing retry: {content[:100]}")
-                        messages.append(message)
-                        messages.append({
-                            "role": "user",
-                            "content": "You said you would look something up, but you didn't call any tool. "
-                                       "Please use the appropriate tool (web_search, get_weather, query_influxdb, etc.) now."
-                        })
-                        continue
-                # Final response with no tools needed — yield as single chunk
-                yield content
-                return
-
-            messages.append(message)
-            tool_was_called = True
-
-            for tool_call in tool_calls:
-                func_name = tool_call.get("function", {}).get("name")
-                func_args = tool_call.get("function", {}).get("arguments", {})
-                print(f"[Ollama] Tool call: {func_name}({func_args})")
-                TOOL_CALLS_TOTAL.labels(tool_name=func_name).inc()
-
-                tool_start = time.time()
-                if func_name in self.tool_registry:
-                    try:
-                        result = self.tool_registry[func_name](**func_args)
-                    except TypeError:
-                        import inspect
-                        valid_params = set(inspect.signature(self.tool_registry[func_name]).parameters)
-                        filtered_args = {k: v for k, v in func_args.items() if k in valid_params}
-                        result = self.tool_registry[func_name](**filtered_args)
                 else:
-                    result = f"Unknown tool: {func_name}"
-                TOOL_DURATION.labels(tool_name=func_name).observe(time.time() - tool_start)
-                print(f"[Ollama] Tool result: {result[:200]}...")
-                messages.append({"role": "tool", "content": str(result)})
+                    decision = "uncertain"  # Tool-call-shaped text we can't parse
+            if tool_calls:
+                calls = self._tool_call_args(tool_calls)
+                known = all(name in self.tool_registry and isinstance(args, dict) for name, args in calls)
+                decision = "tools" if known else "uncertain"
+            elif decision != "uncertain":
+                decision = "answer"
+        except httpx.HTTPError as e:
+            print(f"[Ollama] Router model {self.router_model} failed ({e}); escalating")
+        finally:
+            OLLAMA_TIER_DURATION.labels(tier="router").observe(time.time() - start)
+            if decision:
+                OLLAMA_CASCADE_DECISIONS.labels(decision=decision).inc()
+
+        if decision != "tools":
+            if decision == "uncertain":
+                print(f"[Ollama] Router unsure ({content[:100]!r} / {tool_calls}); escalating")
+            return None
+        print(f"[Ollama] Router {self.router_model} picked: {[name for name, _ in calls]}")
+        return {"role": "assistant", "content": content, "tool_calls": tool_calls}, tool_calls
+
+    _ROUTING_INSTRUCTIONS = (
+        "Before replying, decide the next step. If a tool is needed, respond with "
+        '{"action": "tool", "tool": <name>, "args": {...}}. If you can answer the user '
+        'now without a tool, respond with {"action": "answer"}. Tools:\n'
+    )
+
+    @staticmethod
+    def _routing_schema(tools: list) -> dict:
+        """JSON schema for one routing decision: answer, or one known tool with valid arguments."""
+        choices = [{"type": "object", "properties": {"action": {"const": "answer"}}, "required": ["action"]}]
+        for tool in tools:
+            function = tool.get("function", tool)
+            choices.append({
+                "type": "object",
+                "properties": {
+                    "action": {"const": "tool"},
+                    "tool": {"const": function["name"]},
+                    "args": function.get("parameters") or {"type": "object"},
+                },
+                "required": ["action", "tool", "args"],
+            })
+        return {"anyOf": choices}
+
+    def _route_structured(self, messages: list, tools: list) -> tuple[dict, list] | None:
+        """Decide this step with one short reply constrained by Ollama's `format` schema.
+
+        The reply can only be {"action": "answer"} or one real tool with
+        arguments matching its schema, so there is no "I've set a timer"
+        prose for the safety nets to catch. Uses the router model if set,
+        else the active model. Returns like _route; "answer" returns None and
+        the answer model writes the reply (tools still offered).
+        """
+        start = time.time()
+        decision = "error"
+        catalog = "\n".join(f"- {t.get('function', t)['name']}: {t.get('function', t).get('description', '')}"
+                            for t in tools)
+        routing_messages = messages + [{"role": "system", "content": self._ROUTING_INSTRUCTIONS + catalog}]
+        try:
+            result = self._call_ollama(routing_messages, [], model=self.router_model or None,
+                                       options={"temperature": 0, "num_predict": self._ROUTER_NUM_PREDICT},
+                                       schema=self._routing_schema(tools))
+            content = (result.get("message") or {}).get("content", "")
+            try:
+                choice = json.loads(content)
+            except json.JSONDecodeError:
+                choice = None
+            if not isinstance(choice, dict):
+                decision = "uncertain"
+            elif choice.get("action") == "answer":
+                decision = "answer"
+            elif choice.get("tool") in self.tool_registry and isinstance(choice.get("args", {}), dict):
+                decision = "tools"
+            else:
+                decision = "uncertain"
+        except httpx.HTTPError as e:
+            print(f"[Ollama] Routing call failed ({e}); answering directly")
+        finally:
+            OLLAMA_TIER_DURATION.labels(tier="router").observe(time.time() - start)
+            OLLAMA_CASCADE_DECISIONS.labels(decision=decision).inc()
+
+        if decision != "tools":
+            if decision == "uncertain":
+                print(f"[Ollama] Unusable routing reply: {content[:100]!r}")
+            return None
+        tool_calls = [{"function": {"name": choice["tool"], "arguments": choice.get("args") or {}}}]
+        print(f"[Ollama] Routed to {choice['tool']}")
+        return {"role": "assistant", "content": "", "tool_calls": tool_calls}, tool_calls
+
+    # Characters of a plain answer held back so the safety nets can inspect its opening
+    _SAFETY_PREFIX_CHARS = 80
+
+    def _stream_iteration(self, messages: list, tools: list, check_safety: bool):
+        """Stream one model call, yielding answer tokens as soon as they are safe to speak.
+
+        Returns (via StopIteration) None if the answer was delivered, otherwise
+        ("tools", assistant_message, tool_calls) or ("retry", assistant_message, nudge).
+        """
+        tool_calls = []
+        parts = []          # Everything the model produced this call
+        pending = ""        # Content not yet yielded
+        released = False    # True once we've started forwarding tokens
+
+        chunks = self._call_ollama_chunks(messages, tools)
+        for chunk in chunks:
+            if is_cancelled():
+                chunks.close()  # Drops the HTTP stream, which stops Ollama generating
+                return None
+            message = chunk.get("message", {})
+            if message.get("tool_calls"):
+                tool_calls.extend(message["tool_calls"])
+            token = message.get("content", "")
+            if not token:
+                continue
+            parts.append(token)
+
+            if released:
+                yield token
+                continue
+            pending += token
+            if tool_calls:
+                continue
+
+            stripped = pending.lstrip()
+            if not stripped:
+                continue
+            if tools and stripped[0] in "{[`":
+                continue  # Looks like a tool call written as text; hold it to parse at the end
+            if check_safety and len(pending) < self._SAFETY_PREFIX_CHARS:
+                continue
+            if check_safety:
+                nudge = self._safety_nudge(pending)
+                if nudge:
+                    # Stop generating; the retry only needs the opening the model committed to
+                    chunks.close()
+                    return ("retry", {"role": "assistant", "content": pending}, nudge)
+            released = True
+            yield pending
+            pending = ""
+
+        content = "".join(parts)
+        if not tool_calls and not released and content and tools:
+            parsed = self._parse_tool_from_content(content)
+            if parsed:
+                tool_calls = [{"function": parsed}]
+
+        if tool_calls:
+            return ("tools", {"role": "assistant", "content": content, "tool_calls": tool_calls}, tool_calls)
+
+        if released:
+            return None
+
+        # Whole answer fit in the safety prefix (or was held as JSON-ish text)
+        if check_safety:
+            nudge = self._safety_nudge(content)
+            if nudge:
+                return ("retry", {"role": "assistant", "content": content}, nudge)
+        yield content or "Sorry, I couldn't process that request."
+        return None
+
+    def _record_prompt_eval(self, result: dict):
+        """Record how much of the prompt Ollama had to evaluate. With a stable
+        prefix, a warm KV cache leaves only the new turn to evaluate."""
+        count = result.get("prompt_eval_count")
+        if count is None:
+            return  # Some Ollama versions omit it when the whole prompt came from cache
+        LLM_PROMPT_EVAL_TOKENS.labels(provider="ollama").observe(count)
+        duration_ns = result.get("prompt_eval_duration")
+        if duration_ns:
+            LLM_PROMPT_EVAL_DURATION.labels(provider="ollama").observe(duration_ns / 1e9)
+        print(f"[Ollama] Prompt eval: {count} tokens in {(duration_ns or 0) / 1e6:.0f}ms")
+
+    def _record_load(self, result: dict, reason: str) -> float:
+        """Record a model load if this call paid one; returns the load time in seconds."""
+        seconds = (result.get("load_duration") or 0) / 1e9
+        if seconds >= self._COLD_LOAD_SECONDS:
+            MODEL_LOADS.labels(provider="ollama", reason=reason).inc()
+            MODEL_LOAD_DURATION.labels(provider="ollama", reason=reason).observe(seconds)
+            print(f"[Ollama] Model load ({reason}): {result.get('model', self.model)} took {seconds:.1f}s")
+        return seconds
+
+    def warm(self, reason: str = "keepalive", num_predict: int = 0, keep_alive: float = None) -> float:
+        """Load the active model (and the router, if any) and reset their keep-alive timers.
+
+        With num_predict 0 (the default) this is an empty prompt, which Ollama
+        treats as load-only: no GPU time and the cached prompt prefix is left
+        alone. num_predict > 0 makes it a tiny generation instead. keep_alive
+        (seconds) overrides Ollama's own window. Returns the load time in seconds.
+        """
+        models = [self._resolve_active_model()]
+        if self.router_model and not self._is_router_model(models[0]):
+            models.append(self.router_model)
+        loaded = 0.0
+        for model in models:
+            payload = {"model": model, "prompt": "", "stream": False}
+            if keep_alive:
+                payload["keep_alive"] = f"{int(keep_alive)}s"
+            if num_predict > 0:
+                payload.update(prompt="hi", think=False, options={"num_predict": num_predict})
+            response = http_client().post(f"{self.url}/api/generate", json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            loaded += self._record_load(response.json(), reason)
+        return loaded
 
-        yield "Sorry, I ran into too many steps trying to answer that."
+    def _call_ollama_chunks(self, messages: list, tools: list, model: str = None, options: dict = None):
+        """Make a streaming request to Ollama, yielding raw response chunks.
 
-    def _call_ollama_stream(self, messages: list, tools: list):
-        """Make a streaming request to Ollama, yielding content tokens."""
+        model overrides the active model (the cascade's router); options are
+        passed through as Ollama generation options.
+        """
         start_time = time.time()
-        model = self._resolve_active_model()
+        tier = "router" if model else "answer"
+        model = model or self._resolve_active_model()
+        payload = {
+            "model": model,
+            "messages": messages,
+            "tools": tools,
+            "stream": True,
+            "think": False
+        }
+        if options:
+            payload["options"] = options
         try:
-            with httpx.stream(
+            with http_client().stream(
                 "POST",
                 f"{self.url}/api/chat",
-                json={
-                    "model": model,
-                    "messages": messages,
-                    "tools": tools,
-                    "stream": True,
-                    "think": False
-                },
+                json=payload,
                 timeout=self.timeout
             ) as response:
                 response.raise_for_status()
@@ -357,13 +615,16 @@ class OllamaProvider(LLMProvider):
                     if not line:
                         continue
                     chunk = json.loads(line)
-                    token = chunk.get("message", {}).get("content", "")
-                    if token:
-                        yield token
+                    if chunk.get("done"):
+                        self._record_prompt_eval(chunk)
+                        self._record_load(chunk, "request")
+                    yield chunk
                     if chunk.get("done"):
                         break
             LLM_CALLS_TOTAL.labels(provider="ollama", model=model).inc()
             LLM_DURATION.labels(provider="ollama").observe(time.time() - start_time)
+            if self.routing and tier == "answer":
+                OLLAMA_TIER_DURATION.labels(tier="answer").observe(time.time() - start_time)
         except httpx.HTTPError as e:
             LLM_ERRORS.labels(provider="ollama", error_type=type(e).__name__).inc()
             raise  # propagate to FallbackProvider
@@ -371,26 +632,41 @@ class OllamaProvider(LLMProvider):
             print(f"Ollama streaming error: {e}")
             LLM_ERRORS.labels(provider="ollama", error_type=type(e).__name__).inc()
 
-    def _call_ollama(self, messages: list, tools: list) -> dict:
-        """Make a request to Ollama's chat API."""
+    def _call_ollama(self, messages: list, tools: list, model: str = None, options: dict = None,
+                     schema: dict = None) -> dict:
+        """Make a request to Ollama's chat API.
+
+        model, options as for _call_ollama_chunks; schema is a JSON schema
+        the reply is constrained to (Ollama's `format`).
+        """
         start_time = time.time()
-        model = self._resolve_active_model()
+        tier = "router" if model or schema else "answer"
+        model = model or self._resolve_active_model()
+        payload = {
+            "model": model,
+            "messages": messages,
+            "tools": tools,
+            "stream": False,
+            "think": False
+        }
+        if options:
+            payload["options"] = options
+        if schema:
+            payload["format"] = schema
         try:
-            response = httpx.post(
+            response = http_client().post(
                 f"{self.url}/api/chat",
-                json={
-                    "model": model,
-                    "messages": messages,
-                    "tools": tools,
-                    "stream": False,
-                    "think": False
-                },
+                json=payload,
                 timeout=self.timeout
             )
             response.raise_for_status()
             result = response.json()
+            self._record_prompt_eval(result)
+            self._record_load(result, "request")
             LLM_CALLS_TOTAL.labels(provider="ollama", model=model).inc()
             LLM_DURATION.labels(provider="ollama").observe(time.time() - start_time)
+            if self.routing and tier == "answer":
+                OLLAMA_TIER_DURATION.labels(tier="answer").observe(time.time() - start_time)
             return result
         except httpx.HTTPError as e:
             LLM_ERRORS.labels(provider="ollama", error_type=type(e).__name__).inc()
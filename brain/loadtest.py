@@ -0,0 +1,96 @@
+"""Load benchmark: N concurrent /ask/stream requests against a running brain.
+
+Usage:
+    python loadtest.py --url http://localhost:8000 --concurrency 8 --requests 32
+
+Reports time to first token (TTFT) and total stream time (p50/p95/p99), the
+peak number of streams in flight, and overall throughput. Every request goes
+through the real provider, so point it at a brain whose LLM can take the load
+(or at a dev brain) — it is not meant for production.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _one_stream(client: httpx.AsyncClient, text: str, stats: dict):
+    start = time.perf_counter()
+    first_token = None
+    stats["in_flight"] += 1
+    stats["peak"] = max(stats["peak"], stats["in_flight"])
+    try:
+        async with client.stream("POST", "/ask/stream", json={"text": text}) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = json.loads(line[6:])
+                if data.get("error"):
+                    raise RuntimeError(data["error"])
+                if data.get("token") and first_token is None:
+                    first_token = time.perf_counter() - start
+                if data.get("done"):
+                    break
+        stats["ttft"].append(first_token if first_token is not None else time.perf_counter() - start)
+        stats["total"].append(time.perf_counter() - start)
+    except Exception as e:
+        stats["errors"].append(str(e))
+    finally:
+        stats["in_flight"] -= 1
+
+
+async def run(url: str, concurrency: int, requests: int, text: str) -> dict:
+    stats = {"ttft": [], "total": [], "errors": [], "in_flight": 0, "peak": 0}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    timeout = httpx.Timeout(connect=10.0, read=300.0, write=10.0, pool=300.0)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def worker(client):
+        async with semaphore:
+            await _one_stream(client, text, stats)
+
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+        await asyncio.gather(*(worker(client) for _ in range(requests)))
+    stats["elapsed"] = time.perf_counter() - started
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=8, help="streams in flight at once")
+    parser.add_argument("--requests", type=int, default=32, help="total streams to run")
+    parser.add_argument("--text", default="What time is it?")
+    args = parser.parse_args()
+
+    stats = asyncio.run(run(args.url, args.concurrency, args.requests, args.text))
+
+    ok = len(stats["total"])
+    print(f"{ok}/{args.requests} streams ok, {len(stats['errors'])} errors, "
+          f"peak {stats['peak']} in flight, {stats['elapsed']:.2f}s total, "
+          f"{ok / stats['elapsed']:.2f} streams/s")
+    for name in ("ttft", "total"):
+        values = stats[name]
+        print(f"{name:>5}: p50 {_percentile(values, 50) * 1000:.0f}ms  "
+              f"p95 {_percentile(values, 95) * 1000:.0f}ms  "
+              f"p99 {_percentile(values, 99) * 1000:.0f}ms  "
+              f"max {max(values, default=0) * 1000:.0f}ms")
+    for error in stats["errors"][:5]:
+        print(f"error: {error}")
+
+
+if __name__ == "__main__":
+    main()
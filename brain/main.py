@@ -2,35 +2,78 @@ import os
 import re
 import json
 import time
+import asyncio
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from typing import Optional
-from fastapi import FastAPI, Response, HTTPException
+from fastapi import FastAPI, Request, Response, HTTPException, Header, WebSocket
 from fastapi.responses import StreamingResponse, HTMLResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from llm import get_provider
+from llm.context import request_scope
 from tools import TOOL_REGISTRY
 from prompts import SYSTEM_PROMPT, TOOLS
 from config import (
     LLM_PROVIDER,
-    OLLAMA_URL, OLLAMA_MODEL, OLLAMA_AUTO_MODEL, OLLAMA_MODEL_REFRESH_SECONDS,
-    ANTHROPIC_API_KEY, ANTHROPIC_MODEL,
-    GROQ_API_KEY, GROQ_MODEL
+    OLLAMA_URL, OLLAMA_MODEL, OLLAMA_AUTO_MODEL, OLLAMA_MODEL_REFRESH_SECONDS, OLLAMA_ROUTER_MODEL,
+    OLLAMA_STRUCTURED_ROUTING,
+    ANTHROPIC_API_KEY, ANTHROPIC_MODEL, ANTHROPIC_BASE_URL,
+    GROQ_API_KEY, GROQ_MODEL,
+    REQUEST_CACHE_TTL, REQUEST_CACHE_WAIT,
+    MAX_HISTORY, MAX_HISTORY_TOKENS, SESSION_TTL, INTENT_FASTPATH_ENABLED,
+    KEEPALIVE_ENABLED, KEEPALIVE_INTERVAL, KEEPALIVE_NUM_PREDICT, KEEPALIVE_MAX_IDLE,
+    HEDGE_ENABLED, HEDGE_PERCENTILE, HEDGE_MIN_DELAY, HEDGE_MAX_DELAY,
+    BREAKER_FAILURE_THRESHOLD, BREAKER_ERROR_RATE, BREAKER_OPEN_SECONDS,
+    OLLAMA_MAX_CONCURRENCY, ADMISSION_MAX_QUEUE, ADMISSION_WAIT_BUDGET,
+    TURN_WORKERS,
 )
 from runtime_config import load_override, save_override, clear_override
+from request_cache import RequestResultCache
+from sessions import SessionStore, Session, session_key
+import intents
+from transcribe import transcribe_wav
+from warmer import ModelWarmer
+import http_clients
 from metrics import (
-    REQUESTS_TOTAL, REQUEST_DURATION, CURRENT_PROVIDER,
-    get_metrics, get_content_type
+    REQUESTS_TOTAL, REQUEST_DURATION, CURRENT_PROVIDER, REQUEST_RETRIES, SESSIONS_ACTIVE,
+    record_stream_completed, record_stream_cancelled, get_metrics, get_content_type
 )
 from logging_config import setup_logging
 
 # Setup structured logging (JSON for Loki, plain text if LOG_FORMAT=text)
 log = setup_logging(json_output=os.getenv("LOG_FORMAT", "text") != "text")
 
-app = FastAPI(title="Voice Assistant Brain")
 
-# Conversation memory - stores recent exchanges
-conversation_history = []
-MAX_HISTORY = 12  # Keep last 12 messages (6 exchanges)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared keep-alive pools for providers and tools, closed on shutdown
+    http_clients.start()
+    # Keep the Ollama model loaded so the first request after a quiet spell isn't a cold start
+    if KEEPALIVE_ENABLED:
+        warmer.start()
+    yield
+    warmer.stop()
+    turn_pool.shutdown(wait=False, cancel_futures=True)
+    llm.close()
+    await http_clients.aclose()
+
+
+app = FastAPI(title="Voice Assistant Brain", lifespan=lifespan)
+
+# Conversation memory, one session per device (X-Device-ID header)
+sessions = SessionStore(max_messages=MAX_HISTORY, max_tokens=MAX_HISTORY_TOKENS, ttl=SESSION_TTL)
+SESSIONS_ACTIVE.set_function(lambda: len(sessions))
+
+# Answers keyed by X-Request-ID so a client retry doesn't re-run the LLM/tools
+request_cache = RequestResultCache(ttl=REQUEST_CACHE_TTL)
+
+# LLM turns block on providers and tools. They run here rather than in
+# Starlette's shared threadpool, and at most TURN_WORKERS at once; the rest
+# queue (admission control decides who waits for the local GPU).
+turn_pool = ThreadPoolExecutor(max_workers=TURN_WORKERS, thread_name_prefix="turn")
 
 # ---------------------------------------------------------------------------
 # LLM provider — built at startup from env defaults, overlaid with any persisted
@@ -40,7 +83,7 @@ MAX_HISTORY = 12  # Keep last 12 messages (6 exchanges)
 # Routing fields that may be changed at runtime. API keys are NEVER overridable
 # here — they always come from the environment / k8s Secret.
 _OVERRIDABLE = (
-    "provider", "ollama_url", "ollama_model", "ollama_auto_model",
+    "provider", "ollama_url", "ollama_model", "ollama_auto_model", "ollama_router_model",
     "anthropic_model", "groq_model",
 )
 
@@ -51,6 +94,7 @@ _BASE_CONFIG = {
     "ollama_model": OLLAMA_MODEL,
     "ollama_auto_model": OLLAMA_AUTO_MODEL,
     "ollama_model_refresh_seconds": OLLAMA_MODEL_REFRESH_SECONDS,
+    "ollama_router_model": OLLAMA_ROUTER_MODEL,
     "anthropic_model": ANTHROPIC_MODEL,
     "groq_model": GROQ_MODEL,
 }
@@ -67,10 +111,23 @@ def _build_llm(cfg: dict):
         ollama_model=cfg["ollama_model"],
         ollama_auto_model=cfg["ollama_auto_model"],
         ollama_model_refresh_seconds=cfg["ollama_model_refresh_seconds"],
+        ollama_router_model=cfg["ollama_router_model"],
+        ollama_structured_routing=OLLAMA_STRUCTURED_ROUTING,
         anthropic_api_key=ANTHROPIC_API_KEY,
+        anthropic_base_url=ANTHROPIC_BASE_URL,
         anthropic_model=cfg["anthropic_model"],
         groq_api_key=GROQ_API_KEY,
         groq_model=cfg["groq_model"],
+        hedge_enabled=HEDGE_ENABLED,
+        hedge_percentile=HEDGE_PERCENTILE,
+        hedge_min_delay=HEDGE_MIN_DELAY,
+        hedge_max_delay=HEDGE_MAX_DELAY,
+        breaker_failure_threshold=BREAKER_FAILURE_THRESHOLD,
+        breaker_error_rate=BREAKER_ERROR_RATE,
+        breaker_open_seconds=BREAKER_OPEN_SECONDS,
+        ollama_max_concurrency=OLLAMA_MAX_CONCURRENCY,
+        admission_max_queue=ADMISSION_MAX_QUEUE,
+        admission_wait_budget=ADMISSION_WAIT_BUDGET,
     )
 
 
@@ -97,6 +154,10 @@ log.info(
 llm = _build_llm(current_config)
 _set_provider_metric(current_config["provider"])
 
+# Looks up the global each time, so it warms whatever provider is live after a switch
+warmer = ModelWarmer(lambda: llm, interval=KEEPALIVE_INTERVAL,
+                     num_predict=KEEPALIVE_NUM_PREDICT, max_idle=KEEPALIVE_MAX_IDLE)
+
 
 class AskRequest(BaseModel):
     text: str
@@ -104,6 +165,7 @@ class AskRequest(BaseModel):
 
 class AskResponse(BaseModel):
     response: str
+    resumed: bool = False  # True when served from the request-ID cache
 
 
 def clean_for_tts(text: str) -> str:
@@ -123,29 +185,107 @@ def clean_for_tts(text: str) -> str:
     return text
 
 
+def _remember(session: Session, user_text: str, response_text: str):
+    """Append an exchange to the session's history, trimmed to its budget."""
+    sessions.remember(session, user_text, response_text)
+
+
+def _deadline(x_deadline_ms: Optional[int]) -> Optional[float]:
+    """X-Deadline-Ms (how long the client will wait) as a time.monotonic() deadline."""
+    if not x_deadline_ms or x_deadline_ms <= 0:
+        return None
+    return time.monotonic() + x_deadline_ms / 1000
+
+
+def _resume(text: str, offset: int) -> str:
+    """text from offset on, for a recomputed answer whose wording may differ from
+    the one the client partly spoke; a word cut at offset is skipped."""
+    rest = text[offset:]
+    if 0 < offset < len(text) and not text[offset - 1].isspace():
+        rest = re.sub(r"^\S*", "", rest)
+    return rest
+
+
+def _chat(text: str, history: list, deadline: Optional[float] = None) -> str:
+    """Answer from the intent fast path if it matches, else the LLM (blocking)."""
+    if INTENT_FASTPATH_ENABLED:
+        reply = intents.route(text)
+        if reply is not None:
+            return reply
+    warmer.touch()
+    start = time.time()
+    with request_scope(deadline=deadline):
+        response = llm.chat(text, SYSTEM_PROMPT, TOOLS, history)
+    intents.record_llm_duration(time.time() - start)
+    return response
+
+
+def _chat_stream(text: str, history: list):
+    """Streaming counterpart of _chat(); a fast-path answer arrives as one token."""
+    if INTENT_FASTPATH_ENABLED:
+        reply = intents.route(text)
+        if reply is not None:
+            yield reply
+            return
+    warmer.touch()
+    start = time.time()
+    yield from llm.chat_stream(text, SYSTEM_PROMPT, TOOLS, history)
+    intents.record_llm_duration(time.time() - start)
+
+
 @app.post("/ask", response_model=AskResponse)
-def ask(request: AskRequest):
-    """Process a voice query and return a response."""
-    global conversation_history
+async def ask(
+    request: AskRequest,
+    x_request_id: Optional[str] = Header(default=None),
+    x_resume_from: int = Header(default=0),
+    x_device_id: Optional[str] = Header(default=None),
+    x_deadline_ms: Optional[int] = Header(default=None),
+):
+    """Process a voice query and return a response.
+
+    With X-Request-ID, a retry of a request the brain already answered (e.g.
+    after a broken /ask/stream) returns that answer from X-Resume-From
+    characters on, instead of running the LLM and its tools again. If it has
+    to recompute, the new answer is still cut at X-Resume-From (on a word
+    boundary) so the client doesn't repeat what it already spoke.
+    X-Deadline-Ms lets a busy local model be skipped for the next provider.
+    """
     start_time = time.time()
+    deadline = _deadline(x_deadline_ms)
+
+    if x_request_id:
+        cached = await run_in_threadpool(request_cache.lookup, x_request_id, REQUEST_CACHE_WAIT)
+        if cached is not None:
+            REQUEST_RETRIES.labels(outcome="cached").inc()
+            log.info("Served retry from request cache", extra={
+                "event": "request_cache_hit", "request_id": x_request_id
+            })
+            return AskResponse(response=clean_for_tts(cached[x_resume_from:]), resumed=True)
+        if x_resume_from:
+            REQUEST_RETRIES.labels(outcome="recomputed").inc()
+        request_cache.begin(x_request_id)
 
+    session = sessions.get(x_device_id)
+    history = session.snapshot()
     log.info(f"Request received: {request.text}", extra={
         "event": "request",
         "query": request.text,
-        "history_length": len(conversation_history)
+        "session": session.id,
+        "history_length": len(history)
     })
 
     try:
-        response_text = llm.chat(request.text, SYSTEM_PROMPT, TOOLS, conversation_history)
-        response_text = clean_for_tts(response_text)
-
-        # Update conversation history
-        conversation_history.append({"role": "user", "content": request.text})
-        conversation_history.append({"role": "assistant", "content": response_text})
-
-        # Trim to keep only recent messages
-        if len(conversation_history) > MAX_HISTORY:
-            conversation_history = conversation_history[-MAX_HISTORY:]
+        # Providers and tools block on I/O; keep them off the event loop
+        raw_text = await asyncio.get_running_loop().run_in_executor(
+            turn_pool, _chat, request.text, history, deadline)
+        response_text = clean_for_tts(raw_text)
+        _remember(session, request.text, response_text)
+
+        if x_request_id:
+            # Raw text, like /ask/stream: X-Resume-From offsets count streamed characters
+            request_cache.complete(x_request_id, raw_text)
+        if x_resume_from:
+            response_text = clean_for_tts(_resume(raw_text, x_resume_from))
 
         duration_ms = int((time.time() - start_time) * 1000)
         REQUESTS_TOTAL.labels(status="success").inc()
@@ -158,6 +298,8 @@ def ask(request: AskRequest):
 
         return AskResponse(response=response_text)
     except Exception as e:
+        if x_request_id:
+            request_cache.fail(x_request_id)
         duration_ms = int((time.time() - start_time) * 1000)
         REQUESTS_TOTAL.labels(status="error").inc()
 
@@ -173,32 +315,98 @@ def ask(request: AskRequest):
 
 
 @app.post("/ask/stream")
-def ask_stream(request: AskRequest):
-    """Stream the LLM response as SSE tokens for real-time TTS."""
-    global conversation_history
+async def ask_stream(request: AskRequest, http_request: Request,
+                     x_request_id: Optional[str] = Header(default=None),
+                     x_device_id: Optional[str] = Header(default=None),
+                     x_deadline_ms: Optional[int] = Header(default=None)):
+    """Stream the LLM response as SSE tokens for real-time TTS.
+
+    The provider runs on the turn pool. If the client disconnects without an
+    X-Request-ID (nobody can retry it), the provider is cancelled so it drops
+    its upstream stream and skips any remaining tool iterations. With an
+    X-Request-ID a dropped connection may be followed by a retry of /ask, so
+    the turn runs to completion and its answer is cached for that retry; only
+    an explicit cancel of the request ID stops it.
+    """
     start_time = time.time()
+    deadline = _deadline(x_deadline_ms)
+    cancel = request_cache.begin(x_request_id) if x_request_id else threading.Event()
 
+    session = sessions.get(x_device_id)
+    history = session.snapshot()
     log.info(f"Stream request received: {request.text}", extra={
         "event": "stream_request",
         "query": request.text,
-        "history_length": len(conversation_history)
+        "session": session.id,
+        "history_length": len(history)
     })
 
-    def generate():
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def produce():
+        stream = _chat_stream(request.text, history)
+        parts = []
+        try:
+            with request_scope(cancel=cancel, deadline=deadline):
+                for token in stream:
+                    if cancel.is_set():
+                        break
+                    parts.append(token)
+                    loop.call_soon_threadsafe(events.put_nowait, ("token", token))
+            if cancel.is_set():
+                if x_request_id:
+                    record_stream_cancelled("client_cancel", "".join(parts))
+                    log.info("Stream cancelled by client", extra={
+                        "event": "stream_cancelled", "query": request.text, "request_id": x_request_id
+                    })
+                loop.call_soon_threadsafe(events.put_nowait, ("cancelled", None))
+                return
+            # Finished here rather than in generate(): the client may be gone,
+            # and a retry with the same request ID must find this answer
+            text = "".join(parts)
+            if x_request_id:
+                # Raw text: X-Resume-From offsets count streamed characters
+                request_cache.complete(x_request_id, text)
+            _remember(session, request.text, clean_for_tts(text))
+            loop.call_soon_threadsafe(events.put_nowait, ("end", None))
+        except Exception as e:
+            if x_request_id:
+                request_cache.fail(x_request_id)
+            loop.call_soon_threadsafe(events.put_nowait, ("error", e))
+        finally:
+            stream.close()
+
+    async def generate():
         full_text_parts = []
+        finished = False  # The turn ended (answered, failed or cancelled)
+        turn_pool.submit(produce)
         try:
-            for token in llm.chat_stream(request.text, SYSTEM_PROMPT, TOOLS, conversation_history):
-                full_text_parts.append(token)
-                yield f"data: {json.dumps({'token': token})}\n\n"
+            while True:
+                try:
+                    kind, value = await asyncio.wait_for(events.get(), timeout=0.5)
+                except asyncio.TimeoutError:
+                    # Nothing to send (tool call or long prefill) — notice a departed client anyway
+                    if await http_request.is_disconnected():
+                        break
+                    continue
+                if kind == "error":
+                    raise value
+                if kind == "cancelled":
+                    finished = True
+                    return
+                if kind == "end":
+                    finished = True
+                    break
+                full_text_parts.append(value)
+                yield f"data: {json.dumps({'token': value})}\n\n"
+
+            if not finished:
+                return  # Client disconnected; cleanup happens in finally
 
             full_response = clean_for_tts("".join(full_text_parts))
             yield f"data: {json.dumps({'done': True})}\n\n"
-
-            # Update conversation history (mutate in-place to avoid reassignment)
-            conversation_history.append({"role": "user", "content": request.text})
-            conversation_history.append({"role": "assistant", "content": full_response})
-            if len(conversation_history) > MAX_HISTORY:
-                del conversation_history[:-MAX_HISTORY]
+            record_stream_completed(full_response)
 
             duration_ms = int((time.time() - start_time) * 1000)
             REQUESTS_TOTAL.labels(status="success").inc()
@@ -208,6 +416,7 @@ def ask_stream(request: AskRequest):
                 "response_length": len(full_response)
             })
         except Exception as e:
+            finished = True
             REQUESTS_TOTAL.labels(status="error").inc()
             log.error(f"Stream request failed: {e}", exc_info=True, extra={
                 "event": "stream_error",
@@ -215,28 +424,248 @@ def ask_stream(request: AskRequest):
             })
             yield f"data: {json.dumps({'error': str(e)})}\n\n"
         finally:
+            # Runs on normal exit, on disconnect polling, and when the server
+            # closes or cancels this generator because the client went away
+            if not finished and x_request_id and not cancel.is_set():
+                # Possibly a network blip; the client's /ask retry will want this answer
+                log.info("Stream client disconnected; finishing the turn for a retry", extra={
+                    "event": "stream_detached",
+                    "query": request.text,
+                    "request_id": x_request_id,
+                    "tokens_sent": len(full_text_parts)
+                })
+            elif not finished and not x_request_id:
+                cancel.set()
+                partial = "".join(full_text_parts)
+                record_stream_cancelled("client_disconnect", partial)
+                log.info("Stream cancelled by client", extra={
+                    "event": "stream_cancelled",
+                    "query": request.text,
+                    "tokens_sent": len(full_text_parts)
+                })
             REQUEST_DURATION.observe(time.time() - start_time)
 
     return StreamingResponse(generate(), media_type="text/event-stream")
 
 
+@app.post("/ask/cancel")
+def ask_cancel(x_request_id: str = Header()):
+    """Stop an /ask/stream turn on purpose (barge-in). Closing the stream alone
+    isn't enough for a request with an X-Request-ID: that looks like a network
+    blip, so the brain finishes the turn for the client's retry."""
+    cancelled = request_cache.cancel(x_request_id)
+    return {"status": "cancelled" if cancelled else "unknown", "request_id": x_request_id}
+
+
 @app.post("/clear-history")
-def clear_history():
-    """Clear conversation history."""
-    global conversation_history
-    conversation_history = []
-    log.info("Conversation history cleared", extra={"event": "history_cleared"})
-    return {"status": "cleared"}
+def clear_history(all: bool = False, x_device_id: Optional[str] = Header(default=None)):
+    """Clear the caller's conversation history (X-Device-ID), or every session with ?all=true."""
+    session_id = None if all else session_key(x_device_id)
+    cleared = sessions.clear(session_id)
+    log.info("Conversation history cleared", extra={
+        "event": "history_cleared", "session": session_id or "*", "sessions": cleared
+    })
+    return {"status": "cleared", "sessions": cleared}
+
+
+# ---------------------------------------------------------------------------
+# /converse — one long-lived WebSocket per voice node instead of an HTTP
+# round-trip chain per turn. The device is identified by an X-Device-ID
+# handshake header or a ?device_id= query parameter.
+#
+# Client → brain:
+#   {"type": "ask", "id": ..., "text": ...}   start a turn (cancels any active one)
+#   {"type": "audio", "id": ...} + binary WAV  start a turn from audio (brain runs STT)
+#   {"type": "cancel", "id": ...}             stop the active turn
+#   {"type": "clear"}                         clear this device's conversation history
+#   {"type": "ping"}
+# Brain → client (turn events carry the turn "id"):
+#   transcript, token, sentence, tool, done, cancelled, error; cleared; pong
+# ---------------------------------------------------------------------------
+
+# A terminator only ends a sentence once whitespace follows it: the buffer is a
+# partial token stream, so "It's 3." may still continue with "5 degrees."
+_SENTENCE_END = re.compile(r'[.!?]\s+|[\n]')
+
+
+def _split_sentences(buffer: str) -> tuple[list[str], str]:
+    """Complete sentences at the front of buffer, and the unfinished rest.
+
+    >>> sentences, buffer = [], ""
+    >>> for token in ["It's 3.", "5 degrees."]:
+    ...     done, buffer = _split_sentences(buffer + token)
+    ...     sentences += done
+    >>> sentences, buffer
+    ([], "It's 3.5 degrees.")
+    >>> _split_sentences("It's 3.5 degrees. Light rain")
+    (["It's 3.5 degrees."], 'Light rain')
+    """
+    sentences = []
+    while True:
+        match = _SENTENCE_END.search(buffer)
+        if not match:
+            return sentences, buffer
+        sentence = buffer[:match.end()].strip()
+        buffer = buffer[match.end():]
+        if sentence:
+            sentences.append(sentence)
+
+
+def _run_converse_turn(turn_id: str, text: str, session: Session, send, cancel: threading.Event):
+    """Run one /converse turn (on the turn pool), reporting events via send()."""
+    start_time = time.time()
+    history = session.snapshot()
+    log.info(f"Converse request received: {text}", extra={
+        "event": "converse_request",
+        "query": text,
+        "session": session.id,
+        "history_length": len(history)
+    })
+
+    parts = []
+    sentence_buffer = ""
+    stream = _chat_stream(text, history)
+    try:
+        with request_scope(on_event=lambda event: send({**event, "id": turn_id}), cancel=cancel):
+            for token in stream:
+                if cancel.is_set():
+                    break
+                parts.append(token)
+                send({"type": "token", "id": turn_id, "token": token})
+                sentences, sentence_buffer = _split_sentences(sentence_buffer + token)
+                for sentence in sentences:
+                    send({"type": "sentence", "id": turn_id, "text": sentence})
+
+        if cancel.is_set():
+            record_stream_cancelled("client_cancel", "".join(parts))
+            log.info("Converse turn cancelled", extra={"event": "converse_cancelled", "query": text})
+            send({"type": "cancelled", "id": turn_id})
+            return
+
+        if sentence_buffer.strip():
+            send({"type": "sentence", "id": turn_id, "text": sentence_buffer.strip()})
+        full_response = clean_for_tts("".join(parts))
+        send({"type": "done", "id": turn_id, "text": full_response})
+        _remember(session, text, full_response)
+        record_stream_completed(full_response)
+
+        REQUESTS_TOTAL.labels(status="success").inc()
+        log.info(f"Converse response sent: {full_response[:100]}...", extra={
+            "event": "converse_response",
+            "duration_ms": int((time.time() - start_time) * 1000),
+            "response_length": len(full_response)
+        })
+    except Exception as e:
+        REQUESTS_TOTAL.labels(status="error").inc()
+        log.error(f"Converse request failed: {e}", exc_info=True, extra={
+            "event": "converse_error",
+            "query": text
+        })
+        send({"type": "error", "id": turn_id, "error": str(e)})
+    finally:
+        stream.close()  # Stops the provider (and its upstream request) if we broke out early
+        REQUEST_DURATION.observe(time.time() - start_time)
+
+
+def _run_converse_audio_turn(turn_id: str, wav: bytes, session: Session, send, cancel: threading.Event):
+    """Transcribe a WAV sent over /converse, then run it as a normal turn."""
+    try:
+        text = transcribe_wav(wav)
+    except Exception as e:
+        log.error(f"Converse transcription failed: {e}", extra={"event": "converse_stt_error"})
+        send({"type": "error", "id": turn_id, "error": f"transcription failed: {e}"})
+        return
+    send({"type": "transcript", "id": turn_id, "text": text})
+    if not text:
+        send({"type": "done", "id": turn_id, "text": ""})
+        return
+    if not cancel.is_set():
+        _run_converse_turn(turn_id, text, session, send, cancel)
+
+
+@app.websocket("/converse")
+async def converse(websocket: WebSocket):
+    """Full-duplex conversation session for a voice node."""
+    await websocket.accept()
+    device_id = websocket.headers.get("x-device-id") or websocket.query_params.get("device_id")
+    loop = asyncio.get_running_loop()
+    outbox: asyncio.Queue = asyncio.Queue()
+
+    def send(event: dict):
+        # Called from worker threads; a single sender task keeps frames ordered
+        loop.call_soon_threadsafe(outbox.put_nowait, event)
+
+    async def sender():
+        while True:
+            event = await outbox.get()
+            await websocket.send_json(event)
+
+    sender_task = asyncio.create_task(sender())
+    active: dict[str, threading.Event] = {}  # turn id -> cancel flag
+    pending_audio_id = None
+
+    def start_turn(target, turn_id: str, payload):
+        for cancel in active.values():
+            cancel.set()
+        active.clear()
+        cancel = active[turn_id] = threading.Event()
+        # Resolve per turn so an idle-expired session is recreated, not reused
+        session = sessions.get(device_id)
+        turn_pool.submit(target, turn_id, payload, session, send, cancel)
+
+    log.info("Converse session opened", extra={"event": "converse_open", "session": device_id})
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("bytes") is not None:
+                if pending_audio_id is None:
+                    send({"type": "error", "error": "binary frame without a preceding audio message"})
+                    continue
+                start_turn(_run_converse_audio_turn, pending_audio_id, message["bytes"])
+                pending_audio_id = None
+                continue
+
+            try:
+                data = json.loads(message.get("text") or "")
+            except json.JSONDecodeError:
+                send({"type": "error", "error": "invalid JSON"})
+                continue
+
+            kind = data.get("type")
+            turn_id = str(data.get("id", ""))
+            if kind == "ask":
+                start_turn(_run_converse_turn, turn_id, data.get("text", ""))
+            elif kind == "audio":
+                pending_audio_id = turn_id
+            elif kind == "cancel":
+                if turn_id in active:
+                    active[turn_id].set()
+            elif kind == "clear":
+                sessions.clear(session_key(device_id))
+                log.info("Conversation history cleared", extra={"event": "history_cleared", "session": device_id})
+                send({"type": "cleared"})
+            elif kind == "ping":
+                send({"type": "pong"})
+            else:
+                send({"type": "error", "error": f"unknown message type: {kind}"})
+    finally:
+        for cancel in active.values():
+            cancel.set()
+        sender_task.cancel()
+        log.info("Converse session closed", extra={"event": "converse_close"})
 
 
 @app.get("/health")
-def health():
+async def health():
     """Health check endpoint."""
     return {"status": "ok"}
 
 
 @app.get("/metrics")
-def metrics():
+async def metrics():
     """Prometheus metrics endpoint."""
     return Response(content=get_metrics(), media_type=get_content_type())
 
@@ -251,6 +680,7 @@ class ProviderUpdate(BaseModel):
     ollama_url: Optional[str] = None
     ollama_model: Optional[str] = None
     ollama_auto_model: Optional[bool] = None
+    ollama_router_model: Optional[str] = None  # "" turns the cascade off
     anthropic_model: Optional[str] = None
     groq_model: Optional[str] = None
 
@@ -263,9 +693,11 @@ def _public_config() -> dict:
         "ollama_url": current_config["ollama_url"],
         "ollama_model": current_config["ollama_model"],
         "ollama_auto_model": current_config["ollama_auto_model"],
+        "ollama_router_model": current_config["ollama_router_model"],
         "anthropic_model": current_config["anthropic_model"],
         "groq_model": current_config["groq_model"],
         "active_chain": active_chain,
+        "breakers": llm.breaker_status() if hasattr(llm, "breaker_status") else {},
         "override_active": load_override() is not None,
     }
 
@@ -300,6 +732,7 @@ def set_provider_config(update: ProviderUpdate):
             )
             raise HTTPException(status_code=400, detail=f"Failed to build provider: {e}")
 
+        llm.close()
         llm = new_llm
         current_config = new_cfg
         # Persist only the fields that differ from env defaults.
@@ -309,6 +742,8 @@ def set_provider_config(update: ProviderUpdate):
         else:
             clear_override()
         _set_provider_metric(current_config["provider"])
+        if KEEPALIVE_ENABLED:
+            warmer.preload("switch")
         log.info(
             f"Switched LLM provider to: {current_config['provider']}",
             extra={"event": "llm_switched", "config": _public_config()},
@@ -324,8 +759,11 @@ def reset_provider_config():
     with _provider_lock:
         current_config = dict(_BASE_CONFIG)
         clear_override()
+        llm.close()
         llm = _build_llm(current_config)
         _set_provider_metric(current_config["provider"])
+        if KEEPALIVE_ENABLED:
+            warmer.preload("switch")
         log.info(
             f"Reset LLM provider to env defaults: {current_config['provider']}",
             extra={"event": "llm_reset", "config": _public_config()},
@@ -334,12 +772,11 @@ def reset_provider_config():
 
 
 @app.get("/admin/ollama-models")
-def list_ollama_models():
+async def list_ollama_models():
     """List models available on the configured Ollama host (for the UI dropdown)."""
-    import httpx
     url = current_config["ollama_url"].rstrip("/")
     try:
-        resp = httpx.get(f"{url}/api/tags", timeout=5.0)
+        resp = await http_clients.async_http_client().get(f"{url}/api/tags", timeout=5.0)
         resp.raise_for_status()
         models = [m.get("name") for m in resp.json().get("models", []) if m.get("name")]
         return {"models": models}
@@ -414,6 +851,9 @@ _ADMIN_HTML = """<!doctype html>
     <label for="ollama_auto_model" style="margin:0">Auto-follow the model Ollama currently has loaded</label>
   </div>
 
+  <label>Ollama router model <span class="hint">(small model that picks tools; blank = off)</span></label>
+  <input type="text" id="ollama_router_model" list="ollama_models" placeholder="qwen2.5:3b">
+
   <label>Groq model</label>
   <input type="text" id="groq_model" placeholder="llama-3.3-70b-versatile">
 
@@ -430,7 +870,7 @@ _ADMIN_HTML = """<!doctype html>
 
 <script>
 const $ = id => document.getElementById(id);
-const FIELDS = ["provider","ollama_url","ollama_model","groq_model","anthropic_model"];
+const FIELDS = ["provider","ollama_url","ollama_model","ollama_router_model","groq_model","anthropic_model"];
 
 function setMsg(text, cls) { const m = $("msg"); m.textContent = text || ""; m.className = cls || ""; }
 
@@ -441,7 +881,11 @@ function render(cfg) {
   const ov = cfg.override_active
     ? '<span class="badge on">override active</span>'
     : '<span class="badge off">env defaults</span>';
-  $("status").innerHTML = 'Active chain: <span class="chain">' + chain + '</span>' + ov;
+  const breakers = Object.entries(cfg.breakers || {})
+    .filter(([, b]) => b.state !== "closed")
+    .map(([name, b]) => name + ' <span class="badge off">' + b.state.replace("_", "-") + '</span>');
+  $("status").innerHTML = 'Active chain: <span class="chain">' + chain + '</span>' + ov
+    + (breakers.length ? '<br>Breakers: ' + breakers.join(" ") : '');
 }
 
 async function load() {
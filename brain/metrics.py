@@ -16,6 +16,28 @@ REQUEST_DURATION = Histogram(
     buckets=[0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
 )
 
+REQUEST_RETRIES = Counter(
+    'brain_request_retries_total',
+    'Client retries carrying a known X-Request-ID',
+    ['outcome']  # cached = answer reused, recomputed = ran the LLM again
+)
+
+SESSIONS_ACTIVE = Gauge(
+    'brain_sessions_active',
+    'Conversation sessions currently held in memory'
+)
+
+STREAM_CANCELLATIONS = Counter(
+    'brain_stream_cancellations_total',
+    'Streams stopped before the LLM finished',
+    ['reason']  # client_disconnect, client_cancel
+)
+
+STREAM_TOKENS_SAVED = Counter(
+    'brain_stream_tokens_saved_total',
+    'Estimated LLM tokens not generated thanks to stream cancellation'
+)
+
 # LLM metrics
 LLM_CALLS_TOTAL = Counter(
     'brain_llm_calls_total',
@@ -30,6 +52,70 @@ LLM_DURATION = Histogram(
     buckets=[0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
 )
 
+LLM_PROMPT_EVAL_TOKENS = Histogram(
+    'brain_llm_prompt_eval_tokens',
+    'Prompt tokens the model had to evaluate per call (a reused prompt-cache prefix is not counted)',
+    ['provider'],
+    buckets=[16, 64, 128, 256, 512, 1024, 2048, 4096, 8192]
+)
+
+LLM_PROMPT_EVAL_DURATION = Histogram(
+    'brain_llm_prompt_eval_seconds',
+    'Time the model spent evaluating the prompt per call',
+    ['provider'],
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+)
+
+LLM_CACHE_TOKENS = Counter(
+    'brain_llm_cache_tokens_total',
+    'Input tokens by prompt-cache outcome',
+    ['provider', 'kind']  # read = served from cache, write = written to cache, uncached
+)
+
+MODEL_LOADS = Counter(
+    'brain_model_loads_total',
+    'Times Ollama had to load the model into memory before answering',
+    ['provider', 'reason']  # request = a user request paid the load, startup/switch/keepalive = the warmer did
+)
+
+MODEL_LOAD_DURATION = Histogram(
+    'brain_model_load_seconds',
+    'Model load (cold start) time reported by Ollama',
+    ['provider', 'reason'],
+    buckets=[0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0]
+)
+
+KEEPALIVE_PINGS = Counter(
+    'brain_keepalive_pings_total',
+    'Model warmer runs',
+    ['result']  # ok, error, skipped_active (recent request kept it warm), skipped_busy (generation in flight), skipped_idle
+)
+
+LLM_FIRST_TOKEN = Histogram(
+    'brain_llm_first_token_seconds',
+    'Time from request to first streamed token, per provider (hedged chains)',
+    ['provider'],
+    buckets=[0.25, 0.5, 1.0, 1.5, 2.5, 5.0, 10.0, 30.0]
+)
+
+LLM_HEDGES = Counter(
+    'brain_llm_hedges_total',
+    'Requests also sent to a backup provider because the primary was slow or failed',
+    ['provider']  # The backup that was asked
+)
+
+LLM_HEDGE_WINS = Counter(
+    'brain_llm_hedge_wins_total',
+    'Hedged requests by which attempt answered',
+    ['provider', 'role']  # role: primary or hedge
+)
+
+LLM_HEDGE_DELAY = Gauge(
+    'brain_llm_hedge_delay_seconds',
+    'Current first-token deadline before hedging',
+    ['provider']
+)
+
 LLM_ERRORS = Counter(
     'brain_llm_errors_total',
     'LLM errors',
@@ -53,9 +139,121 @@ TOOL_DURATION = Histogram(
 TOOL_ERRORS = Counter(
     'brain_tool_errors_total',
     'Tool errors',
+    ['tool_name', 'reason']  # timeout, exception, bad_args, unknown_tool
+)
+
+TOOL_TERMINAL_REPLIES = Counter(
+    'brain_tool_terminal_replies_total',
+    'Turns answered from action tool results, skipping the final LLM call',
+    ['provider']
+)
+
+TOOL_CACHE_REQUESTS = Counter(
+    'brain_tool_cache_requests_total',
+    'Cached-tool calls by outcome',
+    ['tool_name', 'result']  # hit, stale (served while refreshing), shared (joined an in-flight call), miss
+)
+
+TOOL_CACHE_INVALIDATIONS = Counter(
+    'brain_tool_cache_invalidations_total',
+    'Cached tool results dropped because a side-effecting tool ran',
     ['tool_name']
 )
 
+# Intent fast path metrics
+INTENT_REQUESTS = Counter(
+    'brain_intent_requests_total',
+    'Requests checked against the intent fast path',
+    ['intent', 'result']  # hit = answered without the LLM, fallback = matched but handed to the LLM, miss
+)
+
+INTENT_DURATION = Histogram(
+    'brain_intent_duration_seconds',
+    'Time to answer a request on the intent fast path',
+    ['intent'],
+    buckets=[0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0]
+)
+
+INTENT_LATENCY_SAVED = Counter(
+    'brain_intent_latency_saved_seconds_total',
+    'Estimated seconds saved by the intent fast path (average LLM request time minus fast-path time)'
+)
+
+# Ollama active-model refresher (background /api/ps poll)
+OLLAMA_MODEL_STALENESS = Gauge(
+    'brain_ollama_active_model_staleness_seconds',
+    'Seconds since the active Ollama model was last confirmed via /api/ps'
+)
+
+OLLAMA_MODEL_REFRESH_DURATION = Gauge(
+    'brain_ollama_model_refresh_seconds',
+    'Duration of the most recent /api/ps poll'
+)
+
+OLLAMA_MODEL_REFRESH_ERRORS = Counter(
+    'brain_ollama_model_refresh_errors_total',
+    'Failed /api/ps polls'
+)
+
+# Ollama routing step (two-tier cascade and/or schema-constrained routing)
+OLLAMA_TIER_DURATION = Histogram(
+    'brain_ollama_tier_duration_seconds',
+    'Ollama call time per cascade tier',
+    ['tier'],  # router, answer
+    buckets=[0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+)
+
+OLLAMA_CASCADE_DECISIONS = Counter(
+    'brain_ollama_cascade_decisions_total',
+    'Routing-step outcomes; anything but "tools" escalates the step to the answer model',
+    ['decision']  # tools, answer, uncertain, error
+)
+
+OLLAMA_SAFETY_RETRIES = Histogram(
+    'brain_ollama_safety_retries',
+    'Safety-net retry iterations per Ollama request (hallucinated action, missed search, empty promise)',
+    buckets=[0, 1, 2, 3]
+)
+
+# Provider circuit breakers
+PROVIDER_BREAKER_STATE = Gauge(
+    'brain_provider_breaker_state',
+    'Circuit breaker state per provider (0=closed, 1=half-open, 2=open)',
+    ['provider']
+)
+
+PROVIDER_BREAKER_TRANSITIONS = Counter(
+    'brain_provider_breaker_transitions_total',
+    'Circuit breaker state changes',
+    ['provider', 'state']  # The state entered
+)
+
+# Admission control in front of concurrency-limited providers (local GPU)
+ADMISSION_IN_FLIGHT = Gauge(
+    'brain_admission_in_flight',
+    'Generations currently holding a provider slot',
+    ['provider']
+)
+
+ADMISSION_QUEUE_DEPTH = Gauge(
+    'brain_admission_queue_depth',
+    'Requests waiting for a provider slot',
+    ['provider']
+)
+
+ADMISSION_WAIT = Histogram(
+    'brain_admission_wait_seconds',
+    'Time a request waited for a provider slot',
+    ['provider'],
+    buckets=[0.01, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0]
+)
+
+ADMISSION_REJECTIONS = Counter(
+    'brain_admission_rejections_total',
+    'Requests routed past a provider because it was too busy',
+    ['provider', 'reason']  # queue_full, budget, deadline
+)
+
 # Current state
 CURRENT_PROVIDER = Gauge(
     'brain_current_provider',
@@ -64,6 +262,32 @@ CURRENT_PROVIDER = Gauge(
 )
 
 
+# Running average of completed response length, used to estimate what a
+# cancelled stream would still have generated.
+_avg_response_tokens = 0.0
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)  # ~4 characters per token for English
+
+
+def record_stream_completed(text: str):
+    """Feed a completed response into the tokens-saved estimate."""
+    global _avg_response_tokens
+    tokens = _estimate_tokens(text)
+    if _avg_response_tokens == 0.0:
+        _avg_response_tokens = float(tokens)
+    else:
+        _avg_response_tokens = 0.9 * _avg_response_tokens + 0.1 * tokens
+
+
+def record_stream_cancelled(reason: str, partial_text: str):
+    """Count a cancelled stream and the tokens it likely would have generated."""
+    STREAM_CANCELLATIONS.labels(reason=reason).inc()
+    produced = _estimate_tokens(partial_text) if partial_text else 0
+    STREAM_TOKENS_SAVED.inc(max(0.0, _avg_response_tokens - produced))
+
+
 def get_metrics():
     """Return metrics in Prometheus format."""
     return generate_latest()
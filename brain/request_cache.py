@@ -0,0 +1,89 @@
+"""Short-lived cache of answers keyed by the client's X-Request-ID.
+
+A voice node whose /ask/stream breaks retries the same request ID against
+/ask. Rather than re-running the LLM and its tools (a second set_timer, a
+second light toggle), the brain hands back the answer it already produced,
+or waits for the one still being generated. A stream whose client merely
+disconnected keeps running so that answer exists; only an explicit cancel
+(cancel(), from POST /ask/cancel) stops it.
+"""
+
+import threading
+import time
+
+
+class _Entry:
+    __slots__ = ("done", "cancel", "text", "ok", "created")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.cancel = threading.Event()  # Set only by an explicit client cancel
+        self.text = ""
+        self.ok = False
+        self.created = time.monotonic()
+
+
+class RequestResultCache:
+    """Thread-safe request-ID → answer map with TTL and size bound."""
+
+    def __init__(self, ttl: float = 120.0, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def _evict(self):
+        now = time.monotonic()
+        expired = [rid for rid, e in self._entries.items() if now - e.created > self.ttl]
+        for rid in expired:
+            del self._entries[rid]
+        # Oldest first once over the cap (dicts keep insertion order)
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def begin(self, request_id: str) -> threading.Event:
+        """Register an in-flight request (replacing any failed attempt).
+
+        Returns the request's cancel flag, set if the client explicitly cancels it.
+        """
+        with self._lock:
+            self._evict()
+            entry = self._entries[request_id] = _Entry()
+        return entry.cancel
+
+    def lookup(self, request_id: str, wait: float) -> str | None:
+        """Return the finished answer for request_id, waiting up to `wait`
+        seconds if it is still being generated. None means recompute."""
+        with self._lock:
+            self._evict()
+            entry = self._entries.get(request_id)
+        if entry is None:
+            return None
+        if not entry.done.wait(timeout=wait):
+            return None
+        return entry.text if entry.ok else None
+
+    def complete(self, request_id: str, text: str):
+        with self._lock:
+            entry = self._entries.get(request_id)
+        if entry is not None:
+            entry.text = text
+            entry.ok = True
+            entry.done.set()
+
+    def cancel(self, request_id: str) -> bool:
+        """Explicit client cancel: stop the in-flight request and forget it."""
+        with self._lock:
+            entry = self._entries.pop(request_id, None)
+        if entry is None:
+            return False
+        entry.cancel.set()
+        entry.done.set()
+        return True
+
+    def fail(self, request_id: str):
+        """Mark an attempt as failed/abandoned so a retry recomputes."""
+        with self._lock:
+            entry = self._entries.pop(request_id, None)
+        if entry is not None:
+            entry.done.set()
@@ -0,0 +1,101 @@
+"""Per-device conversation sessions.
+
+Each voice node (or other client) sends an X-Device-ID header and gets its
+own history, so two rooms no longer interleave their context. Sessions are
+bounded by message count and an approximate token budget, and are dropped
+after sitting idle for `ttl` seconds.
+"""
+
+import threading
+import time
+
+DEFAULT_SESSION = "default"
+
+
+def session_key(session_id: str | None) -> str:
+    """Normalize a client-supplied device/session ID (missing -> the shared default)."""
+    return (session_id or "").strip() or DEFAULT_SESSION
+
+
+def _estimate_tokens(message: dict) -> int:
+    return max(1, len(str(message.get("content", ""))) // 4)  # ~4 characters per token
+
+
+class Session:
+    """One conversation's history, guarded by its own lock."""
+
+    def __init__(self, session_id: str):
+        self.id = session_id
+        self.lock = threading.Lock()
+        self.history: list[dict] = []
+        self.last_used = time.monotonic()
+
+    def snapshot(self) -> list[dict]:
+        """Copy of the history to hand to a provider for one turn."""
+        with self.lock:
+            return list(self.history)
+
+    def remember(self, user_text: str, response_text: str, max_messages: int, max_tokens: int):
+        """Append an exchange, then drop the oldest exchanges until within budget."""
+        with self.lock:
+            self.history.append({"role": "user", "content": user_text})
+            self.history.append({"role": "assistant", "content": response_text})
+            if len(self.history) > max_messages:
+                del self.history[:-max_messages]
+            # Trim whole exchanges so a turn never starts with an orphaned reply;
+            # always keep the latest exchange even if it alone is over budget
+            while len(self.history) > 2 and sum(map(_estimate_tokens, self.history)) > max_tokens:
+                del self.history[:2]
+            self.last_used = time.monotonic()
+
+    def clear(self):
+        with self.lock:
+            self.history.clear()
+
+    def __len__(self) -> int:
+        return len(self.history)
+
+
+class SessionStore:
+    """Sessions keyed by device/session ID, expired after `ttl` idle seconds."""
+
+    def __init__(self, max_messages: int, max_tokens: int, ttl: float):
+        self.max_messages = max_messages
+        self.max_tokens = max_tokens
+        self.ttl = ttl
+        self._sessions: dict[str, Session] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str | None) -> Session:
+        """Return the session for session_id, creating it if needed."""
+        session_id = session_key(session_id)
+        now = time.monotonic()
+        with self._lock:
+            self._purge_expired(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = Session(session_id)
+            session.last_used = now
+            return session
+
+    def remember(self, session: Session, user_text: str, response_text: str):
+        session.remember(user_text, response_text, self.max_messages, self.max_tokens)
+
+    def clear(self, session_id: str | None = None) -> int:
+        """Clear one session (or all when session_id is None); returns how many."""
+        with self._lock:
+            if session_id is None:
+                count = len(self._sessions)
+                self._sessions.clear()
+                return count
+            session = self._sessions.pop(session_key(session_id), None)
+        return 1 if session is not None else 0
+
+    def _purge_expired(self, now: float):
+        expired = [sid for sid, s in self._sessions.items() if now - s.last_used > self.ttl]
+        for sid in expired:
+            del self._sessions[sid]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
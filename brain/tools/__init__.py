@@ -5,6 +5,8 @@ from .mqtt import mqtt_publish
 from .timers import set_timer, cancel_timer, list_timers
 from .kasa import control_light, list_lights
 from .weather import get_weather
+from .cache import ToolCache, CachePolicy, DEFAULT_POLICIES, DEFAULT_INVALIDATES
+from config import TOOL_CACHE_ENABLED, TOOL_CACHE_TTLS
 
 TOOL_REGISTRY = {
     "web_search": web_search,
@@ -18,3 +20,11 @@ TOOL_REGISTRY = {
     "list_lights": list_lights,
     "get_weather": get_weather,
 }
+
+# Cache read-only tool results; side-effecting tools invalidate what they change
+_policies = dict(DEFAULT_POLICIES)
+for _name, _ttl in TOOL_CACHE_TTLS.items():
+    _policies[_name] = CachePolicy(ttl=_ttl, stale=_policies.get(_name, CachePolicy(0)).stale)
+tool_cache = ToolCache(_policies, DEFAULT_INVALIDATES)
+if TOOL_CACHE_ENABLED:
+    TOOL_REGISTRY = {name: tool_cache.wrap(name, func) for name, func in TOOL_REGISTRY.items()}
@@ -0,0 +1,187 @@
+"""TTL result cache for read-only tools.
+
+A multi-iteration LLM loop, or a follow-up question, often repeats the same
+get_weather / list_lights / web_search call seconds apart. Results are kept
+per tool for a short TTL, keyed on the call's arguments after binding them
+to the signature (so defaults and argument order don't split the key).
+
+- Single-flight: concurrent identical calls share one backend request.
+- Stale-while-revalidate: for `stale` seconds past the TTL the old result is
+  returned immediately while one background call refreshes it.
+- Invalidation: a successful call to a side-effecting tool clears the
+  results it affects (control_light -> list_lights).
+- Error results and exceptions are never cached.
+"""
+
+import functools
+import inspect
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+from metrics import TOOL_CACHE_REQUESTS, TOOL_CACHE_INVALIDATIONS
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    ttl: float  # Seconds a result is served as fresh
+    stale: float = 0.0  # Further seconds it may be served while refreshing in the background
+
+
+# Tools whose results are cached
+DEFAULT_POLICIES = {
+    "get_weather": CachePolicy(ttl=600, stale=1800),
+    "web_search": CachePolicy(ttl=300, stale=600),
+    "query_prometheus": CachePolicy(ttl=15, stale=30),
+    "query_timescaledb": CachePolicy(ttl=30, stale=60),
+    "list_lights": CachePolicy(ttl=5, stale=10),
+    "list_timers": CachePolicy(ttl=1),  # Remaining times drift; never serve stale
+}
+
+# Side-effecting tool -> cached tools whose results it makes wrong
+DEFAULT_INVALIDATES = {
+    "control_light": ("list_lights",),
+    "set_timer": ("list_timers",),
+    "cancel_timer": ("list_timers",),
+}
+
+# "Search error: ...", "Prometheus error: ...", "Query failed: ..."
+_ERROR_RESULT = re.compile(r"\berror\b|^query failed", re.IGNORECASE)
+
+
+def _is_error(result) -> bool:
+    return not isinstance(result, str) or bool(_ERROR_RESULT.search(result[:120]))
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return " ".join(value.split())
+    return value
+
+
+class _Entry:
+    __slots__ = ("value", "stored")
+
+    def __init__(self, value: str):
+        self.value = value
+        self.stored = time.monotonic()
+
+
+class _Flight:
+    """One in-progress backend call that identical callers wait on."""
+    __slots__ = ("done", "value", "error", "generation")
+
+    def __init__(self, generation: int):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.generation = generation  # Tool's invalidation count when the call started
+
+
+class ToolCache:
+    """Thread-safe per-tool result cache; see module docstring."""
+
+    def __init__(self, policies: dict, invalidates: dict, max_entries: int = 512):
+        self.policies = policies
+        self.invalidates = invalidates
+        self.max_entries = max_entries
+        self._entries: dict[tuple, _Entry] = {}
+        self._flights: dict[tuple, _Flight] = {}
+        self._generation: dict[str, int] = {}  # Bumped on invalidation so in-flight results aren't stored
+        self._lock = threading.Lock()
+
+    def wrap(self, name: str, func):
+        """Return func with caching (if name has a policy) and invalidation hooks."""
+        policy = self.policies.get(name)
+        invalidates = self.invalidates.get(name, ())
+        if policy is None and not invalidates:
+            return func
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if policy is None:
+                result = func(*args, **kwargs)
+                if not _is_error(result):
+                    for target in invalidates:
+                        self.invalidate(target)
+                return result
+            try:
+                bound = signature.bind(*args, **kwargs)
+            except TypeError:
+                return func(*args, **kwargs)  # Let the tool raise its own error
+            bound.apply_defaults()
+            key = (name, json.dumps({k: _normalize(v) for k, v in bound.arguments.items()},
+                                    sort_keys=True, default=str))
+            return self._get(key, policy, lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    def invalidate(self, name: str):
+        with self._lock:
+            self._generation[name] = self._generation.get(name, 0) + 1
+            stale = [key for key in self._entries if key[0] == name]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            TOOL_CACHE_INVALIDATIONS.labels(tool_name=name).inc()
+
+    def clear(self):
+        with self._lock:
+            for name in {key[0] for key in self._entries}:
+                self._generation[name] = self._generation.get(name, 0) + 1
+            self._entries.clear()
+
+    def _get(self, key: tuple, policy: CachePolicy, call):
+        name = key[0]
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            age = now - entry.stored if entry else None
+            if entry and age <= policy.ttl:
+                TOOL_CACHE_REQUESTS.labels(tool_name=name, result="hit").inc()
+                return entry.value
+            flight = self._flights.get(key)
+            if entry and age <= policy.ttl + policy.stale:
+                if flight is None:
+                    self._start_flight(key)
+                    threading.Thread(target=self._run_flight, args=(key, call), daemon=True,
+                                     name=f"tool-refresh-{name}").start()
+                TOOL_CACHE_REQUESTS.labels(tool_name=name, result="stale").inc()
+                return entry.value
+            owner = flight is None
+            if owner:
+                flight = self._start_flight(key)
+        if owner:
+            TOOL_CACHE_REQUESTS.labels(tool_name=name, result="miss").inc()
+            self._run_flight(key, call)
+        else:
+            TOOL_CACHE_REQUESTS.labels(tool_name=name, result="shared").inc()
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _start_flight(self, key: tuple) -> _Flight:
+        flight = self._flights[key] = _Flight(self._generation.get(key[0], 0))
+        return flight
+
+    def _run_flight(self, key: tuple, call):
+        name = key[0]
+        with self._lock:
+            flight = self._flights[key]
+        try:
+            flight.value = call()
+        except Exception as e:
+            flight.error = e
+        with self._lock:
+            if (flight.error is None and not _is_error(flight.value)
+                    and self._generation.get(name, 0) == flight.generation):
+                self._entries.pop(key, None)  # Re-insert so eviction order follows freshness
+                self._entries[key] = _Entry(flight.value)
+                while len(self._entries) > self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+            del self._flights[key]
+        flight.done.set()
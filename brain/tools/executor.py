@@ -0,0 +1,122 @@
+"""Shared tool execution for every LLM provider.
+
+The tool calls from one model turn are independent, so they run concurrently
+on a bounded thread pool instead of one after another. Each call gets a
+deadline; a tool that misses it (a slow Kasa discovery, a hung SearXNG
+query) becomes an error result the model can phrase around, instead of
+stalling the whole answer. Python threads can't be killed, so a timed-out
+call keeps its worker until it returns; the pool bound caps that cost.
+
+Arguments are checked against each tool's signature (inspected once and
+cached): hallucinated extra args are dropped and missing required ones are
+reported back to the model rather than raising.
+"""
+
+import contextvars
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from functools import lru_cache
+
+from config import TOOL_MAX_WORKERS, TOOL_TIMEOUT, TOOL_TIMEOUTS
+from metrics import TOOL_CALLS_TOTAL, TOOL_DURATION, TOOL_ERRORS
+
+# Outer deadlines, a little above each tool's own HTTP/device timeouts.
+# Overridable per tool under tools.timeouts in config.yaml.
+_DEFAULT_TIMEOUTS = {
+    "web_search": 12,
+    "query_prometheus": 12,
+    "query_timescaledb": 15,
+    "get_weather": 12,
+    "control_light": 12,
+    "list_lights": 20,
+    "mqtt_publish": 5,
+    "set_timer": 5,
+    "cancel_timer": 5,
+    "list_timers": 5,
+}
+_TIMEOUTS = {**_DEFAULT_TIMEOUTS, **TOOL_TIMEOUTS}
+
+_pool = ThreadPoolExecutor(max_workers=TOOL_MAX_WORKERS, thread_name_prefix="tool")
+
+
+@lru_cache(maxsize=None)
+def _signature(func) -> inspect.Signature:
+    return inspect.signature(func)
+
+
+def _validate_args(name: str, func, args) -> tuple[dict, str | None]:
+    """Filter args to the tool's parameters; returns (args, error message or None)."""
+    if not isinstance(args, dict):
+        args = {}
+    signature = _signature(func)
+    params = signature.parameters
+    if not any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values()):
+        dropped = sorted(set(args) - set(params))
+        if dropped:
+            print(f"[Tools] {name}: ignoring unexpected args {dropped}")
+            args = {k: v for k, v in args.items() if k in params}
+    try:
+        signature.bind(**args)
+    except TypeError as e:
+        return args, f"Error: invalid arguments for {name}: {e}"
+    return args, None
+
+
+def _call(name: str, func, args: dict) -> str:
+    start = time.time()
+    try:
+        return str(func(**args))
+    finally:
+        TOOL_DURATION.labels(tool_name=name).observe(time.time() - start)
+
+
+def run_tools(tool_registry: dict, calls: list[tuple[str, dict]], label: str = "Tools") -> list[str]:
+    """Run (name, args) tool calls concurrently; results come back in call order.
+
+    Never raises for a tool failure: unknown tools, bad arguments, exceptions
+    and timeouts all come back as "Error: ..." strings and count in TOOL_ERRORS.
+    In a hedged request, raises ToolRightsLost if a competing attempt has won.
+    """
+    # Deferred: the llm package imports this module
+    from llm.context import emit_event, claim_tools, ToolRightsLost
+
+    if calls and not claim_tools():
+        raise ToolRightsLost("another hedged attempt already answered")
+    results: list[str | None] = [None] * len(calls)
+    pending = []
+    for i, (name, args) in enumerate(calls):
+        print(f"[{label}] Tool call: {name}({args})")
+        TOOL_CALLS_TOTAL.labels(tool_name=name).inc()
+        emit_event("tool", name=name)
+
+        func = tool_registry.get(name)
+        if func is None:
+            TOOL_ERRORS.labels(tool_name=name, reason="unknown_tool").inc()
+            results[i] = f"Unknown tool: {name}"
+            continue
+        args, error = _validate_args(name, func, args)
+        if error:
+            TOOL_ERRORS.labels(tool_name=name, reason="bad_args").inc()
+            results[i] = error
+            continue
+        timeout = _TIMEOUTS.get(name, TOOL_TIMEOUT)
+        # Each call gets its own copy of the request context (events, cancellation)
+        future = _pool.submit(contextvars.copy_context().run, _call, name, func, args)
+        pending.append((i, name, future, time.monotonic() + timeout, timeout))
+
+    for i, name, future, deadline, timeout in pending:
+        try:
+            results[i] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            TOOL_ERRORS.labels(tool_name=name, reason="timeout").inc()
+            print(f"[{label}] Tool {name} timed out after {timeout}s")
+            results[i] = f"Error: {name} timed out after {timeout} seconds."
+        except Exception as e:
+            TOOL_ERRORS.labels(tool_name=name, reason="exception").inc()
+            print(f"[{label}] Tool {name} failed: {e}")
+            results[i] = f"Error: {name} failed: {e}"
+
+    for result in results:
+        print(f"[{label}] Tool result: {result[:200]}...")
+    return results
@@ -1,12 +1,12 @@
-import httpx
 from config import INFLUXDB_URL, INFLUXDB_TOKEN, INFLUXDB_DATABASE
+from http_clients import http_client
 
 
 def query_influxdb(sql: str) -> str:
     """Query InfluxDB 3 using SQL."""
     print(f"[InfluxDB] Query: {sql}")
     try:
-        response = httpx.post(
+        response = http_client().post(
             f"{INFLUXDB_URL}/api/v3/query_sql",
             headers={
                 "Authorization": f"Bearer {INFLUXDB_TOKEN}",
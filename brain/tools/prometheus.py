@@ -1,11 +1,11 @@
-import httpx
 from config import PROMETHEUS_URL
+from http_clients import http_client
 
 
 def query_prometheus(query: str) -> str:
     """Query Prometheus using PromQL."""
     try:
-        response = httpx.get(
+        response = http_client().get(
             f"{PROMETHEUS_URL}/api/v1/query",
             params={"query": query},
             timeout=10.0
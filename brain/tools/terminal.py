@@ -0,0 +1,48 @@
+"""Terminal responses for action tools.
+
+After control_light / set_timer / cancel_timer succeed, the tool loop used to
+send the result back to the LLM just so it could say "Done, the kitchen light
+is off" - a whole extra generation per command. These tools already return a
+sentence fit to speak, so when a model turn calls only terminal tools and
+every one of them succeeds, that text is the reply and the loop stops there.
+
+A tool's result only counts as success if it matches the tool's pattern;
+anything else (unknown light, unparseable duration, timeout) goes back to the
+LLM as before so it can explain or retry.
+"""
+
+import re
+from dataclasses import dataclass
+
+from config import TOOL_TERMINAL_RESPONSES
+from metrics import TOOL_TERMINAL_REPLIES
+
+
+@dataclass(frozen=True)
+class TerminalResponse:
+    success: re.Pattern  # A result matching this is a completed action, spoken as-is
+
+
+# Tools whose successful result is the whole answer
+TERMINAL_TOOLS = {
+    "control_light": TerminalResponse(re.compile(
+        r"^(?:Turned (?:on|off) \S|Living room lights (?:turned|set to|dimmed)|[\w' -]+ is (?:on|off)$)")),
+    "set_timer": TerminalResponse(re.compile(r"^Timer set\b")),
+    "cancel_timer": TerminalResponse(re.compile(r"^Cancelled timer\b")),
+}
+
+
+def terminal_reply(calls: list[tuple[str, dict]], results: list[str], provider: str) -> str | None:
+    """The spoken reply for a turn of only successful terminal tools, else None."""
+    if not TOOL_TERMINAL_RESPONSES or not calls:
+        return None
+    sentences = []
+    for (name, _), result in zip(calls, results):
+        policy = TERMINAL_TOOLS.get(name)
+        result = (result or "").strip()
+        if policy is None or not policy.success.search(result):
+            return None
+        sentences.append(result.rstrip(".") + ".")
+    TOOL_TERMINAL_REPLIES.labels(provider=provider).inc()
+    print(f"[Tools] Answering from {[name for name, _ in calls]} results; skipping the final LLM call")
+    return " ".join(sentences)
@@ -19,6 +19,8 @@ _lock = threading.Lock()
 
 # MQTT topic for timer announcements
 TIMER_TOPIC = "voice-assistant/timer"
+# Lifecycle events (scheduled/cancelled) so voice nodes can pre-render announcements
+TIMER_EVENTS_TOPIC = "voice-assistant/timer/events"
 
 # Persistence file path - use data directory for Docker volume mount
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -160,6 +162,39 @@ def _parse_duration(duration_str: str) -> int:
     return 0
 
 
+def _announcement_text(name: str) -> str:
+    """Spoken text for a finished timer (also sent ahead of time for pre-rendering)."""
+    return f"Timer complete: {name}" if name else "Your timer is done"
+
+
+def _publish(topic: str, payload: dict) -> bool:
+    """Publish a JSON payload to the MQTT broker. Returns True on success."""
+    try:
+        mqtt_publish_msg.single(
+            topic,
+            payload=json.dumps(payload),
+            hostname=MQTT_BROKER,
+            port=MQTT_PORT
+        )
+        return True
+    except Exception as e:
+        print(f"[Timer] Failed to publish to MQTT: {e}")
+        return False
+
+
+def _publish_event(event: str, timer_id: str, name: str, end_time: datetime = None):
+    """Publish a timer lifecycle event in the background (off the request path)."""
+    payload = {
+        "event": event,
+        "timer_id": timer_id,
+        "name": name,
+        "message": _announcement_text(name),
+    }
+    if end_time is not None:
+        payload["fires_at"] = end_time.isoformat()
+    threading.Thread(target=_publish, args=(TIMER_EVENTS_TOPIC, payload), daemon=True).start()
+
+
 def _timer_callback(timer_id: str, name: str):
     """Called when timer expires."""
     print(f"[Timer] Timer '{name}' expired!")
@@ -179,18 +214,9 @@ def _timer_callback(timer_id: str, name: str):
     _cleanup_expired()
 
     # Announce via MQTT
-    announcement = f"Timer complete: {name}" if name else "Your timer is done"
-
-    try:
-        mqtt_publish_msg.single(
-            TIMER_TOPIC,
-            payload=json.dumps({"message": announcement, "name": name}),
-            hostname=MQTT_BROKER,
-            port=MQTT_PORT
-        )
+    announcement = _announcement_text(name)
+    if _publish(TIMER_TOPIC, {"message": announcement, "name": name, "timer_id": timer_id}):
         print(f"[Timer] Published to MQTT: {announcement}")
-    except Exception as e:
-        print(f"[Timer] Failed to publish to MQTT: {e}")
 
 
 def set_timer(duration: str, name: str = "") -> str:
@@ -229,6 +255,7 @@ def set_timer(duration: str, name: str = "") -> str:
         }
 
     _save_timers()
+    _publish_event("scheduled", timer_id, name, end_time)
 
     # Format confirmation
     if seconds < 60:
@@ -276,14 +303,17 @@ def cancel_timer(name: str = "") -> str:
             timer_id_to_cancel = list(ACTIVE_TIMERS.keys())[-1]
             timer_to_cancel = ACTIVE_TIMERS[timer_id_to_cancel]
 
-        if timer_to_cancel and timer_id_to_cancel:
-            timer_to_cancel["thread"].cancel()
-            timer_name = timer_to_cancel["name"]
-            del ACTIVE_TIMERS[timer_id_to_cancel]
-            _save_timers()
-            return f"Cancelled timer: {timer_name}"
+        if not (timer_to_cancel and timer_id_to_cancel):
+            return f"Couldn't find a timer matching '{name}'."
 
-        return f"Couldn't find a timer matching '{name}'."
+        timer_to_cancel["thread"].cancel()
+        timer_name = timer_to_cancel["name"]
+        del ACTIVE_TIMERS[timer_id_to_cancel]
+
+    # Outside the lock: _save_timers() takes it too
+    _save_timers()
+    _publish_event("cancelled", timer_id_to_cancel, timer_name)
+    return f"Cancelled timer: {timer_name}"
 
 
 def list_timers(**kwargs) -> str:
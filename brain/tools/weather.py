@@ -1,5 +1,6 @@
-import httpx
+import re
 from config import LOCATION_LAT, LOCATION_LON, LOCATION_CITY
+from http_clients import http_client
 
 # WMO weather codes to descriptions
 WMO_CODES = {
@@ -18,26 +19,31 @@ WMO_CODES = {
 }
 
 
+def _fetch_forecast() -> dict:
+    """Fetch current conditions and a 3-day forecast from Open-Meteo (raises on failure)."""
+    response = http_client().get(
+        "https://api.open-meteo.com/v1/forecast",
+        params={
+            "latitude": LOCATION_LAT,
+            "longitude": LOCATION_LON,
+            "current": "temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,weather_code,wind_speed_10m,wind_gusts_10m",
+            "daily": "weather_code,temperature_2m_max,temperature_2m_min,precipitation_sum,precipitation_probability_max,wind_speed_10m_max",
+            "temperature_unit": "celsius",
+            "wind_speed_unit": "kmh",
+            "precipitation_unit": "mm",
+            "timezone": "America/Toronto",
+            "forecast_days": 3
+        },
+        timeout=10.0
+    )
+    response.raise_for_status()
+    return response.json()
+
+
 def get_weather() -> str:
     """Get current weather and forecast for the configured location using Open-Meteo API."""
     try:
-        response = httpx.get(
-            "https://api.open-meteo.com/v1/forecast",
-            params={
-                "latitude": LOCATION_LAT,
-                "longitude": LOCATION_LON,
-                "current": "temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,weather_code,wind_speed_10m,wind_gusts_10m",
-                "daily": "weather_code,temperature_2m_max,temperature_2m_min,precipitation_sum,precipitation_probability_max,wind_speed_10m_max",
-                "temperature_unit": "celsius",
-                "wind_speed_unit": "kmh",
-                "precipitation_unit": "mm",
-                "timezone": "America/Toronto",
-                "forecast_days": 3
-            },
-            timeout=10.0
-        )
-        response.raise_for_status()
-        data = response.json()
+        data = _fetch_forecast()
 
         current = data.get("current", {})
         daily = data.get("daily", {})
@@ -83,3 +89,40 @@ def get_weather() -> str:
 
     except Exception as e:
         return f"Weather error: {e}"
+
+
+# Lines of get_weather()'s report that the spoken summary needs
+_REPORT_CONDITIONS = re.compile(r"^- Conditions: (.+)$", re.MULTILINE)
+_REPORT_TEMPERATURE = re.compile(r"^- Temperature: (-?\d+) degrees \(feels like (-?\d+) degrees\)", re.MULTILINE)
+_REPORT_TODAY = re.compile(
+    r"^- Today: [^,\n]+, high (-?\d+) degrees, low (-?\d+) degrees(?:, (\d+)% chance)?", re.MULTILINE)
+
+
+def summarize_weather(report: str) -> str | None:
+    """One or two spoken sentences about current conditions and today's forecast.
+
+    Built from get_weather()'s report so the intent fast path can go through
+    the tool registry (and its result cache) like the LLM does. Returns None
+    if the report is an error, so the caller can fall back to the LLM.
+    """
+    conditions = _REPORT_CONDITIONS.search(report)
+    temperature = _REPORT_TEMPERATURE.search(report)
+    if not conditions or not temperature:
+        return None
+    conditions = conditions.group(1)
+    if conditions == "unknown":
+        conditions = "unknown conditions"
+    temp_c, feels_c = int(temperature.group(1)), int(temperature.group(2))
+
+    summary = f"It's {temp_c} degrees and {conditions} in {LOCATION_CITY}"
+    if abs(feels_c - temp_c) >= 3:
+        summary += f", feeling like {feels_c}"
+    summary += "."
+
+    today = _REPORT_TODAY.search(report)
+    if today:
+        summary += f" Today's high is {today.group(1)} with a low of {today.group(2)}"
+        if today.group(3):
+            summary += f", and a {today.group(3)}% chance of precipitation"
+        summary += "."
+    return summary
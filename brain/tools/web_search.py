@@ -1,11 +1,11 @@
-import httpx
 from config import SEARXNG_URL
+from http_clients import http_client
 
 
 def web_search(query: str) -> str:
     """Search the web using SearXNG."""
     try:
-        response = httpx.get(
+        response = http_client().get(
             f"{SEARXNG_URL}/search",
             params={"q": query, "format": "json"},
             timeout=10.0
@@ -0,0 +1,35 @@
+"""Speech-to-text passthrough for /converse clients that send audio.
+
+Voice nodes normally transcribe locally and send text; a node may instead
+stream a WAV over the WebSocket and let the brain forward it to Whisper.
+"""
+
+from config import WHISPER_URL
+from http_clients import http_client
+
+# Same endpoint preference as the voice node: OpenAI-style first, legacy fallback
+TRANSCRIPTION_ENDPOINTS = ["/v1/audio/transcriptions", "/transcribe"]
+
+
+def transcribe_wav(wav_bytes: bytes, timeout: float = 30.0) -> str:
+    """Return the transcript for a WAV clip. Raises if Whisper is unreachable."""
+    if not WHISPER_URL:
+        raise RuntimeError("WHISPER_URL is not configured on the brain")
+
+    for endpoint in TRANSCRIPTION_ENDPOINTS:
+        response = http_client().post(
+            f"{WHISPER_URL}{endpoint}",
+            files={"file": ("audio.wav", wav_bytes, "audio/wav")},
+            data={"response_format": "json"},
+            timeout=timeout,
+        )
+        if response.status_code == 404 and endpoint != TRANSCRIPTION_ENDPOINTS[-1]:
+            continue
+        response.raise_for_status()
+        if "application/json" in response.headers.get("content-type", ""):
+            result = response.json()
+            if isinstance(result, dict):
+                return result.get("text", "").strip()
+            return str(result).strip()
+        return response.text.strip()
+    return ""
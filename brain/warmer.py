@@ -0,0 +1,90 @@
+"""Background model warmer for Ollama.
+
+Ollama unloads a model after its keep-alive window (5 minutes by default),
+and the next request then pays a multi-second load on the GPU box. The
+warmer sends a load-only request (empty prompt, keep_alive of two intervals)
+every `interval` seconds so the model stays resident, and preloads right
+after startup and after an admin provider switch so the first request after
+a change isn't the one that pays. A load-only ping generates nothing, so it
+neither competes for the GPU slot nor evicts Ollama's cached prompt prefix;
+`num_predict` > 0 turns it back into a tiny generation.
+
+It is idle-aware: a ping is skipped when a real request ran within the last
+interval (that request already reset Ollama's timer) or while admission
+control reports a generation in flight, and, when `max_idle` is set, pinging
+stops after that long without requests so the model can unload (e.g.
+overnight). Providers without a `warm()` method are ignored.
+"""
+
+import threading
+import time
+from typing import Callable
+
+from metrics import KEEPALIVE_PINGS
+
+
+def _warmable(llm) -> list:
+    """The providers in llm (a single provider or a fallback chain) that can be warmed."""
+    return [p for p in getattr(llm, "providers", [llm]) if hasattr(p, "warm")]
+
+
+class ModelWarmer:
+    """Keeps the active Ollama model loaded; see module docstring."""
+
+    def __init__(self, get_llm: Callable, interval: float, num_predict: int = 0, max_idle: float = 0):
+        self.get_llm = get_llm  # Called each time, so a live provider switch is picked up
+        self.interval = max(1.0, float(interval))
+        self.num_predict = int(num_predict)
+        self.max_idle = float(max_idle)
+        self._last_activity = time.monotonic()
+        self._warm_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def touch(self):
+        """Note a real request; the model is warm and the idle clock restarts."""
+        self._last_activity = time.monotonic()
+
+    def warm(self, reason: str):
+        """Warm every warmable provider now (blocking)."""
+        with self._warm_lock:
+            for provider in _warmable(self.get_llm()):
+                try:
+                    provider.warm(reason=reason, num_predict=self.num_predict, keep_alive=2 * self.interval)
+                    KEEPALIVE_PINGS.labels(result="ok").inc()
+                except Exception as e:
+                    KEEPALIVE_PINGS.labels(result="error").inc()
+                    print(f"[Warmer] {type(provider).__name__} {reason} warm-up failed: {e}")
+
+    def preload(self, reason: str):
+        """Warm in the background, e.g. right after a provider/model switch."""
+        threading.Thread(target=self.warm, args=(reason,), daemon=True, name="model-preload").start()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self.preload("startup")
+        self._thread = threading.Thread(target=self._run, daemon=True, name="model-warmer")
+        self._thread.start()
+        print(f"[Warmer] Keeping model warm every {self.interval:.0f}s"
+              + (f", until {self.max_idle:.0f}s idle" if self.max_idle else ""))
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            idle = time.monotonic() - self._last_activity
+            in_flight = getattr(self.get_llm(), "in_flight", None)
+            if idle < self.interval:
+                KEEPALIVE_PINGS.labels(result="skipped_active").inc()
+            elif in_flight is not None and in_flight():
+                KEEPALIVE_PINGS.labels(result="skipped_busy").inc()
+            elif self.max_idle and idle > self.max_idle:
+                KEEPALIVE_PINGS.labels(result="skipped_idle").inc()
+            else:
+                self.warm("keepalive")
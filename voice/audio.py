@@ -3,7 +3,7 @@ import time
 import threading
 import numpy as np
 import sounddevice as sd
-from scipy import signal
+from mic import mic_gate
 from config import (
     DEVICE_SAMPLE_RATE, TARGET_SAMPLE_RATE, CHANNELS,
     CHUNK_DURATION, SILENCE_THRESHOLD, SILENCE_DURATION, MIN_RECORD_SECONDS,
@@ -15,11 +15,28 @@ log = logging.getLogger("voice")
 
 
 def resample(audio_data: np.ndarray, orig_rate: int, target_rate: int) -> np.ndarray:
-    """Resample audio from orig_rate to target_rate."""
+    """Resample audio from orig_rate to target_rate.
+
+    FFT method, equivalent to scipy.signal.resample for real input, done with
+    numpy alone so the service doesn't load scipy (~40 MB RSS on a Pi).
+    """
     if orig_rate == target_rate:
         return audio_data
-    num_samples = int(len(audio_data) * target_rate / orig_rate)
-    return signal.resample(audio_data, num_samples).astype(np.int16)
+    n_in = len(audio_data)
+    num_samples = int(n_in * target_rate / orig_rate)
+
+    spectrum = np.fft.rfft(audio_data)
+    resampled = np.zeros(num_samples // 2 + 1, dtype=spectrum.dtype)
+    n = min(num_samples, n_in)
+    resampled[:n // 2 + 1] = spectrum[:n // 2 + 1]
+    # Split/join the Nyquist bin when present
+    if n % 2 == 0:
+        if num_samples < n_in:
+            resampled[n // 2] *= 2.0
+        elif n_in < num_samples:
+            resampled[n // 2] *= 0.5
+    out = np.fft.irfft(resampled, num_samples) * (num_samples / n_in)
+    return out.astype(np.int16)
 
 
 class AudioRecorder:
@@ -63,6 +80,26 @@ class AudioRecorder:
                     pass
             print("Flushed audio buffer")
 
+    def _capture_end(self) -> float:
+        """Monotonic time at which the block just read finished being captured.
+
+        It was captured before whatever PortAudio still has buffered behind
+        it, plus the device's input latency.
+        """
+        try:
+            behind = self.stream.latency + self.stream.read_available / self.sample_rate
+        except Exception:
+            behind = 0.0
+        return time.monotonic() - behind
+
+    def _to_native(self, data) -> np.ndarray:
+        """Flatten a raw block to int16, zeroed if it was captured while the mic gate was closed."""
+        audio_native = data.flatten().astype(np.int16)
+        end = self._capture_end()
+        if mic_gate.muted_during(end - len(data) / self.sample_rate, end):
+            audio_native[:] = 0
+        return audio_native
+
     def close_stream(self):
         """Close the microphone stream.
 
@@ -123,11 +160,12 @@ class AudioRecorder:
 
         data = result[0]
         # Flatten and convert
-        audio_native = data.flatten().astype(np.int16)
+        audio_native = self._to_native(data)
 
-        # Track amplitude for stream liveness detection
+        # Track amplitude for stream liveness detection (a gated mic is
+        # silent on purpose, not dead)
         amplitude = np.abs(audio_native).mean()
-        if amplitude > STREAM_DEAD_AMPLITUDE:
+        if amplitude > STREAM_DEAD_AMPLITUDE or mic_gate.muted:
             self._last_nonsilent_time = time.monotonic()
 
         audio_16k = resample(audio_native, self.sample_rate, TARGET_SAMPLE_RATE)
@@ -157,8 +195,13 @@ class AudioRecorder:
         time.sleep(0.5)  # let PipeWire/ALSA settle
         self.open_stream(flush_buffer=True)
 
-    def record_until_silence(self, max_seconds: float = 10.0) -> bytes:
-        """Record audio until silence is detected or max time reached."""
+    def record_until_silence(self, max_seconds: float = 10.0, discard=None) -> bytes:
+        """Record audio until silence is detected or max time reached.
+
+        discard: optional callable; chunks read while it returns True are dropped
+        (used to skip the wake acknowledgement playing over the mic). Dropped
+        chunks don't count toward max_seconds, up to max_seconds' worth of them.
+        """
         self.open_stream()
         frames = []
         silent_chunks = 0
@@ -168,11 +211,15 @@ class AudioRecorder:
         max_chunks = int(max_seconds * chunks_per_second)
         min_chunks = int(MIN_RECORD_SECONDS * chunks_per_second)  # Minimum before silence detection
         chunk_count = 0
+        discarded = 0
 
         max_amplitude = 0
-        for _ in range(max_chunks):
+        while chunk_count < max_chunks:
             data, _ = self.stream.read(chunk_size)
-            audio_native = data.flatten().astype(np.int16)
+            if discard is not None and discarded < max_chunks and discard():
+                discarded += 1
+                continue
+            audio_native = self._to_native(data)
             chunk_count += 1
 
             amplitude = np.abs(audio_native).mean()
@@ -194,11 +241,12 @@ class AudioRecorder:
         print(f"Recorded {chunk_count} chunks, max amplitude: {max_amplitude:.0f} (threshold: {SILENCE_THRESHOLD})")
         return b''.join(frames)
 
-    def record_until_silence_streaming(self, max_seconds: float = 10.0):
+    def record_until_silence_streaming(self, max_seconds: float = 10.0, discard=None):
         """Record audio until silence, yielding buffer snapshots for concurrent STT.
 
         Returns a StreamingRecordSession that the caller can use to read
-        partial audio while recording is still in progress.
+        partial audio while recording is still in progress. discard behaves as
+        in record_until_silence.
         """
         session = StreamingRecordSession()
 
@@ -214,11 +262,15 @@ class AudioRecorder:
 
                 silent_chunks = 0
                 chunk_count = 0
+                discarded = 0
                 max_amplitude = 0
 
-                for _ in range(max_chunks):
+                while chunk_count < max_chunks:
                     data, _ = self.stream.read(chunk_size)
-                    audio_native = data.flatten().astype(np.int16)
+                    if discard is not None and discarded < max_chunks and discard():
+                        discarded += 1
+                        continue
+                    audio_native = self._to_native(data)
                     chunk_count += 1
 
                     amplitude = np.abs(audio_native).mean()
@@ -1,45 +1,276 @@
 import json
+import threading
+import uuid
+from contextlib import ExitStack
 import httpx
-from config import BRAIN_URL
+from config import BRAIN_URL, BRAIN_TRANSPORT, DEVICE_ID
+
+# One long-lived client so requests reuse a pooled keep-alive connection
+# instead of paying TCP setup per turn.
+_client = httpx.Client(
+    base_url=BRAIN_URL,
+    headers={"X-Device-ID": DEVICE_ID},
+    timeout=httpx.Timeout(connect=10.0, read=120.0, write=10.0, pool=10.0),
+    limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+)
+
+
+def _ping():
+    try:
+        _client.get("/health", timeout=2.0)
+    except Exception:
+        pass
+
+
+def prewarm():
+    """Open (or refresh) a pooled connection in the background.
+
+    Called when recording starts so the connection is ready by the time the
+    transcript is; the brain's keep-alive window outlasts a spoken request.
+    """
+    threading.Thread(target=_ping, daemon=True).start()
+
+
+def _post_ask(text: str, request_id: str = None, resume_from: int = 0) -> dict:
+    headers = {}
+    if request_id:
+        headers["X-Request-ID"] = request_id
+    if resume_from:
+        headers["X-Resume-From"] = str(resume_from)
+    response = _client.post("/ask", json={"text": text}, headers=headers, timeout=60.0)
+    response.raise_for_status()
+    return response.json()
+
+
+class _TurnFailed(RuntimeError):
+    """The brain reported an error before streaming any text."""
+
+
+def _retry_ask(text: str, request_id: str = None, resume_from: int = 0):
+    """Yield the non-streaming /ask answer, or the apology if that fails too."""
+    try:
+        result = _post_ask(text, request_id=request_id, resume_from=resume_from)
+    except Exception as e:
+        print(f"Brain error: {e}")
+        result = {"response": "Sorry, I couldn't process that request."}
+    if result.get("response"):
+        yield result["response"]
+
+
+def _post_cancel(request_id: str):
+    try:
+        _client.post("/ask/cancel", headers={"X-Request-ID": request_id}, timeout=2.0)
+    except Exception as e:
+        print(f"Brain cancel error: {e}")
 
 
 def ask(text: str) -> str:
     """Send text to brain service and get response."""
     try:
-        response = httpx.post(
-            f"{BRAIN_URL}/ask",
-            json={"text": text},
-            timeout=60.0
-        )
-        response.raise_for_status()
-        result = response.json()
-        return result.get("response", "")
+        return _post_ask(text).get("response", "")
     except Exception as e:
         print(f"Brain error: {e}")
         return "Sorry, I couldn't process that request."
 
 
-def ask_stream(text: str):
-    """Yield text tokens from the brain streaming endpoint."""
+class ConverseSession:
+    """Persistent /converse WebSocket to the brain, reconnected on demand.
+
+    Turns are serialized by the voice loop, so one socket carries every turn;
+    events for turns we already abandoned (barge-in) are skipped by id.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._ws = None
+        self._stack = ExitStack()
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        with self._lock:
+            if self._ws is None:
+                from websockets.sync.client import connect
+                self._ws = self._stack.enter_context(
+                    connect(
+                        self.url,
+                        open_timeout=5.0,
+                        max_size=None,
+                        additional_headers={"X-Device-ID": DEVICE_ID},
+                    )
+                )
+            return self._ws
+
+    def reset(self):
+        with self._lock:
+            if self._ws is not None:
+                try:
+                    self._stack.close()
+                except Exception:
+                    pass
+                self._ws = None
+
+    def cancel(self, turn_id: str):
+        ws = self._ws
+        if ws is not None:
+            ws.send(json.dumps({"type": "cancel", "id": turn_id}))
+
+    def ask_stream(self, text: str, handle: "BrainStream"):
+        ws = self._connection()
+        turn_id = uuid.uuid4().hex
+        ws.send(json.dumps({"type": "ask", "id": turn_id, "text": text}))
+        handle.on_cancel(lambda: self.cancel(turn_id))
+        finished = False
+        received = False
+        try:
+            while True:
+                event = json.loads(ws.recv(timeout=120.0))
+                if event.get("id") != turn_id:
+                    continue
+                kind = event.get("type")
+                if kind == "token":
+                    if event.get("token"):
+                        received = True
+                        yield event["token"]
+                elif kind in ("done", "cancelled", "error"):
+                    finished = True
+                    if kind == "error":
+                        print(f"Brain stream error: {event.get('error')}")
+                        if not received:
+                            raise _TurnFailed(event.get("error"))
+                    return
+        finally:
+            if not finished and not handle.cancelled:
+                # Abandoned mid-turn (generator closed or broken socket): stop the brain's work
+                try:
+                    self.cancel(turn_id)
+                except Exception:
+                    pass
+
+
+def _converse_url() -> str:
+    base = BRAIN_URL.rstrip("/")
+    if base.startswith("https://"):
+        return "wss://" + base[len("https://"):] + "/converse"
+    return "ws://" + base.split("://", 1)[-1] + "/converse"
+
+
+_converse = ConverseSession(_converse_url()) if BRAIN_TRANSPORT == "websocket" else None
+
+
+class BrainStream:
+    """Iterator over response tokens that another thread can cancel.
+
+    TTS consumes tokens in its producer thread; barge-in calls cancel() from
+    the monitor thread, which closes the HTTP response (or sends a /converse
+    cancel) so the brain stops generating instead of finishing the answer.
+    """
+
+    def __init__(self, text: str):
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._abort = None
+        transport = _ask_stream_ws if _converse is not None else _ask_stream_http
+        self._tokens = transport(text, self)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        return next(self._tokens)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def on_cancel(self, abort):
+        """Register how to abort the in-flight request."""
+        with self._lock:
+            self._abort = abort
+        if self.cancelled:
+            abort()
+
+    def cancel(self):
+        """Stop the stream; safe to call from any thread, more than once."""
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            self._cancelled.set()
+            abort = self._abort
+        if abort is not None:
+            try:
+                abort()
+            except Exception:
+                pass
+
+
+def _ask_stream_ws(text: str, handle: BrainStream):
+    """Stream over /converse; fall back to HTTP if the socket fails before any tokens."""
+    received = False
+    try:
+        for token in _converse.ask_stream(text, handle):
+            received = True
+            yield token
+        return
+    except _TurnFailed:
+        # The socket is fine; the brain's turn failed. Ask again without streaming.
+        yield from _retry_ask(text)
+        return
+    except Exception as e:
+        if handle.cancelled:
+            return
+        print(f"Brain websocket error: {e}")
+        _converse.reset()
+        if received:
+            return
+    yield from _ask_stream_http(text, handle)
+
+
+def ask_stream(text: str) -> BrainStream:
+    """Stream text tokens from the brain, over /converse or HTTP per BRAIN_TRANSPORT."""
+    return BrainStream(text)
+
+
+def _ask_stream_http(text: str, handle: BrainStream):
+    """Yield text tokens from the brain streaming endpoint.
+
+    Each request carries an X-Request-ID. If the stream breaks, the retry
+    reuses it: the brain returns the answer it already produced (from where
+    the stream stopped) instead of re-running the LLM and its tools. Because
+    a broken stream doesn't stop the brain, a deliberate cancel (barge-in)
+    also tells it so via /ask/cancel. An error event before any text is
+    retried the same way, so the user hears an answer or the apology rather
+    than silence.
+    """
+    if handle.cancelled:
+        return
+    request_id = uuid.uuid4().hex
+    received = 0
     try:
-        with httpx.stream(
+        with _client.stream(
             "POST",
-            f"{BRAIN_URL}/ask/stream",
+            "/ask/stream",
             json={"text": text},
-            timeout=httpx.Timeout(connect=10.0, read=120.0, write=10.0, pool=10.0)
+            headers={"X-Request-ID": request_id},
         ) as response:
+            def abort():
+                threading.Thread(target=_post_cancel, args=(request_id,), daemon=True).start()
+                response.close()
+
+            handle.on_cancel(abort)
             response.raise_for_status()
             for line in response.iter_lines():
                 if line.startswith("data: "):
                     data = json.loads(line[6:])
+                    if data.get("error") and not received:
+                        raise _TurnFailed(data["error"])
                     if data.get("done") or data.get("error"):
                         return
                     token = data.get("token", "")
                     if token:
+                        received += len(token)
                         yield token
     except Exception as e:
+        if handle.cancelled:
+            return  # We closed the response ourselves; don't retry
         print(f"Brain stream error: {e}")
-        # Fallback to non-streaming
-        result = ask(text)
-        if result:
-            yield result
+        yield from _retry_ask(text, request_id=request_id, resume_from=received)
@@ -1,10 +1,15 @@
 import os
+import socket
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # Brain service (running locally on Pi)
 BRAIN_URL = os.getenv("BRAIN_URL", "http://localhost:8000")
+# Identifies this node to the brain so each room keeps its own conversation
+DEVICE_ID = os.getenv("DEVICE_ID") or socket.gethostname()
+# Brain transport: "http" (request per turn) or "websocket" (one persistent /converse session)
+BRAIN_TRANSPORT = os.getenv("BRAIN_TRANSPORT", "http").lower()
 
 # Whisper STT (faster-whisper in k3s)
 WHISPER_URL = os.getenv("WHISPER_URL", "http://localhost:8000")
@@ -13,6 +18,9 @@ WHISPER_URL = os.getenv("WHISPER_URL", "http://localhost:8000")
 PIPER_PATH = os.getenv("PIPER_PATH", os.path.expanduser("~/piper/piper"))
 PIPER_MODEL = os.getenv("PIPER_MODEL", os.path.expanduser("~/piper-voices/en_US-hfc_female-medium.onnx"))
 
+# Low-memory mode for small Pis: single-threaded BLAS/ONNX pools, no ONNX memory arena
+LOW_MEMORY_MODE = os.getenv("LOW_MEMORY_MODE", "false").lower() == "true"
+
 # Wake word engine: "openwakeword" or "porcupine"
 WAKEWORD_ENGINE = os.getenv("WAKEWORD_ENGINE", "openwakeword")
 
@@ -55,6 +63,18 @@ POST_TTS_PAUSE = float(os.getenv("POST_TTS_PAUSE", "0.3"))
 POST_EMPTY_PAUSE = float(os.getenv("POST_EMPTY_PAUSE", "1.0"))
 AUDIO_SETTLE_PAUSE = float(os.getenv("AUDIO_SETTLE_PAUSE", "0.2"))
 
+# Wake acknowledgement: "speech" (cached Piper clip), "earcon" (short sound), or "none"
+ACK_MODE = os.getenv("ACK_MODE", "speech").lower()
+ACK_TEXT = os.getenv("ACK_TEXT", "Yes?")
+ACK_EARCON = os.getenv("ACK_EARCON", "/usr/share/sounds/freedesktop/stereo/message-new-instant.oga")
+# Play the ack while recording is already running instead of close mic → play → pause → reopen
+ACK_OVERLAP = os.getenv("ACK_OVERLAP", "true").lower() == "true"
+ACK_DISCARD_TAIL = float(os.getenv("ACK_DISCARD_TAIL", "0.15"))  # seconds of echo discarded after the ack ends
+
+# Mic mute during TTS: "gate" (zero our own capture frames, no process spawn),
+# "wpctl" (mute the PipeWire source), or "both"
+MIC_MUTE_BACKEND = os.getenv("MIC_MUTE_BACKEND", "gate").lower()
+
 # Barge-in (interrupt TTS with wake word)
 BARGE_IN_ENABLED = os.getenv("BARGE_IN_ENABLED", "true").lower() == "true"
 
@@ -62,6 +82,10 @@ BARGE_IN_ENABLED = os.getenv("BARGE_IN_ENABLED", "true").lower() == "true"
 MQTT_BROKER = os.getenv("MQTT_BROKER", "192.168.0.167")
 MQTT_PORT = int(os.getenv("MQTT_PORT", "1883"))
 TIMER_TOPIC = "voice-assistant/timer"
+TIMER_EVENTS_TOPIC = "voice-assistant/timer/events"  # scheduled/cancelled, for pre-rendering
+# Keep the mic live during timer announcements so the wake word dismisses them
+# (and starts a normal turn; there is no separate "stop" keyword)
+TIMER_DISMISS_ENABLED = os.getenv("TIMER_DISMISS_ENABLED", "true").lower() == "true"
 
 # Streaming STT settings
 STREAMING_STT_ENABLED = os.getenv("STREAMING_STT_ENABLED", "true").lower() == "true"
@@ -1,32 +1,44 @@
 #!/usr/bin/env python3
 """Voice assistant main loop."""
 
+import sys
+import startup
+
+# Must run before numpy/onnxruntime load: thread caps and import timing
+startup.begin(profile="--profile-startup" in sys.argv)
+
 import os
 import signal
-import sys
 import time
 import json
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 import paho.mqtt.client as mqtt
 from audio import AudioRecorder
 from wakeword import WakeWordDetector
 from stt import transcribe, transcribe_streaming
-from tts import speak, speak_streamed, stop_speaking, announce_timer, start_thinking_loop, stop_thinking_loop
-from brain_client import ask, ask_stream
+from tts import (
+    speak, speak_streamed, stop_speaking, announce_timer, start_thinking_loop, stop_thinking_loop,
+    preload_ack, prewarm_piper, play_ack, is_announcing, dismiss_announcement,
+    prerender_announcement, evict_announcement
+)
+from brain_client import ask, ask_stream, prewarm as prewarm_brain
 from config import (
-    MQTT_BROKER, MQTT_PORT, TIMER_TOPIC, STREAMING_STT_ENABLED,
+    MQTT_BROKER, MQTT_PORT, TIMER_TOPIC, TIMER_EVENTS_TOPIC, STREAMING_STT_ENABLED,
     COOLDOWN_SECONDS, CHUNK_DURATION, POST_TTS_PAUSE, POST_EMPTY_PAUSE,
     AUDIO_SETTLE_PAUSE, MAX_RECORD_SECONDS, FOLLOWUP_MAX_SECONDS,
-    MIN_SPEECH_BYTES, BARGE_IN_ENABLED
+    MIN_SPEECH_BYTES, BARGE_IN_ENABLED, ACK_OVERLAP
 )
 from logging_config import setup_logging
 from metrics_server import start_metrics_server
+from mic import reset_mic_mute
 from metrics import (
     WAKEWORD_DETECTIONS, WAKEWORD_FALSE_TRIGGERS,
-    RECORDING_DURATION, STT_REQUESTS, STT_DURATION,
+    RECORDING_DURATION, WAKE_TO_RECORD, STT_REQUESTS, STT_DURATION,
     TTS_REQUESTS, BRAIN_REQUESTS, BRAIN_DURATION,
     CONVERSATIONS_TOTAL, CONVERSATION_DURATION, LISTENING_STATE,
-    STREAM_DEAD_RECOVERIES
+    STREAM_DEAD_RECOVERIES, STARTUP_DURATION
 )
 
 # Setup structured logging (JSON for Loki, plain text if LOG_FORMAT=text)
@@ -43,14 +55,37 @@ timer_announcements = []
 timer_lock = threading.Lock()
 
 
+def _on_timer_event(payload: dict):
+    """Pre-render or evict an announcement as timers are scheduled/cancelled."""
+    timer_id = payload.get("timer_id")
+    if not timer_id:
+        return
+    event = payload.get("event")
+    if event == "scheduled":
+        fires_at = None
+        if payload.get("fires_at"):
+            fires_at = datetime.fromisoformat(payload["fires_at"]).timestamp()
+        # Piper takes a moment; keep the MQTT network loop free
+        threading.Thread(
+            target=prerender_announcement,
+            args=(timer_id, payload.get("message", "Timer complete"), fires_at),
+            daemon=True
+        ).start()
+    elif event == "cancelled":
+        evict_announcement(timer_id)
+
+
 def on_mqtt_message(client, userdata, msg):
     """Handle incoming MQTT messages for timer notifications."""
     try:
         payload = json.loads(msg.payload.decode())
+        if msg.topic == TIMER_EVENTS_TOPIC:
+            _on_timer_event(payload)
+            return
         message = payload.get("message", "Timer complete")
         log.info(f"Timer notification received: {message}", extra={"event": "timer_notification"})
         with timer_lock:
-            timer_announcements.append(message)
+            timer_announcements.append((message, payload.get("timer_id")))
     except Exception as e:
         log.error(f"Error parsing MQTT message: {e}", extra={"event": "mqtt_error"})
 
@@ -62,8 +97,8 @@ def on_mqtt_connect(client, userdata, flags, reason_code, properties):
     than once at startup.
     """
     if reason_code == 0:
-        client.subscribe(TIMER_TOPIC)
-        log.info(f"Subscribed to MQTT topic: {TIMER_TOPIC}", extra={"event": "mqtt_connected"})
+        client.subscribe([(TIMER_TOPIC, 0), (TIMER_EVENTS_TOPIC, 0)])
+        log.info(f"Subscribed to MQTT topics: {TIMER_TOPIC}, {TIMER_EVENTS_TOPIC}", extra={"event": "mqtt_connected"})
     else:
         log.error(f"MQTT connect refused: {reason_code}", extra={"event": "mqtt_error"})
 
@@ -135,8 +170,14 @@ def main():
     metrics_server = start_metrics_server(port=8001)
     log.info("Metrics server started on port 8001", extra={"event": "metrics_started"})
 
-    recorder = AudioRecorder()
-    detector = WakeWordDetector()
+    reset_mic_mute()
+    # Load the wake word model while Piper renders the ack / warms up
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="startup") as pool:
+        detector_future = pool.submit(WakeWordDetector)
+        pool.submit(preload_ack)
+        pool.submit(prewarm_piper)
+        recorder = AudioRecorder()
+        detector = detector_future.result()
     cooldown_remaining = 0  # Chunks to skip before accepting wake word
     pending_conversation = False  # True after barge-in: skip wake word, enter conversation
 
@@ -149,6 +190,7 @@ def main():
         log.info("Shutting down", extra={"event": "shutdown"})
         running = False
         stop_speaking()
+        dismiss_announcement()
         if mqtt_client:
             mqtt_client.loop_stop()
 
@@ -158,6 +200,8 @@ def main():
     try:
         recorder.open_stream()
         LISTENING_STATE.set(1)
+        STARTUP_DURATION.set(startup.elapsed())
+        startup.report()
         log.info("Listening for wake word", extra={"event": "listening"})
 
         while running:
@@ -191,20 +235,15 @@ def main():
                     cooldown_remaining = COOLDOWN_CHUNKS
                     continue
 
-                # Check for timer announcements
+                # Hand timer announcements to the background player; the
+                # capture loop keeps running so the wake word can dismiss them
                 with timer_lock:
                     if timer_announcements:
-                        announcement = timer_announcements.pop(0)
+                        announcement, timer_id = timer_announcements.pop(0)
                         log.info(f"Announcing timer: {announcement}", extra={"event": "timer_announce"})
                         stop_thinking_loop()  # Safety: stop any leftover thinking sounds
-                        recorder.close_stream()
                         TTS_REQUESTS.inc()
-                        announce_timer(announcement, repeats=3, pause=3.0)
-                        time.sleep(AUDIO_SETTLE_PAUSE)
-                        detector.reset()
-                        recorder.open_stream(flush_buffer=True)
-                        cooldown_remaining = COOLDOWN_CHUNKS
-                        continue
+                        announce_timer(announcement, repeats=3, pause=3.0, timer_id=timer_id)
 
                 # Skip wake word detection during cooldown period
                 if cooldown_remaining > 0:
@@ -214,6 +253,12 @@ def main():
                 if not detector.detect(chunk):
                     continue
 
+                if is_announcing():
+                    # Stop the announcement, then carry on into a normal turn so
+                    # "hey luna, cancel the timer" still works mid-announcement
+                    dismiss_announcement()
+                    log.info("Timer announcement dismissed by wake word", extra={"event": "timer_dismissed"})
+
             # === Conversation start ===
             pending_conversation = False
             conversation_start = time.time()
@@ -222,23 +267,36 @@ def main():
             log.info("Wake word detected", extra={"event": "wakeword_detected"})
             detector.reset()
 
-            # Close mic before speaking to avoid feedback/self-triggering
-            recorder.close_stream()
-            TTS_REQUESTS.inc()
-            speak("Yes?")
-            time.sleep(POST_TTS_PAUSE)
+            discard = None
+            if ACK_OVERLAP:
+                # Keep the mic open and record straight away; frames captured
+                # while the ack is audible are dropped by the recorder.
+                ack = play_ack()
+                if ack:
+                    discard = ack.active
+            else:
+                # Close mic before the ack to avoid feedback/self-triggering
+                recorder.close_stream()
+                ack = play_ack()
+                if ack:
+                    ack.wait()
+                time.sleep(POST_TTS_PAUSE)
 
-            if not running:
-                break
+                if not running:
+                    break
 
-            recorder.open_stream(flush_buffer=False)  # Don't flush - start recording immediately
+                recorder.open_stream(flush_buffer=False)  # Don't flush - start recording immediately
 
             # Record user speech (with concurrent STT if enabled)
             record_start = time.time()
+            WAKE_TO_RECORD.observe(record_start - conversation_start)
+            prewarm_brain()  # Connect while the user is still talking
 
             if STREAMING_STT_ENABLED:
                 # Streaming: record and transcribe concurrently
-                session = recorder.record_until_silence_streaming(max_seconds=MAX_RECORD_SECONDS)
+                session = recorder.record_until_silence_streaming(
+                    max_seconds=MAX_RECORD_SECONDS, discard=discard
+                )
                 stt_start = time.time()
                 text = transcribe_streaming(session)
                 session.thread.join(timeout=2.0)
@@ -256,7 +314,7 @@ def main():
                     continue
             else:
                 # Sequential fallback
-                audio_data = recorder.record_until_silence(max_seconds=MAX_RECORD_SECONDS)
+                audio_data = recorder.record_until_silence(max_seconds=MAX_RECORD_SECONDS, discard=discard)
                 recorder.close_stream()
                 recording_duration = time.time() - record_start
                 RECORDING_DURATION.observe(recording_duration)
@@ -311,7 +369,7 @@ def main():
 
             brain_duration = time.time() - brain_start
             BRAIN_DURATION.observe(brain_duration)
-            BRAIN_REQUESTS.labels(status="success").inc()
+            BRAIN_REQUESTS.labels(status="cancelled" if barged_in else "success").inc()
 
             # Always ensure thinking sound is stopped
             stop_thinking_loop()
@@ -338,6 +396,7 @@ def main():
                 log.info("Waiting for follow-up", extra={"event": "followup_listening"})
                 time.sleep(POST_TTS_PAUSE)
                 recorder.open_stream(flush_buffer=True)
+                prewarm_brain()
 
                 # Listen for follow-up (shorter timeout, same silence detection)
                 audio_data = recorder.record_until_silence(max_seconds=FOLLOWUP_MAX_SECONDS)
@@ -379,7 +438,7 @@ def main():
 
                             brain_duration = time.time() - brain_start
                             BRAIN_DURATION.observe(brain_duration)
-                            BRAIN_REQUESTS.labels(status="success").inc()
+                            BRAIN_REQUESTS.labels(status="cancelled" if barged_in else "success").inc()
                             stop_thinking_loop()
 
                             log.info(f"Followup response: {followup_response[:100]}...", extra={
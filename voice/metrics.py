@@ -27,6 +27,12 @@ AUDIO_AMPLITUDE = Histogram(
     buckets=[10, 30, 50, 100, 200, 500, 1000, 5000]
 )
 
+WAKE_TO_RECORD = Histogram(
+    'voice_wake_to_record_seconds',
+    'Time from wake word detection to recording start (includes the ack)',
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0]
+)
+
 # STT metrics
 STT_REQUESTS = Counter(
     'voice_stt_requests_total',
@@ -52,6 +58,13 @@ TTS_DURATION = Histogram(
     buckets=[0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
 )
 
+MIC_MUTE_DURATION = Histogram(
+    'voice_mic_mute_toggle_seconds',
+    'Time to mute/unmute the mic around TTS playback',
+    ['backend'],
+    buckets=[0.0001, 0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 2.0]
+)
+
 # Brain client metrics
 BRAIN_REQUESTS = Counter(
     'voice_brain_requests_total',
@@ -83,6 +96,11 @@ LISTENING_STATE = Gauge(
     'Voice service listening state (1=listening, 0=processing)'
 )
 
+STARTUP_DURATION = Gauge(
+    'voice_startup_seconds',
+    'Seconds from process start until listening for the wake word'
+)
+
 STREAM_DEAD_RECOVERIES = Counter(
     'voice_stream_dead_recoveries_total',
     'Times stream was reopened due to sustained silence (dead stream)'
@@ -0,0 +1,86 @@
+"""Mic mute control for TTS playback.
+
+The default "gate" backend mutes our own capture path: frames captured
+while it was closed come out of AudioRecorder zeroed, so wake word detection
+and recording hear silence and no process is spawned. What counts is when a
+frame was captured, not when it is read, so TTS still buffered in PortAudio
+when the gate reopens stays silent. "wpctl" mutes the PipeWire default
+source instead (for setups where other programs share the mic); "both" does
+both.
+"""
+
+import subprocess
+import threading
+import time
+from config import MIC_MUTE_BACKEND
+from metrics import MIC_MUTE_DURATION
+
+
+class MicGate:
+    """Software mute checked by the capture layer on every frame."""
+
+    def __init__(self):
+        self._closed = threading.Event()
+        self._lock = threading.Lock()
+        # The most recent closed window, in time.monotonic() seconds
+        self._closed_at = 0.0
+        self._opened_at = 0.0
+
+    def set_muted(self, muted: bool):
+        with self._lock:
+            if muted and not self._closed.is_set():
+                self._closed_at = time.monotonic()
+                self._closed.set()
+            elif not muted and self._closed.is_set():
+                self._opened_at = time.monotonic()
+                self._closed.clear()
+
+    @property
+    def muted(self) -> bool:
+        return self._closed.is_set()
+
+    def muted_during(self, start: float, end: float) -> bool:
+        """Was the gate closed at any point between two time.monotonic() readings?"""
+        with self._lock:
+            if self._closed.is_set():
+                return end >= self._closed_at
+            return start <= self._opened_at and end >= self._closed_at
+
+
+mic_gate = MicGate()
+
+
+def _wpctl_mute(mute: bool) -> bool:
+    """Mute or unmute the PipeWire default source. Returns True on success."""
+    try:
+        result = subprocess.run(
+            ["wpctl", "set-mute", "@DEFAULT_AUDIO_SOURCE@", "1" if mute else "0"],
+            capture_output=True,
+            timeout=2
+        )
+        return result.returncode == 0
+    except Exception as e:
+        print(f"Mute control error: {e}")
+        return False
+
+
+def set_mic_muted(mute: bool):
+    """Mute or unmute the mic using the configured backend."""
+    start = time.perf_counter()
+    backend = MIC_MUTE_BACKEND if MIC_MUTE_BACKEND in ("gate", "wpctl", "both") else "wpctl"
+    if backend in ("gate", "both"):
+        mic_gate.set_muted(mute)
+    if backend in ("wpctl", "both"):
+        _wpctl_mute(mute)
+    MIC_MUTE_DURATION.labels(backend=backend).observe(time.perf_counter() - start)
+
+
+def reset_mic_mute():
+    """Clear any source mute left behind by a previous run.
+
+    Older versions (and a crash mid-utterance with the wpctl backend) can leave
+    the PipeWire source muted; with the gate backend nothing else would ever
+    unmute it, so do it once at startup.
+    """
+    mic_gate.set_muted(False)
+    _wpctl_mute(False)
@@ -0,0 +1,80 @@
+"""Startup profiling and low-memory tuning for the voice service.
+
+Both have to take effect before numpy/onnxruntime are imported, so main.py
+calls begin() ahead of its other imports.
+"""
+
+import builtins
+import logging
+import os
+import sys
+import time
+from config import LOW_MEMORY_MODE
+
+log = logging.getLogger("voice")
+
+_start = time.perf_counter()
+_import_times = {}  # module name -> cumulative seconds of its first import
+_original_import = None
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    t0 = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        _import_times.setdefault(name, time.perf_counter() - t0)
+
+
+def begin(profile: bool):
+    """Apply low-memory settings and, if requested, start timing imports."""
+    global _original_import
+
+    if LOW_MEMORY_MODE:
+        # Single-threaded BLAS/OpenMP pools: a Pi 3 gains nothing from more
+        # threads, and each pool reserves its own stacks and buffers.
+        for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS"):
+            os.environ.setdefault(var, "1")
+
+    if profile and _original_import is None:
+        _original_import = builtins.__import__
+        builtins.__import__ = _timed_import
+
+
+def rss_bytes() -> int:
+    """Current resident set size, or 0 if /proc is unavailable."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def elapsed() -> float:
+    """Seconds since this module was imported (i.e. process start, near enough)."""
+    return time.perf_counter() - _start
+
+
+def report(top: int = 20):
+    """Log import time per module and RSS after init, then stop profiling."""
+    global _original_import
+    if _original_import is None:
+        return
+    builtins.__import__ = _original_import
+    _original_import = None
+
+    lines = [f"Startup profile: {elapsed():.2f}s to ready, RSS {rss_bytes() / 2**20:.1f} MiB"]
+    ranked = sorted(_import_times.items(), key=lambda kv: kv[1], reverse=True)
+    for name, seconds in ranked[:top]:
+        lines.append(f"  {seconds * 1000:8.1f} ms  {name}")
+    log.info("\n".join(lines), extra={
+        "event": "startup_profile",
+        "startup_seconds": round(elapsed(), 3),
+        "rss_bytes": rss_bytes(),
+        "imports_ms": {name: round(seconds * 1000, 1) for name, seconds in ranked[:top]},
+    })
@@ -5,7 +5,11 @@ import re
 import time
 import threading
 import queue
-from config import PIPER_PATH, PIPER_MODEL
+from mic import set_mic_muted
+from config import (
+    PIPER_PATH, PIPER_MODEL, ACK_MODE, ACK_TEXT, ACK_EARCON, ACK_DISCARD_TAIL,
+    TIMER_DISMISS_ENABLED
+)
 
 # Global state for barge-in
 _playback_process = None
@@ -20,16 +24,8 @@ THINKING_SOUND = "/usr/share/sounds/freedesktop/stereo/dialog-information.oga"
 
 
 def _mute_mic(mute: bool):
-    """Mute or unmute the default audio input source."""
-    try:
-        action = "1" if mute else "0"
-        subprocess.run(
-            ["wpctl", "set-mute", "@DEFAULT_AUDIO_SOURCE@", action],
-            capture_output=True,
-            timeout=2
-        )
-    except Exception as e:
-        print(f"Mute control error: {e}")
+    """Mute or unmute the mic for the duration of playback."""
+    set_mic_muted(mute)
 
 
 def speak(text: str):
@@ -78,6 +74,107 @@ def speak(text: str):
             os.unlink(tmp_path)
 
 
+def _synthesize(text: str, path: str) -> bool:
+    """Render text to a WAV file with Piper. Returns True on success."""
+    try:
+        process = subprocess.run(
+            [PIPER_PATH, "--model", PIPER_MODEL, "--output_file", path],
+            input=text.encode(),
+            capture_output=True,
+            timeout=30
+        )
+    except Exception as e:
+        print(f"Piper error: {e}")
+        return False
+    if process.returncode != 0:
+        print(f"Piper error: {process.stderr.decode()}")
+        return False
+    return True
+
+
+# Pre-rendered wake acknowledgement clip (set by preload_ack)
+_ack_path = None
+
+
+def preload_ack():
+    """Prepare the wake acknowledgement once so playing it needs no synthesis."""
+    global _ack_path
+    _ack_path = None
+
+    if ACK_MODE == "none":
+        return
+    if ACK_MODE == "earcon":
+        if os.path.exists(ACK_EARCON):
+            _ack_path = ACK_EARCON
+        else:
+            print(f"Ack earcon not found: {ACK_EARCON}")
+        return
+
+    path = os.path.join(tempfile.gettempdir(), "luna-ack.wav")
+    if _synthesize(ACK_TEXT, path):
+        _ack_path = path
+
+
+def prewarm_piper():
+    """Run Piper once at boot so its binary and voice model are in the page cache.
+
+    No-op in speech ack mode: preload_ack() already ran Piper.
+    """
+    if ACK_MODE == "speech":
+        return
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+        path = tmp.name
+    try:
+        _synthesize("Ready.", path)
+    finally:
+        os.unlink(path)
+
+
+class AckPlayback:
+    """A wake acknowledgement playing in the background.
+
+    The recorder polls active() and discards mic frames while the clip, plus a
+    short echo tail, is audible.
+    """
+
+    def __init__(self, process: subprocess.Popen, tail: float):
+        self._process = process
+        self._tail = tail
+        self._ended_at = None
+
+    def active(self) -> bool:
+        if self._process.poll() is None:
+            return True
+        if self._ended_at is None:
+            self._ended_at = time.monotonic()
+        return time.monotonic() - self._ended_at < self._tail
+
+    def wait(self, timeout: float = 5.0):
+        try:
+            self._process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+
+
+def play_ack():
+    """Start playing the wake acknowledgement without blocking.
+
+    Returns an AckPlayback, or None if acks are disabled or unavailable.
+    """
+    if _ack_path is None:
+        return None
+    try:
+        process = subprocess.Popen(
+            ["pw-play", _ack_path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+    except Exception as e:
+        print(f"Ack playback error: {e}")
+        return None
+    return AckPlayback(process, ACK_DISCARD_TAIL)
+
+
 # Sentence boundary pattern: period/exclamation/question followed by space, or newline
 _SENTENCE_END = re.compile(r'[.!?](?:\s+|$)|[\n]')
 
@@ -95,6 +192,15 @@ def _clean_for_tts(text: str) -> str:
 
 # Module-level stop event for streamed TTS barge-in
 _stream_stop = threading.Event()
+# Token source of the current streamed response, cancelled on barge-in so the
+# brain stops generating (anything with a cancel() method, e.g. BrainStream)
+_active_stream = None
+
+
+def _cancel_active_stream():
+    stream = _active_stream
+    if stream is not None and hasattr(stream, "cancel"):
+        stream.cancel()
 
 
 def speak_streamed(token_iter, on_first_audio=None, mute_mic=True):
@@ -108,8 +214,9 @@ def speak_streamed(token_iter, on_first_audio=None, mute_mic=True):
     Returns:
         The full accumulated response text.
     """
-    global _playback_process
+    global _playback_process, _active_stream
     _stream_stop.clear()
+    _active_stream = token_iter
 
     sentence_queue = queue.Queue()
     full_text_parts = []
@@ -187,6 +294,9 @@ def speak_streamed(token_iter, on_first_audio=None, mute_mic=True):
             if _stream_stop.is_set():
                 break
     finally:
+        if _stream_stop.is_set():
+            _cancel_active_stream()
+        _active_stream = None
         if mute_mic:
             _mute_mic(False)
         with _playback_lock:
@@ -200,6 +310,7 @@ def stop_speaking():
     """Stop any ongoing TTS playback (for barge-in)."""
     global _playback_process
     _stream_stop.set()  # Also stop streamed TTS pipeline
+    _cancel_active_stream()  # ...and the brain generating it
 
     with _playback_lock:
         if _playback_process is not None:
@@ -282,51 +393,195 @@ def stop_thinking_loop():
         _thinking_thread = None
 
 
-def announce_timer(message: str, repeats: int = 3, pause: float = 2.0):
+# Announcement clips rendered ahead of time: {timer_id: {"message", "path", "expires"}}
+_prerendered = {}
+_prerendered_lock = threading.Lock()
+# Keep a clip this long past its fire time in case the fired message is late
+PRERENDER_GRACE_SECONDS = 600
+
+
+def _discard_clip(entry: dict):
+    if os.path.exists(entry["path"]):
+        os.unlink(entry["path"])
+
+
+def prerender_announcement(timer_id: str, message: str, fires_at: float = None):
+    """Synthesize a timer's announcement now so playback can start as soon as it fires."""
+    now = time.time()
+    with _prerendered_lock:
+        stale = [tid for tid, e in _prerendered.items() if e["expires"] < now]
+        for tid in stale:
+            _discard_clip(_prerendered.pop(tid))
+
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+        path = tmp.name
+    if not _synthesize(message, path):
+        os.unlink(path)
+        return
+
+    expires = (fires_at or now + 86400) + PRERENDER_GRACE_SECONDS
+    with _prerendered_lock:
+        previous = _prerendered.pop(timer_id, None)
+        _prerendered[timer_id] = {"message": message, "path": path, "expires": expires}
+    if previous:
+        _discard_clip(previous)
+    print(f"Pre-rendered announcement for {timer_id}: {message}")
+
+
+def evict_announcement(timer_id: str):
+    """Drop a pre-rendered announcement (timer cancelled)."""
+    with _prerendered_lock:
+        entry = _prerendered.pop(timer_id, None)
+    if entry:
+        _discard_clip(entry)
+
+
+def _take_prerendered(timer_id: str, message: str):
+    """Claim the pre-rendered clip for a fired timer. Caller owns the file."""
+    with _prerendered_lock:
+        entry = _prerendered.get(timer_id) if timer_id else None
+        if entry is None or entry["message"] != message:
+            return None
+        del _prerendered[timer_id]
+    return entry["path"]
+
+
+class _AnnouncementPlayer:
+    """Plays timer announcements from a background output queue.
+
+    Each announcement is synthesized once and the same clip is replayed for
+    every repeat. cancel() stops the current announcement, including any
+    remaining repeats, so the capture loop can dismiss it with the wake word.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._cancel = threading.Event()
+        self._active = threading.Event()
+        self._process = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, message: str, repeats: int, pause: float, timer_id: str = None):
+        self._queue.put((message, repeats, pause, timer_id))
+
+    def is_active(self) -> bool:
+        return self._active.is_set() or not self._queue.empty()
+
+    def cancel(self) -> bool:
+        """Stop the announcement in progress. Returns True if one was playing."""
+        was_active = self._active.is_set()
+        self._cancel.set()
+        with self._lock:
+            if self._process is not None:
+                try:
+                    self._process.terminate()
+                except Exception:
+                    pass
+        return was_active
+
+    def _play(self, path: str, timeout: float):
+        with self._lock:
+            if self._cancel.is_set():
+                return
+            self._process = subprocess.Popen(
+                ["pw-play", path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            process = self._process
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        finally:
+            with self._lock:
+                self._process = None
+
+    def _run(self):
+        while True:
+            message, repeats, pause, timer_id = self._queue.get()
+            self._cancel.clear()
+            self._active.set()
+            try:
+                self._announce(message, repeats, pause, timer_id)
+            except Exception as e:
+                print(f"Announcement error: {e}")
+            finally:
+                self._active.clear()
+
+    def _announce(self, message: str, repeats: int, pause: float, timer_id: str = None):
+        speech_path = _take_prerendered(timer_id, message)
+        if speech_path is None:
+            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+                speech_path = tmp.name
+            if not _synthesize(message, speech_path):
+                os.unlink(speech_path)
+                speech_path = None
+
+        # Without wake-word dismiss the mic stays gated as before
+        mute = not TIMER_DISMISS_ENABLED
+        if mute:
+            _mute_mic(True)
+        try:
+            # Pattern: 3 bings, message, pause, 3 bings, message, pause, 3 bings, message
+            for i in range(repeats):
+                for _ in range(3):
+                    if os.path.exists(ALERT_SOUND):
+                        self._play(ALERT_SOUND, timeout=5)
+                    if self._cancel.wait(0.5):
+                        return
+
+                # Wait for bings to finish before speaking
+                if self._cancel.wait(0.8):
+                    return
+                if speech_path:
+                    self._play(speech_path, timeout=30)
+
+                # Pause between repeats (except after last one)
+                if i < repeats - 1 and self._cancel.wait(pause):
+                    return
+        finally:
+            if mute:
+                _mute_mic(False)
+            if speech_path and os.path.exists(speech_path):
+                os.unlink(speech_path)
+
+
+_announcer = None
+_announcer_lock = threading.Lock()
+
+
+def _get_announcer() -> _AnnouncementPlayer:
+    global _announcer
+    with _announcer_lock:
+        if _announcer is None:
+            _announcer = _AnnouncementPlayer()
+        return _announcer
+
+
+def announce_timer(message: str, repeats: int = 3, pause: float = 2.0, timer_id: str = None):
     """
-    Announce a timer with sound and repeated message.
+    Queue a timer announcement (sound and repeated message) for background playback.
+
+    Returns immediately; use is_announcing() / dismiss_announcement() to
+    track or cancel it.
 
     Args:
         message: The announcement text
         repeats: Number of times to repeat the announcement
         pause: Seconds to pause between repeats
+        timer_id: Brain timer id; plays the pre-rendered clip if there is one
     """
-    # Mute mic during entire announcement sequence
-    _mute_mic(True)
+    _get_announcer().submit(message, repeats, pause, timer_id)
 
-    try:
-        # Pattern: 3 bings, message, pause, 3 bings, message, pause, 3 bings, message
-        for i in range(repeats):
-            # Play 3 bings before each announcement
-            for _ in range(3):
-                play_alert_sound()
-                time.sleep(0.5)
 
-            # Wait for bings to finish before speaking
-            time.sleep(0.8)
+def is_announcing() -> bool:
+    """Check if a timer announcement is playing or queued."""
+    return _announcer is not None and _announcer.is_active()
 
-            # Generate and play speech
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                tmp_path = tmp.name
 
-            try:
-                process = subprocess.run(
-                    [PIPER_PATH, "--model", PIPER_MODEL, "--output_file", tmp_path],
-                    input=message.encode(),
-                    capture_output=True,
-                    timeout=30
-                )
-
-                if process.returncode == 0:
-                    subprocess.run(["pw-play", tmp_path], timeout=30)
-
-            finally:
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
-
-            # Pause between repeats (except after last one)
-            if i < repeats - 1:
-                time.sleep(pause)
-
-    finally:
-        _mute_mic(False)
+def dismiss_announcement() -> bool:
+    """Cancel the current timer announcement. Returns True if one was playing."""
+    if _announcer is None:
+        return False
+    return _announcer.cancel()
@@ -1,13 +1,40 @@
 import os
+from contextlib import contextmanager
 import numpy as np
 from config import (
-    WAKEWORD_ENGINE,
+    WAKEWORD_ENGINE, LOW_MEMORY_MODE,
     PICOVOICE_ACCESS_KEY, PORCUPINE_MODEL, PORCUPINE_SENSITIVITY,
     CUSTOM_WAKEWORD_MODEL, WAKEWORD_THRESHOLD,
     MIN_DETECTION_AMPLITUDE, VAD_THRESHOLD
 )
 
 
+@contextmanager
+def _capped_onnx_sessions():
+    """Create ONNX sessions without the CPU memory arena and with one thread each.
+
+    openwakeword builds its InferenceSessions internally, so the options are
+    injected by wrapping the constructor while the model loads.
+    """
+    import onnxruntime as ort
+
+    original = ort.InferenceSession
+
+    def capped(path_or_bytes, sess_options=None, *args, **kwargs):
+        opts = sess_options or ort.SessionOptions()
+        opts.enable_cpu_mem_arena = False
+        opts.enable_mem_pattern = False
+        opts.intra_op_num_threads = 1
+        opts.inter_op_num_threads = 1
+        return original(path_or_bytes, opts, *args, **kwargs)
+
+    ort.InferenceSession = capped
+    try:
+        yield
+    finally:
+        ort.InferenceSession = original
+
+
 class WakeWordDetector:
     def __init__(self):
         self.engine = WAKEWORD_ENGINE.lower()
@@ -47,15 +74,17 @@ class WakeWordDetector:
 
         if CUSTOM_WAKEWORD_MODEL and os.path.exists(CUSTOM_WAKEWORD_MODEL):
             print(f"Loading custom OpenWakeWord model: {CUSTOM_WAKEWORD_MODEL}")
-            self._oww_model = Model(
-                wakeword_model_paths=[CUSTOM_WAKEWORD_MODEL],
-                vad_threshold=VAD_THRESHOLD if VAD_THRESHOLD > 0 else 0
-            )
+            kwargs = {"wakeword_model_paths": [CUSTOM_WAKEWORD_MODEL]}
         else:
             print("Using built-in OpenWakeWord models (say 'hey jarvis')")
-            self._oww_model = Model(
-                vad_threshold=VAD_THRESHOLD if VAD_THRESHOLD > 0 else 0
-            )
+            kwargs = {}
+
+        if LOW_MEMORY_MODE:
+            with _capped_onnx_sessions():
+                self._oww_model = Model(vad_threshold=VAD_THRESHOLD if VAD_THRESHOLD > 0 else 0, **kwargs)
+            print("Low-memory mode: ONNX arenas disabled, single-threaded sessions")
+        else:
+            self._oww_model = Model(vad_threshold=VAD_THRESHOLD if VAD_THRESHOLD > 0 else 0, **kwargs)
 
         if VAD_THRESHOLD > 0:
             print(f"VAD enabled with threshold: {VAD_THRESHOLD}")